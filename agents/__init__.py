@@ -1,4 +1,6 @@
-from agents.heuristic import heuristic_actions
+from agents.heuristic import heuristic_actions, heuristic_vec_actions
+from agents.beam import beam_actions
+from agents.mcts import mcts_actions
 from agents.runner import evaluate, run_policy
 
-__all__ = ["heuristic_actions", "run_policy", "evaluate"]
+__all__ = ["heuristic_actions", "heuristic_vec_actions", "beam_actions", "mcts_actions", "run_policy", "evaluate"]
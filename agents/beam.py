@@ -0,0 +1,188 @@
+"""시간 예산 beam search 디스패치 정책 — 후보 이동 집합을 휴리스틱 rollout으로 평가."""
+from __future__ import annotations
+
+import time
+from concurrent.futures import FIRST_COMPLETED, wait
+from dataclasses import dataclass
+
+import numpy as np
+
+import config
+from src.simulation.domain.problem import Move, ProblemInstance
+from src.simulation.domain.state import SimState
+from src.simulation.kernel.simulator import Simulator
+from src.utils.parallel import shared_pool
+from agents.heuristic import _static_gains, heuristic_actions
+from agents.registry import register_dispatch
+
+
+@dataclass(frozen=True)
+class BeamConfig:
+    width: int = 4          # 레벨별 유지할 부분 계획 수
+    topk: int = 4           # 부분 계획당 확장할 이동 수
+    depth: int = 3          # 이번 시간 탐색 이동 깊이
+    budget_ms: float = 200  # 결정 1회 벽시계 예산
+    workers: int = 1        # rollout 작업자 (1이면 같은 프로세스)
+
+    @classmethod
+    def from_config(cls) -> BeamConfig:
+        return cls(config.BEAM_WIDTH, config.BEAM_TOPK, config.BEAM_DEPTH,
+                   config.BEAM_BUDGET_MS, config.BEAM_WORKERS)
+
+
+def _achievement(p: ProblemInstance, s: SimState) -> float:
+    rates = [
+        min(s.produced[i] / t.plan_qty, 1.0) if t.plan_qty > 0 else 1.0
+        for i, t in enumerate(p.tasks)
+    ]
+    return sum(rates) / len(rates) if rates else 0.0
+
+
+def rollout(
+    sim: Simulator, s: SimState, deadline: float | None = None,
+) -> tuple[float, list[Move]] | None:
+    """이번 시간을 휴리스틱으로 마저 채운 뒤 horizon까지 휴리스틱 진행.
+
+    반환: (최종 계획달성률, 이번 시간 보충 이동). s는 변경된다.
+    deadline(time.time() 기준)을 주면 시간마다 확인해 넘기면 중단하고 None.
+    """
+    completion = heuristic_actions(sim, s)
+    while not sim.is_done(s):
+        if deadline is not None and time.time() >= deadline:
+            return None
+        sim.advance_hour(s)
+        if sim.is_done(s):
+            break
+        heuristic_actions(sim, s)
+    return _achievement(sim.p, s), completion
+
+
+def top_moves(sim: Simulator, s: SimState, k: int) -> list[Move]:
+    """유효 이동 중 (휴리스틱 필터 없이) 이득 상위 k개 — 동률은 (model, from, to) 순."""
+    gain, _needs_empty, _cand = _static_gains(sim, s)
+    score = np.where(sim.valid_move_mask(s), gain, 0.0).reshape(-1)
+    order = np.argsort(-score, kind="stable")[:k]
+    models = sim.idx.models
+    out = []
+    for flat in order.tolist():
+        if score[flat] <= 0:
+            break
+        m, f, t = np.unravel_index(flat, gain.shape)
+        out.append(Move(models[m], int(f), int(t)))
+    return out
+
+
+# ── rollout 작업자 ─────────────────────────────────────────
+_WORKER_SIM: Simulator | None = None
+
+
+def _init_rollout(problem: ProblemInstance) -> None:
+    global _WORKER_SIM
+    _WORKER_SIM = Simulator(problem)
+
+
+def _rollout_remote(args: tuple[SimState, float]) -> tuple[float, list[Move]] | None:
+    s, deadline = args
+    return rollout(_WORKER_SIM, s, deadline)
+
+
+def _portable(s: SimState) -> SimState:
+    """pickle용 복제 — MoveSet 캐시는 작업자에서 다시 구축."""
+    c = s.clone()
+    c._moves = None
+    return c
+
+
+class _Evaluator:
+    """후보 상태들의 rollout 점수 — 마감 시각을 넘기면 남은 후보는 버린다.
+
+    rollout은 시간마다 마감을 확인해 스스로 멈추고, 작업자 풀에는 작업자 수만큼만 넣는다 —
+    마감 뒤에 대기열·실행 중 작업이 남아 다음 beam_plan 호출의 예산을 잡아먹지 않게.
+    """
+
+    def __init__(self, sim: Simulator, cfg: BeamConfig, budget_s: float):
+        self.sim = sim
+        self.workers = cfg.workers
+        self.deadline = time.time() + budget_s  # 작업자 프로세스와 공유하는 벽시계 기준
+        self.pool = (
+            shared_pool("beam_rollout", sim.p, cfg.workers, _init_rollout, (sim.p,))
+            if cfg.workers > 1 else None
+        )
+
+    def expired(self) -> bool:
+        return time.time() >= self.deadline
+
+    def score(self, states: list[SimState]) -> list[tuple[float, list[Move]] | None]:
+        out: list[tuple[float, list[Move]] | None] = [None] * len(states)
+        if self.pool is None:
+            for i, st in enumerate(states):
+                if self.expired():
+                    break
+                out[i] = rollout(self.sim, st.clone(), self.deadline)
+            return out
+        todo = iter(enumerate(states))
+        running: dict = {}
+        while True:
+            while len(running) < self.workers and not self.expired():
+                nxt = next(todo, None)
+                if nxt is None:
+                    break
+                i, st = nxt
+                running[self.pool.submit(_rollout_remote, (_portable(st), self.deadline))] = i
+            if not running:
+                break
+            done, _pending = wait(running, return_when=FIRST_COMPLETED)
+            for fut in done:
+                out[running.pop(fut)] = fut.result()
+        return out
+
+
+def beam_plan(sim: Simulator, s: SimState, cfg: BeamConfig | None = None) -> list[Move]:
+    """이번 시간 적용할 이동 목록 (s는 바꾸지 않음).
+
+    후보 = 휴리스틱 1시간 계획 + beam 노드(상위 이동 prefix)마다 휴리스틱 보충.
+    각 후보를 horizon까지 휴리스틱 rollout한 계획달성률로 비교하고, 예산이 끝나면
+    그때까지의 최선을 반환한다. 동점이면 먼저 평가된(=휴리스틱) 계획을 유지한다.
+    """
+    cfg = cfg or BeamConfig.from_config()
+    ev = _Evaluator(sim, cfg, cfg.budget_ms / 1000.0)
+    greedy_state = s.clone()
+    greedy = heuristic_actions(sim, greedy_state)
+    best_plan, best_score = greedy, None
+    first = ev.score([s])[0]
+    if first is not None:
+        best_score = first[0]
+    beam: list[tuple[list[Move], SimState]] = [([], s.clone())]
+    for _depth in range(cfg.depth):
+        if ev.expired():
+            break
+        children: list[tuple[list[Move], SimState]] = []
+        for prefix, st in beam:
+            for mv in top_moves(sim, st, cfg.topk):
+                child = st.clone()
+                sim.apply_move(child, mv)
+                children.append((prefix + [mv], child))
+        if not children:
+            break
+        results = ev.score([c for _p, c in children])
+        scored = []
+        for (prefix, child), res in zip(children, results):
+            if res is None:
+                continue
+            score, completion = res
+            scored.append((score, prefix, child))
+            if best_score is None or score > best_score:
+                best_plan, best_score = prefix + completion, score
+        scored.sort(key=lambda x: -x[0])
+        beam = [(prefix, child) for _score, prefix, child in scored[:cfg.width]]
+        if not beam:
+            break
+    return best_plan
+
+
+@register_dispatch("beam")
+def beam_actions(sim: Simulator, s: SimState) -> list[Move]:
+    plan = beam_plan(sim, s)
+    for mv in plan:
+        sim.apply_move(s, mv)
+    return plan
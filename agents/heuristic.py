@@ -1,6 +1,10 @@
 """휴리스틱 디스패치 정책."""
 from __future__ import annotations
 
+import heapq
+
+import numpy as np
+
 from src.simulation.domain.problem import Move, ProblemInstance
 from src.simulation.domain.state import SimState
 from src.simulation.kernel.simulator import Simulator
@@ -11,32 +15,125 @@ def _remaining(p: ProblemInstance, s: SimState, ti: int) -> int:
     return max(0, p.tasks[ti].plan_qty - s.produced[ti])
 
 
+def _static_gains(sim: Simulator, s: SimState) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """(gain (M,T,T), needs_empty_to (M,T,T), candidate (M,T,T)).
+
+    한 번의 호출 동안 produced/wip/hour는 바뀌지 않으므로 이동 이득은 고정이다.
+    바뀌는 것은 유효성(movable·tool)과 '빈 to-task' 조건뿐.
+    """
+    p, idx = sim.p, sim.idx
+    ms = sim.move_set(s)
+    n = idx.n_tasks
+    rem = np.asarray([_remaining(p, s, ti) for ti in range(n)], dtype=np.float64)
+    wip = np.asarray([s.wip[ti] for ti in range(n)], dtype=np.float64)
+    same = ~ms.cross
+    hours_left = np.where(same, p.horizon_hours - s.hour, p.horizon_hours - s.hour - p.switch_time_hours)
+    uph = idx.uph
+    gain = np.minimum(
+        np.minimum(rem, wip)[None, None, :],
+        uph[:, None, :] * np.maximum(0, hours_left)[None, :, :],
+    )
+    busy_from = ((rem > 0) & (wip > 0))[None, :, None]
+    uph_to, uph_from = uph[:, None, :], uph[:, :, None]
+    better_here = same[None] & (uph_to > uph_from)
+    fill_static = same[None] & (rem > 0)[None, None, :] & (uph_to >= uph_from)
+    needs_empty = busy_from & ~better_here
+    candidate = ms.feasible & (gain > 0) & ~(needs_empty & ~fill_static)
+    return gain, needs_empty, candidate
+
+
 @register_dispatch("heuristic")
 def heuristic_actions(sim: Simulator, s: SimState) -> list[Move]:
-    p = sim.p
+    """이득이 가장 큰 유효 이동을 반복 적용 (동률은 (model, from, to) 순서가 앞선 것).
+
+    이득은 호출당 1회 계산해 max-heap에 두고, 꺼낸 후보가 지금 무효면 의존 키
+    (movable(m,f), tool(batch,m), to-task 점유)에 보류했다가 해당 키가 바뀔 때만 다시 넣는다.
+    """
+    p, idx = sim.p, sim.idx
+    ms = sim.move_set(s)
+    gain, needs_empty, candidate = _static_gains(sim, s)
+    heap = [
+        (-float(gain[m, f, t]), m, f, t)
+        for m, f, t in zip(*(a.tolist() for a in np.nonzero(candidate)))
+    ]
+    heapq.heapify(heap)
+    models = idx.models
+    batch_pos = idx.task_batch_pos.tolist()
+    occupied = [0] * idx.n_tasks
+    for (_m, ti), cnt in s.assign.items():
+        occupied[ti] += cnt
+    parked: dict[tuple, list[tuple]] = {}
+    waiting: set[tuple] = set()
+
+    def park(entry: tuple, key: tuple) -> None:
+        waiting.add(entry)
+        parked.setdefault(key, []).append(entry)
+
+    def wake(key: tuple) -> None:
+        for entry in parked.pop(key, ()):
+            if entry in waiting:
+                waiting.discard(entry)
+                heapq.heappush(heap, entry)
+
     moves: list[Move] = []
     for _ in range(sum(p.eqp_qty.values()) + 1):
-        candidates = sim.valid_moves(s)
-        best, best_gain = None, 0.0
-        for mv in candidates:
-            from_rem = _remaining(p, s, mv.from_index)
-            from_wip = s.wip[mv.from_index]
-            to_rem = _remaining(p, s, mv.to_index)
-            uph_to = p.uph_of(mv.model, mv.to_index) or 0.0
-            uph_from = p.uph_of(mv.model, mv.from_index) or 0.0
-            same_batch = p.batch_of(mv.from_index) == p.batch_of(mv.to_index)
-            to_has_eqp = any(s.assign.get((m, mv.to_index), 0) > 0 for m in p.models())
-            if from_rem > 0 and from_wip > 0:
-                better_here = same_batch and uph_to > uph_from
-                fill_empty_free = same_batch and to_rem > 0 and not to_has_eqp and uph_to >= uph_from
-                if not (better_here or fill_empty_free):
+        best = None
+        while heap:
+            entry = heapq.heappop(heap)
+            _g, m, f, t = entry
+            model = models[m]
+            if ms.movable[m, f] <= 0:
+                park(entry, ("movable", m, f))
+                continue
+            if ms.cross[f, t]:
+                tb = idx.task_batch[t]
+                if s.tool_used.get((tb, model), 0) >= idx.tool_cap[(tb, model)]:
+                    park(entry, ("tool", batch_pos[t], m))
                     continue
-            hours_left = p.horizon_hours - s.hour - (0 if same_batch else p.switch_time_hours)
-            gain = min(to_rem, s.wip[mv.to_index], uph_to * max(0, hours_left))
-            if gain > best_gain:
-                best, best_gain = mv, gain
+            if needs_empty[m, f, t] and occupied[t] > 0:
+                park(entry, ("occupied", t))
+                continue
+            best = entry
+            break
         if best is None:
             break
-        sim.apply_move(s, best)
-        moves.append(best)
+        _g, m, f, t = best
+        mv = Move(models[m], f, t)
+        sim.apply_move(s, mv)
+        moves.append(mv)
+        occupied[f] -= 1
+        occupied[t] += 1
+        heapq.heappush(heap, best)
+        for key in (("movable", m, f), ("movable", m, t), ("occupied", f), ("occupied", t),
+                    ("tool", batch_pos[f], m), ("tool", batch_pos[t], m)):
+            wake(key)
+    return moves
+
+
+@register_dispatch("heuristic_vec")
+def heuristic_vec_actions(sim: Simulator, s: SimState) -> list[Move]:
+    """heuristic과 같은 규칙을 (M, T, T) 텐서 전체에 대해 NumPy로 평가.
+
+    매 반복 유효 마스크(sim.valid_move_mask)와 '빈 to-task' 조건을 곱해 argmax를 고른다.
+    argmax는 평탄화 C-순서의 첫 최대값이므로 동률 처리도 heuristic과 같다.
+    """
+    p, idx = sim.p, sim.idx
+    gain, needs_empty, candidate = _static_gains(sim, s)
+    score = np.where(candidate, gain, 0.0)
+    occupied = np.zeros(idx.n_tasks, dtype=np.int64)
+    for (_m, ti), cnt in s.assign.items():
+        occupied[ti] += cnt
+    models = idx.models
+    moves: list[Move] = []
+    for _ in range(sum(p.eqp_qty.values()) + 1):
+        ok = sim.valid_move_mask(s) & ~(needs_empty & (occupied > 0)[None, None, :])
+        flat = int(np.argmax(np.where(ok, score, 0.0)))
+        m, f, t = np.unravel_index(flat, score.shape)
+        if not ok[m, f, t] or score[m, f, t] <= 0:
+            break
+        mv = Move(models[m], int(f), int(t))
+        sim.apply_move(s, mv)
+        moves.append(mv)
+        occupied[f] -= 1
+        occupied[t] += 1
     return moves
@@ -0,0 +1,251 @@
+"""MCTS 디스패치 정책 — 전이표(transposition table)를 공유하는 PUCT 탐색."""
+from __future__ import annotations
+
+import math
+import time
+from dataclasses import dataclass, field
+
+import numpy as np
+
+import config
+from src.simulation.domain.problem import Move, ProblemInstance
+from src.simulation.domain.state import SimState
+from src.simulation.kernel.simulator import Simulator
+from src.utils.parallel import shared_pool
+from agents.beam import _achievement, rollout, top_moves
+from agents.heuristic import heuristic_actions
+from agents.registry import register_dispatch
+
+COMMIT = None         # 행동: 더 옮기지 않고 이번 시간 확정 (advance_hour)
+FINISH = "heuristic"  # 행동: 나머지를 휴리스틱으로 채운 뒤 확정 — rollout의 첫 단계와 같다
+
+
+@dataclass(frozen=True)
+class MCTSConfig:
+    iterations: int = 400   # 결정 1회 최대 시뮬레이션 수
+    budget_ms: float = 200  # 결정 1회 벽시계 예산
+    topk: int = 6           # 노드당 후보 이동 수 (+ COMMIT)
+    c_puct: float = 1.0
+    workers: int = 1        # root parallelism 프로세스 수
+    seed: int = 0
+
+    @classmethod
+    def from_config(cls) -> MCTSConfig:
+        return cls(config.MCTS_ITERATIONS, config.MCTS_BUDGET_MS, config.MCTS_TOPK,
+                   config.MCTS_C_PUCT, config.MCTS_WORKERS, config.MCTS_SEED)
+
+
+def state_key(s: SimState) -> tuple:
+    """이동 순서와 무관한 상태 키 — hour·assign·switching·wip (+ 합법성·보상에 쓰이는 produced·tool_used)."""
+    return (
+        s.hour,
+        tuple(sorted((k, v) for k, v in s.assign.items() if v)),
+        tuple(sorted((k, v) for k, v in s.switching.items() if v)),
+        tuple(s.wip.values()),
+        tuple(s.produced.values()),
+        tuple(sorted((k, v) for k, v in s.tool_used.items() if v)),
+    )
+
+
+@dataclass
+class Node:
+    actions: list[Move | str | None]
+    prior: np.ndarray
+    visits: np.ndarray = field(init=False)
+    value: np.ndarray = field(init=False)
+
+    def __post_init__(self):
+        self.visits = np.zeros(len(self.actions), dtype=np.int64)
+        self.value = np.zeros(len(self.actions), dtype=np.float64)
+
+    def mean(self) -> np.ndarray:
+        return np.divide(self.value, self.visits, out=np.zeros_like(self.value), where=self.visits > 0)
+
+    def select(self, c_puct: float, lo: float, hi: float) -> int:
+        """PUCT — Q는 탐색 중 관측한 [lo, hi]로 정규화 (달성률 차이가 작아도 탐색 항과 견줄 수 있게)."""
+        n = self.visits
+        q = np.where(n > 0, (self.mean() - lo) / (hi - lo), 0.0) if hi > lo else np.zeros(len(n))
+        u = c_puct * self.prior * math.sqrt(max(1, int(n.sum()))) / (1 + n)
+        return int(np.argmax(q + u))
+
+    def best(self) -> int:
+        """방문 수 최다 (동률이면 평균 가치, 그다음 앞선 행동)."""
+        return int(np.lexsort((-np.arange(len(self.visits)), self.mean(), self.visits))[-1])
+
+
+def model_priors(problem: ProblemInstance):
+    """디스패치 모델이 로드·shape 일치하면 (sim, s, actions) → prior 함수, 아니면 None."""
+    from agents.model_store import dispatch_model_matches, load_dispatch_model
+
+    model = load_dispatch_model()
+    if model is None or not dispatch_model_matches(model, problem):
+        return None
+    from envs.prepared import prepare_dispatch
+
+    env = prepare_dispatch(problem).make(with_target=False)
+
+    def prior(sim: Simulator, s: SimState, actions: list[Move | str | None]) -> np.ndarray:
+        env.attach_state(s)
+        obs_t, _ = model.policy.obs_to_tensor(env._obs())
+        dist = model.policy.get_distribution(obs_t, action_masks=env.action_masks())
+        probs = dist.distribution.probs.detach().cpu().numpy()[0]
+        pos = sim.idx.model_pos
+        out = np.asarray([
+            probs[env._action_of[pos[a.model], a.from_index, a.to_index]] if isinstance(a, Move)
+            else probs[0] if a is COMMIT else 0.0
+            for a in actions
+        ], dtype=np.float64)
+        out[[a == FINISH for a in actions]] = out.max()  # 휴리스틱 완성은 최선 후보만큼
+        return out
+
+    return prior
+
+
+class Search:
+    """한 시간(결정 지점)의 탐색 — 노드는 state_key로 공유된다."""
+
+    def __init__(self, sim: Simulator, cfg: MCTSConfig, prior_fn=None, rng=None, root_noise: bool = False):
+        self.sim = sim
+        self.cfg = cfg
+        self.prior_fn = prior_fn
+        self.rng = rng
+        self.root_noise = root_noise
+        self.table: dict[tuple, Node] = {}
+        self.lo, self.hi = math.inf, -math.inf
+        self.max_moves = sum(sim.p.eqp_qty.values()) + 1
+
+    def _expand(self, s: SimState, n_moves: int, root: bool) -> Node:
+        moves = top_moves(self.sim, s, self.cfg.topk) if n_moves < self.max_moves else []
+        actions: list[Move | str | None] = [FINISH, COMMIT, *moves]
+        prior = self.prior_fn(self.sim, s, actions) if self.prior_fn else np.ones(len(actions))
+        total = prior.sum()
+        prior = prior / total if total > 0 else np.full(len(actions), 1.0 / len(actions))
+        if root and self.root_noise and self.rng is not None:
+            prior = 0.75 * prior + 0.25 * self.rng.dirichlet([0.3] * len(actions))
+        return Node(actions, prior)
+
+    def simulate(self, root: SimState) -> None:
+        """선택 → 확장 → 휴리스틱 rollout → 역전파 1회."""
+        sim = self.sim
+        s = root.clone()
+        path: list[tuple[Node, int]] = []
+        seen = {state_key(s)}
+        n_moves = 0
+        while True:
+            if sim.is_done(s):
+                value = _achievement(sim.p, s)
+                break
+            key = state_key(s)
+            node = self.table.get(key)
+            if node is None:
+                self.table[key] = self._expand(s, n_moves, root=not path)
+                value, _ = rollout(sim, s)
+                break
+            a = node.select(self.cfg.c_puct, self.lo, self.hi)
+            path.append((node, a))
+            action = node.actions[a]
+            if action is COMMIT or action == FINISH:
+                if action == FINISH:
+                    heuristic_actions(sim, s)
+                sim.advance_hour(s)
+                n_moves = 0
+            else:
+                sim.apply_move(s, action)
+                n_moves += 1
+                key = state_key(s)
+                if key in seen:  # 같은 시간 안의 순환 — 여기서 rollout 값으로 끊는다
+                    value, _ = rollout(sim, s)
+                    break
+                seen.add(key)
+        self.lo, self.hi = min(self.lo, value), max(self.hi, value)
+        for node, a in path:
+            node.visits[a] += 1
+            node.value[a] += value
+
+    def run(self, root: SimState) -> dict[tuple, Node]:
+        deadline = time.perf_counter() + self.cfg.budget_ms / 1000.0
+        for _ in range(self.cfg.iterations):
+            if time.perf_counter() >= deadline:
+                break
+            self.simulate(root)
+        return self.table
+
+
+def merge_tables(tables: list[dict[tuple, Node]]) -> dict[tuple, Node]:
+    """root parallelism — 같은 키의 방문·가치를 합산 (후보 이동 목록은 키마다 같다)."""
+    merged: dict[tuple, Node] = {}
+    for table in tables:
+        for key, node in table.items():
+            cur = merged.get(key)
+            if cur is None:
+                merged[key] = cur = Node(list(node.actions), node.prior.copy())
+            cur.visits += node.visits
+            cur.value += node.value
+    return merged
+
+
+def extract_plan(sim: Simulator, s: SimState, table: dict[tuple, Node]) -> list[Move]:
+    """root에서 방문 수 최다 행동을 시간 확정(COMMIT/FINISH)까지 따라간다 (s에 적용).
+
+    탐색이 닿지 않은 노드에 이르면 rollout과 같은 휴리스틱으로 나머지를 채운다.
+    """
+    moves: list[Move] = []
+    seen = {state_key(s)}
+    while True:
+        node = table.get(state_key(s))
+        if node is None or node.visits.sum() == 0:
+            return moves + heuristic_actions(sim, s)
+        action = node.actions[node.best()]
+        if action is COMMIT:
+            return moves
+        if action == FINISH:
+            return moves + heuristic_actions(sim, s)
+        sim.apply_move(s, action)
+        moves.append(action)
+        key = state_key(s)
+        if key in seen:
+            return moves
+        seen.add(key)
+
+
+# ── root parallelism 작업자 ────────────────────────────────
+_WORKER: tuple[Simulator, object] | None = None
+
+
+def _init_search(problem: ProblemInstance) -> None:
+    global _WORKER
+    _WORKER = (Simulator(problem), model_priors(problem))
+
+
+def _search_remote(args: tuple) -> dict[tuple, Node]:
+    s, cfg, seed = args
+    sim, prior_fn = _WORKER
+    rng = np.random.default_rng(seed)
+    return Search(sim, cfg, prior_fn, rng, root_noise=True).run(s)
+
+
+def mcts_plan(sim: Simulator, s: SimState, cfg: MCTSConfig | None = None, prior_fn=None) -> list[Move]:
+    """이번 시간 적용할 이동 목록 (s는 바꾸지 않음)."""
+    cfg = cfg or MCTSConfig.from_config()
+    if cfg.workers > 1:
+        pool = shared_pool("mcts", sim.p, cfg.workers, _init_search, (sim.p,))
+        root = s.clone()
+        root._moves = None
+        jobs = [(root, cfg, [cfg.seed, s.hour, w]) for w in range(cfg.workers)]
+        table = merge_tables([f.result() for f in [pool.submit(_search_remote, j) for j in jobs]])
+    else:
+        table = Search(sim, cfg, prior_fn).run(s)
+    return extract_plan(sim, s.clone(), table)
+
+
+_PRIORS: list = [None, None]  # (problem, prior_fn) — 문제가 바뀔 때만 모델 prior 재구성
+
+
+@register_dispatch("mcts")
+def mcts_actions(sim: Simulator, s: SimState) -> list[Move]:
+    if _PRIORS[0] is not sim.p:
+        _PRIORS[:] = [sim.p, model_priors(sim.p)]
+    plan = mcts_plan(sim, s, prior_fn=_PRIORS[1])
+    for mv in plan:
+        sim.apply_move(s, mv)
+    return plan
@@ -60,12 +60,11 @@ def alloc_model_matches(model, problem: ProblemInstance) -> bool:
 
 
 def dispatch_model_matches(model, problem: ProblemInstance) -> bool:
-    from envs.dispatch_env import DispatchEnv
-    env = DispatchEnv(problem, max_tasks=config.MAX_TASKS,
-                      max_models=config.MAX_MODELS, dwell_obs=config.DWELL_OBS)
+    from envs.prepared import prepare_dispatch
+    obs_shape, n_actions = prepare_dispatch(problem).shape
     try:
-        obs_ok = tuple(model.observation_space.shape) == tuple(env.observation_space.shape)
-        act_ok = int(model.action_space.n) == int(env.action_space.n)
+        obs_ok = tuple(model.observation_space.shape) == obs_shape
+        act_ok = int(model.action_space.n) == n_actions
         return obs_ok and act_ok
     except Exception:
         return False
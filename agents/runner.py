@@ -1,39 +1,81 @@
 """시뮬레이션 러너 — policy_fn을 매 시간 적용."""
 from __future__ import annotations
 
-from src.contracts.simulation import SimulationRun
+import numpy as np
+
+import config
+from src.contracts.simulation import QuiescentSpan, SimulationRun
 from src.simulation.kernel.simulator import Simulator, active_eqp_count
+from src.simulation.kernel.units import UnitSimulator
 from agents.protocol import PolicyFn
 
 
-def run_policy(sim: Simulator, policy_fn: PolicyFn, policy_name: str = "heuristic") -> SimulationRun:
+def run_policy(
+    sim: Simulator,
+    policy_fn: PolicyFn,
+    policy_name: str = "heuristic",
+    fast_forward: bool | None = None,
+) -> SimulationRun:
+    """horizon까지 매 시간 policy_fn 적용.
+
+    fast_forward=True면 정지 구간(Simulator.quiescent_hours — WIP 소진, 또는 유효 이동 없이
+    전환 완료를 기다리는 동안)마다 정책 호출 없이 closed form으로 전이하고, 그 구간의 시간별
+    통계·trace는 QuiescentSpan 하나로 남긴다 (행 빌더가 순회할 때 펼침). None이면 config.SIM_FAST_FORWARD.
+    """
     p = sim.p
     s = sim.reset()
     trace: list = []
     hourly_stats: list[dict] = []
     total_eqp = sum(p.eqp_qty.values()) or 1
     n_tasks = len(p.tasks)
+    if fast_forward is None:
+        fast_forward = config.SIM_FAST_FORWARD
     while not sim.is_done(s):
         hour = s.hour
+        if fast_forward:
+            hours = sim.quiescent_hours(s)
+            if hours:
+                span = _fast_forward(sim, s, hours, total_eqp)
+                hourly_stats.append(span)
+                trace.append(span)
+                continue
         applied = policy_fn(sim, s)
         snapshot = {(m, ti): c for (m, ti), c in s.assign.items()}
         before = dict(s.produced)
-        util_rate = round(active_eqp_count(p, s) / total_eqp, 4)
+        active = active_eqp_count(p, s)
         sim.advance_hour(s)
         hourly_produce = {ti: s.produced[ti] - before.get(ti, 0) for ti in range(n_tasks)}
         stat = {
             "hour": hour,
             "hourly_produce": hourly_produce,
             "cumulative_produced": dict(s.produced),
-            "util_rate": util_rate,
+            "util_rate": round(active / total_eqp, 4),
             "assign_snapshot": snapshot,
+            "active_eqp": active,
         }
         hourly_stats.append(stat)
         trace.append((hour, applied, snapshot))
     metrics = sim.metrics(s)
+    if isinstance(sim, UnitSimulator):
+        return SimulationRun.from_legacy(
+            s, trace, hourly_stats, metrics, policy_name=policy_name,
+            unit_positions=sim.hourly_positions(s), unit_conversions=s.units.conversions,
+        )
     return SimulationRun.from_legacy(s, trace, hourly_stats, metrics, policy_name=policy_name)
 
 
+def _fast_forward(sim: Simulator, s, hours: int, total_eqp: int) -> QuiescentSpan:
+    """정지 구간을 한 번에 전이 — 배치가 고정이므로 스냅샷 하나와 누적 배열만 남긴다."""
+    snapshot = {(m, ti): c for (m, ti), c in s.assign.items()}
+    start = s.hour
+    trajectory = sim.fixed_trajectory(s, hours)
+    base = np.asarray([s.produced[ti] for ti in range(len(sim.p.tasks))], dtype=np.int64)
+    P, W = sim.fast_forward(s, hours, trajectory)
+    units = trajectory[1]
+    busy = ((W[:-1] > 0) * units).sum(axis=1)
+    return QuiescentSpan(start, snapshot, base + P, busy, total_eqp)
+
+
 def evaluate(problem, policy_name: str = "heuristic") -> dict:
     """휴리스틱 단일 정책 평가 (레거시 dict 반환)."""
     from agents.registry import get_dispatch
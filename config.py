@@ -80,6 +80,11 @@ DEFAULT_PPO_STEPS = 50_000
 BC_EPOCHS = 300
 BC_LR = 1e-3
 BC_LOSS_TARGET = 0.05
+TRAIN_N_ENVS = int(os.getenv("TRAIN_N_ENVS", "1"))  # >1 → SubprocVecEnv
+TRAIN_SEED = int(os.getenv("TRAIN_SEED", "0"))
+TRAIN_VEC_ENV = os.getenv("TRAIN_VEC_ENV", "subproc")  # subproc | native (dispatch만)
+TRAIN_NATIVE_N_ENVS = int(os.getenv("TRAIN_NATIVE_N_ENVS", "16"))  # native에서 TRAIN_N_ENVS ≤ 1일 때 슬롯 수
+PREPARED_CACHE_SIZE = int(os.getenv("PREPARED_CACHE_SIZE", "128"))  # 준비된 DispatchEnv LRU 크기
 DEFAULT_SWITCH_TIME_HOURS = 1
 
 MAX_TASKS = int(os.getenv("MAX_TASKS", "8"))
@@ -130,8 +135,39 @@ DWELL_LAMBDA = float(os.getenv("DWELL_LAMBDA", "0.3"))
 ALLOC_LAMBDA = float(os.getenv("ALLOC_LAMBDA", "0.3"))
 DWELL_OBS = os.getenv("DWELL_OBS", "true").lower() == "true"
 USE_ALLOC_MODEL = os.getenv("USE_ALLOC_MODEL", "true").lower() == "true"
+ALLOC_POLICY = os.getenv("ALLOC_POLICY", "auto")  # auto | analytic | rl | optimize | cem
+ALLOC_OPT_TIME_LIMIT_S = float(os.getenv("ALLOC_OPT_TIME_LIMIT_S", "10"))
+ALLOC_CEM_POPULATION = int(os.getenv("ALLOC_CEM_POPULATION", "256"))
+ALLOC_CEM_ELITE_FRAC = float(os.getenv("ALLOC_CEM_ELITE_FRAC", "0.1"))
+ALLOC_CEM_ITERATIONS = int(os.getenv("ALLOC_CEM_ITERATIONS", "100"))
+ALLOC_CEM_TIME_LIMIT_S = float(os.getenv("ALLOC_CEM_TIME_LIMIT_S", "2"))
+ALLOC_CEM_SEED = int(os.getenv("ALLOC_CEM_SEED", "0"))
 GUIDE_UTIL_THRESHOLD = float(os.getenv("GUIDE_UTIL_THRESHOLD", "0.70"))
 GUIDE_BAND_PCT = float(os.getenv("GUIDE_BAND_PCT", "0.20"))
+SIM_FAST_FORWARD = os.getenv("SIM_FAST_FORWARD", "true").lower() == "true"
+SIM_EVENT_LOG_MAX = int(os.getenv("SIM_EVENT_LOG_MAX", "1000"))  # EventSimulator 이벤트 기록 상한 (0=끔)
+SIM_WORKERS = int(os.getenv("SIM_WORKERS", "0"))  # 0 → os.cpu_count()
+MC_REPLICAS = int(os.getenv("MC_REPLICAS", "1000"))
+BEAM_WIDTH = int(os.getenv("BEAM_WIDTH", "4"))
+BEAM_TOPK = int(os.getenv("BEAM_TOPK", "4"))
+BEAM_DEPTH = int(os.getenv("BEAM_DEPTH", "3"))
+BEAM_BUDGET_MS = float(os.getenv("BEAM_BUDGET_MS", "200"))
+BEAM_WORKERS = int(os.getenv("BEAM_WORKERS", "1"))
+MCTS_ITERATIONS = int(os.getenv("MCTS_ITERATIONS", "400"))
+MCTS_BUDGET_MS = float(os.getenv("MCTS_BUDGET_MS", "200"))
+MCTS_TOPK = int(os.getenv("MCTS_TOPK", "6"))
+MCTS_C_PUCT = float(os.getenv("MCTS_C_PUCT", "1.0"))
+MCTS_WORKERS = int(os.getenv("MCTS_WORKERS", "1"))
+MCTS_SEED = int(os.getenv("MCTS_SEED", "0"))
+EXACT_TIME_LIMIT_S = float(os.getenv("EXACT_TIME_LIMIT_S", "300"))
+EXACT_EPSILON = float(os.getenv("EXACT_EPSILON", "0"))  # >0 → bounded-suboptimal
+EXACT_INCUMBENT_POLICIES = [
+    x.strip() for x in os.getenv("EXACT_INCUMBENT_POLICIES", "heuristic,beam").split(",") if x.strip()
+]
+PORTFOLIO_POLICIES = [  # 비면 등록 정책 전부
+    x.strip() for x in os.getenv("PORTFOLIO_POLICIES", "").split(",") if x.strip()
+]
+PORTFOLIO_WORKERS = int(os.getenv("PORTFOLIO_WORKERS", "0"))
 
 INPUT_TABLE = "RTS_LINEDSDB_INF"
 EQPALLOCATION_TABLE = "RTS_EQPALLOCATION_INF"
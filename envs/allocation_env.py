@@ -7,6 +7,7 @@ import gymnasium as gym
 import numpy as np
 from gymnasium import spaces
 
+from src.simulation.domain.allocation import allocation_reward
 from src.simulation.domain.problem import ProblemInstance, largest_remainder
 
 
@@ -47,20 +48,20 @@ class AllocationEnv(gym.Env):
         plan_part = [0.0] * self.mt
         for i, t in enumerate(p.tasks):
             plan_part[i] = t.plan_qty / max_plan
+        idx = p.index
         uph_part = [0.0] * (self.mm * self.mt)
-        for mi, m in enumerate(self.models):
+        for mi in range(self.n_models):
             for ti in range(self.n_tasks):
-                uph = p.uph_of(m, ti) or 0.0
-                uph_part[mi * self.mt + ti] = uph / max_uph
+                uph_part[mi * self.mt + ti] = float(idx.uph[mi, ti]) / max_uph
         eqp_part = [0.0] * self.mm
         for mi, m in enumerate(self.models):
             eqp_part[mi] = p.eqp_qty[m] / max_eqp
         tool_part = [0.0] * (self.mm * self.mt)
         for mi, m in enumerate(self.models):
             for ti in range(self.n_tasks):
-                batch = p.batch_of(ti) if ti < self.n_tasks else None
+                batch = idx.task_batch[ti]
                 if batch:
-                    tq = p.tool_cap(batch, m)
+                    tq = idx.tool_cap[(batch, m)]
                     tool_part[mi * self.mt + ti] = tq / max_tool
         return np.asarray(plan_part + uph_part + eqp_part + tool_part, dtype=np.float32)
 
@@ -105,26 +106,23 @@ class AllocationEnv(gym.Env):
                     alloc[(model, ti)] = cnt
         return alloc
 
-    def _compute_reward(self, alloc: dict[tuple[str, int], int]) -> float:
+    def analytic_target_logits(self) -> np.ndarray:
+        """해석식 목표 배분을 재현하는 logit (BC 목표·탐색 warm start)."""
         p = self.p
-        rates = []
-        for ti, task in enumerate(p.tasks):
-            if task.plan_qty <= 0:
-                rates.append(1.0)
-                continue
-            cap = sum(
-                alloc.get((model, ti), 0) * (p.uph_of(model, ti) or 0.0)
-                for model in self.models
-            )
-            switches_in = sum(
-                max(0, alloc.get((model, ti), 0) - p.init_assign.get((model, ti), 0))
-                for model in self.models
-            )
-            eff_h = max(0.0, float(p.horizon_hours) - switches_in * p.switch_time_hours)
-            max_prod = cap * eff_h
-            rate = min(max_prod, task.plan_qty) / task.plan_qty
-            rates.append(rate)
-        return sum(rates) / len(rates) if rates else 0.0
+        analytic = p.plan_target_allocation()
+        logits = np.full((self.mm * self.mt,), -3.0, dtype=np.float32)
+        eps = 1e-6
+        for mi, model in enumerate(self.models):
+            eqp = max(1.0, float(p.eqp_qty[model]))
+            for ti in range(self.n_tasks):
+                if p.uph_of(model, ti) is None:
+                    continue
+                frac = analytic.get((model, ti), 0.0) / eqp
+                logits[mi * self.mt + ti] = float(np.clip(np.log(frac + eps) + 3.0, -3.0, 3.0))
+        return logits
+
+    def _compute_reward(self, alloc: dict[tuple[str, int], int]) -> float:
+        return allocation_reward(self.p, alloc)
 
     def reset(self, *, seed=None, options=None):
         super().reset(seed=seed)
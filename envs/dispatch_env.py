@@ -1,12 +1,14 @@
 """Gymnasium DispatchEnv — sb3 격리."""
 from __future__ import annotations
 
+import copy
+
 import numpy as np
 import gymnasium as gym
 from gymnasium import spaces
 
 from src.simulation.domain.problem import Move, ProblemInstance
-from src.simulation.kernel.simulator import Simulator, active_eqp_count
+from src.simulation.kernel.simulator import Simulator, active_eqp_count, dwell_time
 
 
 class DispatchEnv(gym.Env):
@@ -41,7 +43,14 @@ class DispatchEnv(gym.Env):
         ]
         self.action_space = spaces.Discrete(len(self.move_list) + 1)
         self._move_to_idx: dict[Move, int] = {mv: i + 1 for i, mv in enumerate(self.move_list)}
-        obs_dim = self.mt * 2 + 2 * self.mm * self.mt + 1
+        # (model, from, to) 실제 셀 → action index (대각선은 0, 마스크에서 항상 False)
+        self._action_of = np.zeros((self.n_models, self.n_tasks, self.n_tasks), dtype=np.int64)
+        for mi, m in enumerate(self.models):
+            for fi in range(self.n_tasks):
+                for ti in range(self.n_tasks):
+                    if fi != ti:
+                        self._action_of[mi, fi, ti] = self._move_to_idx[Move(m, fi, ti)]
+        obs_dim = self.mt * 2 + 2 * self.mm * self.mt + 1 + (self.mt if dwell_obs else 0)
         self.observation_space = spaces.Box(low=0.0, high=1.0, shape=(obs_dim,), dtype=np.float32)
         total_eqp = sum(problem.eqp_qty.values())
         self.max_substeps = max_substeps_per_hour or (total_eqp + 1)
@@ -51,77 +60,174 @@ class DispatchEnv(gym.Env):
         self.guide_util_threshold = guide_util_threshold
         self.guide_band_pct = guide_band_pct
         self.dwell_obs = dwell_obs
-        if dwell_obs:
-            obs_dim = self.mt * 2 + 2 * self.mm * self.mt + 1 + self.mt
-            self.observation_space = spaces.Box(low=0.0, high=1.0, shape=(obs_dim,), dtype=np.float32)
         self._state = None
         self._substeps = 0
 
+        # 정규화 상수 (고정) — 상태 배열·관측 버퍼는 이동·시간 확정 때 바뀐 칸만 다시 쓴다
+        idx = problem.index
+        self._plan = np.asarray([t.plan_qty for t in problem.tasks], dtype=np.float64)
+        self._total_plan = float(self._plan.sum()) or 1.0
+        self._max_wip = float(max([t.init_wip for t in problem.tasks] + [1]))
+        eqp = np.asarray([max(1, problem.eqp_qty[m]) for m in self.models], dtype=np.float64)
+        self._assign_den = eqp
+        self._change_den = problem.switch_time_hours * eqp
+        self._horizon = float(problem.horizon_hours)
+        self._task_models = [
+            [(idx.model_pos[m], uph) for m, uph in tm] for tm in idx.task_models
+        ]
+        self._obs_dim = obs_dim
+        self._init_buffers()
+
+    def _init_buffers(self) -> None:
+        """상태 배열·관측 버퍼 (env마다 따로) — 나머지 정적 구성은 spawn()한 env끼리 공유."""
+        T, M, mt, mm = self.n_tasks, self.n_models, self.mt, self.mm
+        self._produced = np.zeros(T)
+        self._wip = np.zeros(T)
+        self._assign = np.zeros((M, T))
+        self._switch = np.zeros((M, T))
+        self._cap = np.zeros(T)       # task별 생산 능력
+        self._dwell = np.zeros(T)     # wip_dwell_time (NaN=정의 불가) — 관측·shaping 공용 캐시
+        self._achieved = 0.0          # Σ min(produced, plan)
+        self._mask: np.ndarray | None = None  # 현재 상태의 action mask (전이마다 무효화)
+        self._buf = np.zeros(self._obs_dim, dtype=np.float32)
+        self._o_plan = self._buf[:T]
+        self._o_wip = self._buf[mt:mt + T]
+        o = 2 * mt
+        self._o_assign = self._buf[o:o + mm * mt].reshape(mm, mt)[:M, :T]
+        o += mm * mt
+        self._o_change = self._buf[o:o + mm * mt].reshape(mm, mt)[:M, :T]
+        o += mm * mt
+        self._o_hour = o
+        self._o_dwell = self._buf[o + 1:o + 1 + T] if self.dwell_obs else None
+
+    def spawn(self) -> DispatchEnv:
+        """같은 문제·설정의 새 env — move list·action 표·정규화 상수·target을 공유하고 상태만 새로."""
+        env = copy.copy(self)
+        env._np_random = None
+        env.sim = Simulator(self.p)
+        env._state = None
+        env._substeps = 0
+        env._init_buffers()
+        return env
+
+    def attach_state(self, state) -> None:
+        """외부 SimState를 env 상태로 연결 (RL 추론·MCTS prior) — 관측 버퍼를 새로 채운다."""
+        self._state = state
+        self._substeps = 0
+        self._sync()
+
+    def _sync(self) -> None:
+        """상태 전체 → 배열·관측 버퍼 (reset·attach)."""
+        s = self._state
+        self._mask = None
+        pos = self.p.index.model_pos
+        self._assign.fill(0.0)
+        self._switch.fill(0.0)
+        for (m, ti), c in s.assign.items():
+            self._assign[pos[m], ti] = c
+        for (m, ti), c in s.switching.items():
+            self._switch[pos[m], ti] = c
+        self._o_assign[:] = self._assign / self._assign_den[:, None]
+        self._o_change[:] = np.minimum(1.0, self._switch / self._change_den[:, None])
+        for ti in range(self.n_tasks):
+            self._cap[ti] = self._task_capacity(ti)
+        self._write_tasks()
+
+    def _after_hour(self) -> None:
+        """시간 확정 반영 — 배정은 그대로이고 전환 중이던 칸과 task별 생산·WIP만 바뀐다."""
+        s = self._state
+        self._mask = None
+        models = self.models
+        touched = set()
+        for mi, ti in zip(*np.nonzero(self._switch)):
+            mi, ti = int(mi), int(ti)
+            sw = self._switch[mi, ti] = s.switching.get((models[mi], ti), 0)
+            self._o_change[mi, ti] = min(1.0, sw / self._change_den[mi])
+            touched.add(ti)
+        for ti in touched:
+            self._cap[ti] = self._task_capacity(ti)
+        self._write_tasks()
+
+    def _write_tasks(self) -> None:
+        """task별 생산·WIP·dwell 칸과 시간 칸 (T ≤ MAX_TASKS라 스칼라 갱신이 배열 연산보다 빠르다)."""
+        s = self._state
+        achieved = 0.0
+        for ti in range(self.n_tasks):
+            produced, wip, plan = s.produced[ti], s.wip[ti], self._plan[ti]
+            self._produced[ti] = produced
+            self._wip[ti] = wip
+            achieved += min(produced, plan)
+            self._o_plan[ti] = max(0.0, plan - produced) / plan if plan else 0.0
+            self._o_wip[ti] = min(1.0, wip / self._max_wip)
+        self._achieved = achieved
+        for ti in range(self.n_tasks):
+            self._update_dwell(ti)
+        self._buf[self._o_hour] = s.hour / max(1, self.p.horizon_hours)
+
+    def record_move(self, mv: Move) -> None:
+        """적용된 이동의 (model, from/to) 칸과 영향받는 task의 dwell만 다시 쓴다."""
+        s = self._state
+        self._mask = None
+        mi = self.p.index.model_pos[mv.model]
+        for ti in (mv.from_index, mv.to_index):
+            key = (mv.model, ti)
+            a = self._assign[mi, ti] = s.assign.get(key, 0)
+            sw = self._switch[mi, ti] = s.switching.get(key, 0)
+            self._o_assign[mi, ti] = a / self._assign_den[mi]
+            self._o_change[mi, ti] = min(1.0, sw / self._change_den[mi])
+            self._cap[ti] = self._task_capacity(ti)
+        nxt = self.p.index.next_task
+        for ti in {mv.from_index, mv.to_index, nxt[mv.from_index], nxt[mv.to_index]}:
+            if ti is not None:
+                self._update_dwell(ti)
+
+    def _task_capacity(self, ti: int) -> float:
+        a, sw = self._assign, self._switch
+        cap = 0.0
+        for mi, uph in self._task_models[ti]:
+            active = a[mi, ti] - sw[mi, ti]
+            if active > 0:
+                cap += active * uph
+        return cap
+
+    def _update_dwell(self, ti: int) -> None:
+        prev = self.p.index.prev_task[ti]
+        d = dwell_time(
+            self._wip[ti], self._cap[ti], None if prev is None else self._cap[prev], self._horizon,
+        )
+        self._dwell[ti] = np.nan if d is None else d
+        if self._o_dwell is not None:
+            self._o_dwell[ti] = 0.0 if d is None else d / self._horizon
+
     def _obs(self) -> np.ndarray:
-        p, s = self.p, self._state
-        plan_part = [0.0] * self.mt
-        for i, t in enumerate(p.tasks):
-            rem = max(0, t.plan_qty - s.produced[i])
-            plan_part[i] = rem / t.plan_qty if t.plan_qty else 0.0
-        max_wip = max([t.init_wip for t in p.tasks] + [1])
-        wip_part = [0.0] * self.mt
-        for i in range(self.n_tasks):
-            wip_part[i] = min(1.0, s.wip[i] / max_wip)
-        assign_part = [0.0] * (self.mm * self.mt)
-        for mi, m in enumerate(self.models):
-            cap = max(1, p.eqp_qty[m])
-            for i in range(self.n_tasks):
-                assign_part[mi * self.mt + i] = s.assign.get((m, i), 0) / cap
-        change_part = [0.0] * (self.mm * self.mt)
-        for mi, m in enumerate(self.models):
-            max_change = p.switch_time_hours * max(1, p.eqp_qty[m])
-            for i in range(self.n_tasks):
-                change_part[mi * self.mt + i] = min(
-                    1.0, s.switching.get((m, i), 0) / max_change
-                )
-        hour_part = [s.hour / max(1, p.horizon_hours)]
-        base = plan_part + wip_part + assign_part + change_part + hour_part
-        if self.dwell_obs:
-            H = float(p.horizon_hours)
-            dwell_part = [0.0] * self.mt
-            for i in range(self.n_tasks):
-                d = self.sim.wip_dwell_time(s, i)
-                dwell_part[i] = 0.0 if d is None else min(d, H) / H
-            base = base + dwell_part
-        return np.asarray(base, dtype=np.float32)
+        """관측 버퍼 사본 (버퍼는 다음 전이에서 덮어쓰므로 복사해 넘긴다)."""
+        return self._buf.copy()
 
     def action_masks(self) -> np.ndarray:
-        mask = np.zeros(self.action_space.n, dtype=bool)
-        mask[0] = True
-        for mv in self.sim.valid_moves(self._state):
-            idx = self._move_to_idx.get(mv)
-            if idx is not None:
-                mask[idx] = True
-        return mask
+        """현재 상태의 유효 action — 상태가 바뀔 때까지 한 번만 계산해 재사용.
+
+        캐시 배열을 그대로 돌려준다: 호출자는 수정하지 말 것 (고쳐 쓰려면 copy).
+        """
+        if self._mask is None:
+            mask = np.zeros(self.action_space.n, dtype=bool)
+            mask[self._action_of[self.sim.valid_move_mask(self._state)]] = True
+            mask[0] = True
+            self._mask = mask
+        return self._mask
 
     def reset(self, *, seed=None, options=None):
         super().reset(seed=seed)
-        self._state = self.sim.reset()
-        self._substeps = 0
+        self.attach_state(self.sim.reset())
         return self._obs(), {}
 
     def _dwell_shaping_reward(self) -> float:
         if self.dwell_lambda == 0.0:
             return 0.0
-        p, s = self.p, self._state
-        H = float(p.horizon_hours)
-        total_plan = sum(t.plan_qty for t in p.tasks) or 1
-        shaping = 0.0
-        for i, t in enumerate(p.tasks):
-            remaining = max(0, t.plan_qty - s.produced[i])
-            if remaining == 0:
-                continue
-            d = self.sim.wip_dwell_time(s, i)
-            if d is None:
-                continue
-            weight = remaining / total_plan
-            shaping += weight * min(d, H) / H
-        return self.dwell_lambda * shaping
+        d = self._dwell
+        remaining = np.maximum(0.0, self._plan - self._produced)
+        use = (remaining > 0) & ~np.isnan(d)
+        weight = remaining[use] / self._total_plan
+        return self.dwell_lambda * float((weight * np.minimum(d[use], self._horizon) / self._horizon).sum())
 
     def _current_util(self) -> float:
         total = sum(self.p.eqp_qty.values()) or 1
@@ -155,7 +261,7 @@ class DispatchEnv(gym.Env):
         return self.alloc_lambda * (1.0 - total_pen / count)
 
     def step(self, action: int):
-        p, s = self.p, self._state
+        s = self._state
         before = self._achievement_qty()
         dwell_r = alloc_r = 0.0
         if action == 0:
@@ -164,16 +270,16 @@ class DispatchEnv(gym.Env):
             self._commit()
         else:
             mv = self.move_list[action - 1]
-            if mv in set(self.sim.valid_moves(s)):
+            if self.action_masks()[action]:
                 self.sim.apply_move(s, mv)
+                self.record_move(mv)
             self._substeps += 1
             if self._substeps >= self.max_substeps:
                 dwell_r = self._dwell_shaping_reward()
                 alloc_r = self._alloc_guide_reward()
                 self._commit()
         gained = self._achievement_qty() - before
-        total_plan = sum(t.plan_qty for t in p.tasks) or 1
-        reward = gained / total_plan + dwell_r + alloc_r
+        reward = gained / self._total_plan + dwell_r + alloc_r
         terminated = self.sim.is_done(s)
         info = {}
         if terminated:
@@ -186,7 +292,7 @@ class DispatchEnv(gym.Env):
     def _commit(self):
         self.sim.advance_hour(self._state)
         self._substeps = 0
+        self._after_hour()
 
-    def _achievement_qty(self) -> int:
-        s, p = self._state, self.p
-        return sum(min(s.produced[i], t.plan_qty) for i, t in enumerate(p.tasks))
+    def _achievement_qty(self) -> float:
+        return self._achieved
@@ -0,0 +1,115 @@
+"""문제별 준비된 DispatchEnv 캐시 — target 배분·move list·정규화 상수를 한 번만 만든다.
+
+키는 (문제 content_hash, 관련 설정값, alloc 모델 파일 mtime)이고 최근 사용 순으로
+config.PREPARED_CACHE_SIZE개까지만 둔다 (LRU). 같은 내용의 문제를
+다시 읽어도, 학습 작업자·shape 검사·교사 데이터·평가가 같은 준비본을 쓴다.
+env 자체는 상태를 가지므로 공유하지 않고 템플릿에서 spawn()해 나눠준다.
+"""
+from __future__ import annotations
+
+from collections import OrderedDict
+from dataclasses import dataclass, field
+
+import config
+from envs.dispatch_env import DispatchEnv
+from src.simulation.domain.problem import ProblemInstance
+
+_PREPARED: OrderedDict[tuple, PreparedDispatch] = OrderedDict()
+
+
+def clear_prepared_cache() -> None:
+    _PREPARED.clear()
+
+
+def _alloc_model_path():
+    return config.SAVED_MODELS_DIR / "ppo_alloc.zip"
+
+
+def _alloc_model_stamp() -> float | None:
+    if not (config.USE_ALLOC_MODEL and config.ALLOC_LAMBDA > 0.0):
+        return None
+    path = _alloc_model_path()
+    return path.stat().st_mtime if path.exists() else None
+
+
+def _config_key() -> tuple:
+    return (
+        config.MAX_TASKS, config.MAX_MODELS, config.DWELL_OBS, config.DWELL_LAMBDA,
+        config.ALLOC_LAMBDA, config.GUIDE_UTIL_THRESHOLD, config.GUIDE_BAND_PCT,
+        config.USE_ALLOC_MODEL, _alloc_model_stamp(),
+        # target 배분을 만드는 Stage 1 설정
+        config.ALLOC_POLICY, config.ALLOC_OPT_TIME_LIMIT_S,
+        config.ALLOC_CEM_POPULATION, config.ALLOC_CEM_ELITE_FRAC, config.ALLOC_CEM_ITERATIONS,
+        config.ALLOC_CEM_TIME_LIMIT_S, config.ALLOC_CEM_SEED,
+    )
+
+
+def compute_target_allocation(problem: ProblemInstance) -> dict:
+    """alloc 모델(있고 shape 일치)의 예측, 없으면 Stage 1 배분 — 캐시 없이 매번 계산."""
+    if config.USE_ALLOC_MODEL and config.ALLOC_LAMBDA > 0.0:
+        alloc_model_path = _alloc_model_path()
+        if alloc_model_path.exists():
+            from agents.model_store import load_alloc_model, alloc_model_matches
+            alloc_model = load_alloc_model(alloc_model_path)
+            if alloc_model is not None and alloc_model_matches(alloc_model, problem):
+                from envs.allocation_env import AllocationEnv
+                alloc_env = AllocationEnv(problem, max_tasks=config.MAX_TASKS,
+                                          max_models=config.MAX_MODELS)
+                obs, _ = alloc_env.reset()
+                action, _ = alloc_model.predict(obs, deterministic=True)
+                alloc_env.step(action)
+                return problem.complete_guide_allocation(alloc_env.get_allocation())
+    from src.stages.allocation.use_case import allocate
+    return allocate(problem).as_dict()
+
+
+@dataclass
+class PreparedDispatch:
+    problem: ProblemInstance
+    template: DispatchEnv                  # target 없이 만든 정적 구성 (직접 step하지 않는다)
+    _target: dict | None = field(default=None, repr=False)
+
+    @property
+    def target(self) -> dict:
+        """학습 보상용 목표 배분 (ALLOC_LAMBDA=0이면 {}) — 처음 필요할 때 1회 계산."""
+        if self._target is None:
+            self._target = compute_target_allocation(self.problem) if config.ALLOC_LAMBDA > 0.0 else {}
+        return self._target
+
+    @property
+    def shape(self) -> tuple[tuple[int, ...], int]:
+        return tuple(self.template.observation_space.shape), int(self.template.action_space.n)
+
+    def make(self, with_target: bool = True) -> DispatchEnv:
+        """새 env (상태·버퍼만 새로). 추론·shape 용도면 with_target=False로 target 계산을 건너뛴다."""
+        env = self.template.spawn()
+        if with_target:
+            env.target_allocation = self.target
+        return env
+
+
+def prepare_dispatch(problem: ProblemInstance) -> PreparedDispatch:
+    key = (problem.content_hash, _config_key())
+    prepared = _PREPARED.get(key)
+    if prepared is not None:
+        _PREPARED.move_to_end(key)
+    else:
+        template = DispatchEnv(
+            problem,
+            max_tasks=config.MAX_TASKS,
+            max_models=config.MAX_MODELS,
+            dwell_lambda=config.DWELL_LAMBDA,
+            alloc_lambda=config.ALLOC_LAMBDA,
+            dwell_obs=config.DWELL_OBS,
+            guide_util_threshold=config.GUIDE_UTIL_THRESHOLD,
+            guide_band_pct=config.GUIDE_BAND_PCT,
+        )
+        prepared = _PREPARED[key] = PreparedDispatch(problem, template)
+        while len(_PREPARED) > max(1, config.PREPARED_CACHE_SIZE):
+            _PREPARED.popitem(last=False)
+    return prepared
+
+
+def target_allocation(problem: ProblemInstance) -> dict:
+    """캐시된 목표 배분."""
+    return prepare_dispatch(problem).target
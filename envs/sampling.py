@@ -0,0 +1,64 @@
+"""문제 재표본 env — 학습 작업자가 맡은 문제 샤드에서 reset마다 문제를 다시 고른다."""
+from __future__ import annotations
+
+from typing import Callable
+
+import gymnasium as gym
+from gymnasium.utils import seeding
+
+from src.simulation.domain.problem import ProblemInstance
+
+
+def shard_problems(problems: list[ProblemInstance], n_shards: int, rank: int) -> list[ProblemInstance]:
+    """작업자 rank의 샤드 (problems[rank::n_shards]) — 문제가 작업자보다 적으면 돌려 쓴다."""
+    if not problems:
+        raise ValueError("샤드를 나눌 문제가 없습니다.")
+    return problems[rank::n_shards] or [problems[rank % len(problems)]]
+
+
+class ProblemSamplingEnv(gym.Env):
+    """샤드 안에서 reset마다 문제를 골라 해당 env로 진행.
+
+    문제별 env는 처음 뽑힐 때 한 번 만들어 재사용한다 (target 배분 등 준비 비용 1회).
+    obs/action 공간은 MAX_TASKS/MAX_MODELS로 고정되므로 첫 문제 env의 공간을 쓴다.
+    """
+
+    metadata = {"render_modes": []}
+
+    def __init__(self, problems: list[ProblemInstance],
+                 make_env: Callable[[ProblemInstance], gym.Env], seed: int | None = None):
+        super().__init__()
+        if not problems:
+            raise ValueError("ProblemSamplingEnv: 문제가 없습니다.")
+        self.problems = list(problems)
+        self._make_env = make_env
+        self._envs: dict[int, gym.Env] = {}
+        self.np_random, _ = seeding.np_random(seed)
+        self.env = self._env_for(0)
+        self.observation_space = self.env.observation_space
+        self.action_space = self.env.action_space
+        self.problem_index = 0
+
+    def _env_for(self, i: int) -> gym.Env:
+        env = self._envs.get(i)
+        if env is None:
+            env = self._envs[i] = self._make_env(self.problems[i])
+        return env
+
+    def reset(self, *, seed=None, options=None):
+        super().reset(seed=seed)
+        self.problem_index = int(self.np_random.integers(len(self.problems)))
+        self.env = self._env_for(self.problem_index)
+        obs, info = self.env.reset(seed=int(self.np_random.integers(2**31)))
+        return obs, {**info, "problem_index": self.problem_index}
+
+    def step(self, action):
+        return self.env.step(action)
+
+    def action_masks(self):
+        return self.env.action_masks()
+
+    def close(self):
+        for env in self._envs.values():
+            env.close()
+        self._envs.clear()
@@ -1,4 +1,4 @@
-"""CLI 진입점: train / infer / eval / export.
+"""CLI 진입점: train / infer / eval / export / solve.
 
 데이터 경로:
   data/raw/train/        — 학습 JSON
@@ -81,7 +81,7 @@ def cmd_train(args):
 
     from src.train import run_train
     problems = _load_problems(args, default_dir=config.TRAIN_DATA_DIR)
-    run_train(problems=problems, ppo_steps=args.steps)
+    run_train(problems=problems, ppo_steps=args.steps, n_envs=args.n_envs)
     print(f"학습 완료 → {config.MODEL_PATH}")
     print(f"결과 확인: http://localhost:{config.API_PORT} (UI)")
 
@@ -96,13 +96,17 @@ def cmd_eval(args):
     results = {}
     for path in sorted(config.TEST_DATA_DIR.glob("*.json")):
         p = load_problem(path)
-        res = evaluate_benchmark(p, model)
+        res = evaluate_benchmark(p, model, portfolio=args.portfolio)
         results[path.stem] = res
         parts = [f"H={res['heuristic']:.3f}"]
         if res.get("rl") is not None:
             parts.append(f"RL={res['rl']:.3f}")
+        if res.get("portfolio") is not None:
+            parts.append(f"PF={res['portfolio']:.3f}({res['portfolio_policy']})")
         if res.get("optimal") is not None:
             parts.append(f"OPT={res['optimal']:.3f}")
+        if res.get("upper_bound") is not None:
+            parts.append(f"UB={res['upper_bound']:.3f}")
         print(f"  {path.stem}: {' / '.join(parts)}")
     if results:
         avg_h = sum(r["heuristic"] for r in results.values()) / len(results)
@@ -118,10 +122,12 @@ def cmd_infer(args):
         named = _load_named_problems(args)
         model = load_dispatch_model() if Path(config.MODEL_PATH).exists() else None
         for name, p in named:
-            res = evaluate_benchmark(p, model)
+            res = evaluate_benchmark(p, model, portfolio=args.portfolio)
             parts = [f"H={res['heuristic']:.3f}"]
             if res.get("rl") is not None:
                 parts.append(f"RL={res['rl']:.3f}")
+            if res.get("portfolio") is not None:
+                parts.append(f"PF={res['portfolio']:.3f}({res['portfolio_policy']})")
             if res.get("optimal") is not None:
                 parts.append(f"OPT={res['optimal']:.3f}")
             print(f"  {name}: {' / '.join(parts)}")
@@ -138,6 +144,7 @@ def cmd_infer(args):
         horizon_hours=args.horizon,
         skip_input_export=args.skip_export,
         write_db=not args.no_db,
+        policy="PORTFOLIO" if args.portfolio else "RL",
     )
     label = out["rule_timekey"] + (f" [{out['facid']}]" if out.get("facid") else "")
     print(f"{label}: 입력 JSON → {out['input_json']}")
@@ -189,6 +196,25 @@ def cmd_export(args):
     print(f"ops 로그 → {OPS_LOG_PATH}")
 
 
+def cmd_solve(args):
+    from src.stages.dispatch.exact import write_ground_truth
+
+    if args.dataset:
+        paths = [_resolve_json_path(args.dataset)]
+    else:
+        paths = sorted(Path(args.dir or config.TEST_DATA_DIR).glob("*.json"))
+    for path in paths:
+        res = write_ground_truth(
+            path, time_limit=args.time_limit, epsilon=args.epsilon,
+            workers=args.workers, overwrite=args.overwrite,
+        )
+        if res is None:
+            print(f"  {path.stem}: ground_truth 있음 (건너뜀, --overwrite로 재계산)")
+            continue
+        tag = "최적" if res.optimal else f"상한 {res.upper_bound:.4f}"
+        print(f"  {path.stem}: OPT={res.plan_achievement:.4f} ({tag}, {res.nodes} nodes, {res.seconds:.1f}s)")
+
+
 def build_parser():
     parser = argparse.ArgumentParser(description="장비 전환 스케줄링 RL")
     sub = parser.add_subparsers(dest="cmd", required=True)
@@ -204,6 +230,8 @@ def build_parser():
     pt.add_argument("--facid")
     pt.add_argument("--batchid")
     pt.add_argument("--steps", type=int, default=config.DEFAULT_PPO_STEPS)
+    pt.add_argument("--n-envs", dest="n_envs", type=int, default=None,
+                    help="rollout 작업 프로세스 수 (기본 TRAIN_N_ENVS)")
     pt.set_defaults(func=cmd_train)
 
     pi = sub.add_parser("infer", help="추론 (DB 또는 --dataset)")
@@ -215,10 +243,12 @@ def build_parser():
     pi.add_argument("--horizon", type=int, default=12)
     pi.add_argument("--skip-export", action="store_true")
     pi.add_argument("--no-db", action="store_true")
+    pi.add_argument("--portfolio", action="store_true", help="등록 정책 전부 병렬 실행 후 최선 계획 채택")
     pi.set_defaults(func=cmd_infer)
 
     pe = sub.add_parser("eval", help="data/raw/test 전체 평가")
     pe.add_argument("--no-model", action="store_true")
+    pe.add_argument("--portfolio", action="store_true", help="등록 정책 전부 병렬 실행 후 최선 계획 채택")
     pe.set_defaults(func=cmd_eval)
 
     px = sub.add_parser("export", help="DB → JSON")
@@ -233,6 +263,15 @@ def build_parser():
     px.add_argument("--horizon", type=int, default=12)
     px.add_argument("--sample", action="store_true")
     px.set_defaults(func=cmd_export)
+
+    ps = sub.add_parser("solve", help="분기한정 정확해 → JSON ground_truth 기록")
+    ps.add_argument("--dataset")
+    ps.add_argument("--dir")
+    ps.add_argument("--time-limit", dest="time_limit", type=float, default=None)
+    ps.add_argument("--epsilon", type=float, default=None)
+    ps.add_argument("--workers", type=int, default=None)
+    ps.add_argument("--overwrite", action="store_true")
+    ps.set_defaults(func=cmd_solve)
     return parser
 
 
@@ -261,7 +261,7 @@ def dataset_paths_for_split(split: str) -> dict[str, Path]:
 def _episode_reward(problem, model) -> float | None:
     if model is None or not dispatch_model_matches(model, problem):
         return None
-    from envs.dispatch_env import DispatchEnv
+    from envs.prepared import prepare_dispatch
     from src.stages.allocation.use_case import allocate
     from src.utils.rows import guide_allocation_rows
 
@@ -275,17 +275,8 @@ def _episode_reward(problem, model) -> float | None:
         if task_idx is not None:
             target_alloc[(row["model"], task_idx)] = float(row["target_count"])
 
-    env = DispatchEnv(
-        problem,
-        max_tasks=config.MAX_TASKS,
-        max_models=config.MAX_MODELS,
-        dwell_lambda=config.DWELL_LAMBDA,
-        alloc_lambda=config.ALLOC_LAMBDA,
-        target_allocation=target_alloc,
-        dwell_obs=config.DWELL_OBS,
-        guide_util_threshold=config.GUIDE_UTIL_THRESHOLD,
-        guide_band_pct=config.GUIDE_BAND_PCT,
-    )
+    env = prepare_dispatch(problem).make(with_target=False)
+    env.target_allocation = target_alloc
     obs, _ = env.reset()
     total = 0.0
     terminated = False
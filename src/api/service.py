@@ -74,6 +74,7 @@ def summary(env_type: str = "dispatch") -> dict:
         rl = a["algorithms"]["rl"]
         best = rl or h
         optimal = a["optimal"]
+        upper = a.get("upper_bound")
         rows.append({
             "name": name,
             "heuristic": plan_achievement_for_env(h, env_type),
@@ -81,6 +82,9 @@ def summary(env_type: str = "dispatch") -> dict:
             "optimal": optimal,
             "gap": (plan_achievement_for_env(best, env_type) - optimal)
             if (best and optimal is not None) else None,
+            "upper_bound": upper,
+            "bound_gap": (plan_achievement_for_env(best, env_type) - upper)
+            if (best and upper is not None) else None,
             "heuristic_utilization": h["kpis"]["avg_utilization"] if h else None,
             "rl_utilization": rl["kpis"]["avg_utilization"] if rl else None,
             "heuristic_conversion_count": h["kpis"]["conversion_count"] if h else 0,
@@ -105,6 +109,8 @@ def summary(env_type: str = "dispatch") -> dict:
             "rl": _avg("rl"),
             "optimal": _avg("optimal"),
             "gap": _avg("gap"),
+            "upper_bound": _avg("upper_bound"),
+            "bound_gap": _avg("bound_gap"),
             "avg_utilization": _avg("avg_utilization"),
             "avg_conversion_count": _avg("conversion_count"),
         },
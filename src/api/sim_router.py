@@ -1,7 +1,6 @@
 """시뮬레이션 세션 API — 스텝별 간트 시각화용."""
 from __future__ import annotations
 
-import copy
 import uuid
 from datetime import datetime, timedelta
 from typing import Literal
@@ -10,8 +9,9 @@ from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 
 from src.simulation.domain.problem import Move, ProblemInstance
-from src.simulation.domain.state import SimState
+from src.simulation.domain.state import SimState, SnapshotHistory
 from src.simulation.kernel.simulator import Simulator
+from src.stages.dispatch.whatif import Branch, check_moves, policy_fn_for, policy_fns_for, run_branches
 from src.utils.json_io import load_problem
 
 router = APIRouter(prefix="/api/sim", tags=["simulation"])
@@ -30,6 +30,18 @@ class MoveRequest(BaseModel):
     to_index: int
 
 
+class ForkBranchRequest(BaseModel):
+    policy: str | None = None  # 등록 정책 이름 또는 "rl" (없으면 수동 이동만)
+    moves: list[MoveRequest] = []
+    label: str | None = None
+
+
+class ForkRequest(BaseModel):
+    hour: int | None = None  # 분기 시각 (기본: 현재 시각)
+    branches: list[ForkBranchRequest]
+    workers: int | None = None
+
+
 def _parse_timekey(tk: str) -> datetime:
     return datetime.strptime(str(tk)[:12].ljust(12, "0"), "%Y%m%d%H%M")
 
@@ -62,7 +74,7 @@ def _stable_assign(
     return result
 
 
-def _build_gantt(problem: ProblemInstance, snapshots: list[SimState]) -> list[dict]:
+def _build_gantt(problem: ProblemInstance, snapshots: SnapshotHistory) -> list[dict]:
     """스냅샷 이력으로 간트 세그먼트 생성. snapshots[h] = hour h 시작 직전 상태."""
     if len(snapshots) < 2:
         return []
@@ -159,7 +171,7 @@ def _session_response(session: dict) -> dict:
     problem: ProblemInstance = session["problem"]
     state: SimState = session["state"]
     sim: Simulator = session["sim"]
-    snapshots: list[SimState] = session["snapshots"]
+    snapshots: SnapshotHistory = session["snapshots"]
 
     valid_moves = [
         {
@@ -206,6 +218,8 @@ def _session_response(session: dict) -> dict:
         "start_time": base_dt.isoformat(),
         "end_time": (base_dt + timedelta(hours=problem.horizon_hours)).isoformat(),
         "mode": session.get("mode", "manual"),
+        "parent_id": session.get("parent"),
+        "fork_hour": session.get("fork_hour"),
         "rl_available": session.get("policy_fn") is not None if session.get("mode") == "rl" else None,
         "gantt": _build_gantt(problem, snapshots),
         "wip": wip_list,
@@ -215,17 +229,7 @@ def _session_response(session: dict) -> dict:
 
 
 def _make_policy_fn(mode: str, problem: ProblemInstance):
-    if mode == "heuristic":
-        from agents.registry import get_dispatch
-        return get_dispatch("heuristic")
-    if mode == "rl":
-        from agents.model_store import load_dispatch_model
-        from agents.rl_dispatch import rl_dispatch_factory
-        model = load_dispatch_model()
-        if model is None:
-            return None
-        return rl_dispatch_factory(model, problem)
-    return None
+    return policy_fn_for(mode, problem)
 
 
 @router.post("/start")
@@ -245,7 +249,7 @@ def sim_start(req: StartRequest):
         "problem": problem,
         "sim": sim,
         "state": state,
-        "snapshots": [copy.deepcopy(state)],
+        "snapshots": SnapshotHistory([state.clone()]),
         "mode": req.mode,
         "policy_fn": policy_fn,
     }
@@ -275,7 +279,7 @@ def sim_advance(sid: str):
         raise HTTPException(status_code=400, detail="simulation already done")
 
     sim.advance_hour(state)
-    session["snapshots"].append(copy.deepcopy(state))
+    session["snapshots"].append(state.clone())
     return _session_response(session)
 
 
@@ -296,7 +300,7 @@ def sim_auto_step(sid: str):
         policy_fn(sim, state)
 
     sim.advance_hour(state)
-    session["snapshots"].append(copy.deepcopy(state))
+    session["snapshots"].append(state.clone())
     return _session_response(session)
 
 
@@ -315,7 +319,7 @@ def sim_move(sid: str, req: MoveRequest):
         raise HTTPException(status_code=400, detail="invalid task index")
 
     mv = Move(req.model, req.from_index, req.to_index)
-    if mv not in set(sim.valid_moves(state)):
+    if not sim.is_valid_move(state, mv):
         raise HTTPException(status_code=400, detail="invalid move")
 
     sim.apply_move(state, mv)
@@ -331,10 +335,80 @@ def sim_reset(sid: str):
     sim: Simulator = session["sim"]
     state = sim.reset()
     session["state"] = state
-    session["snapshots"] = [copy.deepcopy(state)]
+    session["snapshots"] = SnapshotHistory([state.clone()])
     return _session_response(session)
 
 
+@router.post("/{sid}/fork")
+def sim_fork(sid: str, req: ForkRequest):
+    """hour 시점에서 분기별(정책·수동 이동) 자식 세션을 만들어 horizon까지 병렬 실행, KPI 비교.
+
+    자식 스냅샷 이력은 부모의 0..hour 구간을 참조로 공유하고 분기 이후만 따로 가진다.
+    """
+    session = _sessions.get(sid)
+    if not session:
+        raise HTTPException(status_code=404, detail="session not found")
+
+    import agents  # noqa: F401 — register
+    from agents.registry import list_dispatch
+
+    problem: ProblemInstance = session["problem"]
+    sim: Simulator = session["sim"]
+    state: SimState = session["state"]
+    history: SnapshotHistory = session["snapshots"]
+    hour = state.hour if req.hour is None else req.hour
+    if not 0 <= hour <= state.hour or hour >= problem.horizon_hours:
+        raise HTTPException(status_code=400, detail=f"invalid fork hour: {hour}")
+    if not req.branches:
+        raise HTTPException(status_code=400, detail="no branches")
+    base = state if hour == state.hour else history[hour]
+
+    n = len(problem.tasks)
+    known = set(list_dispatch()) | {"rl", "manual"}
+    branches: list[Branch] = []
+    for i, b in enumerate(req.branches):
+        if b.policy is not None and b.policy not in known:
+            raise HTTPException(status_code=400, detail=f"branch {i}: unknown policy {b.policy}")
+        if any(m.from_index >= n or m.to_index >= n for m in b.moves):
+            raise HTTPException(status_code=400, detail=f"branch {i}: invalid task index")
+        moves = tuple(Move(m.model, m.from_index, m.to_index) for m in b.moves)
+        bad = check_moves(sim, base, moves)
+        if bad is not None:
+            raise HTTPException(status_code=400, detail=f"branch {i}: invalid move #{bad}")
+        branches.append(Branch(b.policy, moves, b.label or b.policy or "manual"))
+
+    # 자식 세션의 정책은 서로 다른 모드마다 한 번만 (rl 모델을 분기마다 다시 읽지 않는다)
+    policies = policy_fns_for((b.policy or "manual" for b in branches), problem)
+    children = []
+    for res in run_branches(problem, base, branches, workers=req.workers):
+        history_child = history.fork(hour + 1)
+        for snap in res.snapshots:
+            history_child.append(snap)
+        mode = res.branch.policy or "manual"
+        cid = str(uuid.uuid4())
+        _sessions[cid] = {
+            "problem": problem,
+            "sim": sim,
+            "state": res.state,
+            "snapshots": history_child,
+            "mode": mode,
+            "policy_fn": policies[mode],
+            "parent": sid,
+            "fork_hour": hour,
+        }
+        children.append({
+            "session_id": cid,
+            "label": res.branch.label,
+            "policy": mode,
+            "policy_available": res.policy_available,
+            "plan_achievement": res.metrics["plan_achievement"],
+            "conversions": res.conversions,
+            "per_task": res.metrics["per_task"],
+        })
+    best = max(children, key=lambda c: (c["plan_achievement"], -c["conversions"]))
+    return {"session_id": sid, "fork_hour": hour, "children": children, "best": best["session_id"]}
+
+
 @router.delete("/{sid}")
 def sim_delete(sid: str):
     _sessions.pop(sid, None)
@@ -16,6 +16,7 @@ class PolicyRunResult:
     output_tables: dict[str, list[dict]] = field(default_factory=dict)
     assign_rows: list[dict] = field(default_factory=list)
     conv_rows: list[dict] = field(default_factory=list)
+    unit_conversions: list[dict] | None = None  # 호기 커널 전환 기록 (없으면 뷰에서 trace 재생)
 
     def to_legacy_dict(self, prefix: str = "") -> dict[str, Any]:
         p = prefix
@@ -29,9 +30,11 @@ class PolicyRunResult:
             f"{p}conv_rows" if p else "conv_rows": self.conv_rows,
             f"{p}allocation_rows" if p else "allocation_rows": self.assign_rows,
         }
+        if self.unit_conversions is not None:
+            out[f"{p}unit_conversions" if p else "unit_conversions"] = self.unit_conversions
         if p:
-            out["rl"] = self.run.plan_achievement
-            out["rl_per_task"] = self.run.per_task
+            out[p.rstrip("_")] = self.run.plan_achievement
+            out[f"{p}per_task"] = self.run.per_task
         else:
             out["heuristic"] = self.run.plan_achievement
             out["heuristic_per_task"] = self.run.per_task
@@ -45,13 +48,22 @@ class EvaluationResult:
     guide: GuideAllocation
     optimal: float | None = None
     rl: PolicyRunResult | None = None
+    upper_bound: float | None = None  # LP 완화 상한 (ground_truth 없어도 항상 계산)
+    portfolio: PolicyRunResult | None = None  # 포트폴리오 모드 최선 계획
+    portfolio_scores: dict[str, dict] = field(default_factory=dict)  # 정책별 달성률·전환 수
 
     def to_legacy_dict(self) -> dict[str, Any]:
         out = self.heuristic.to_legacy_dict()
         out["guide_allocation"] = self.guide.as_dict()
+        out["guide_source"] = self.guide.source
         out["optimal"] = self.optimal
+        out["upper_bound"] = self.upper_bound
         if self.rl is not None:
             out.update(self.rl.to_legacy_dict(prefix="rl_"))
             out["rl"] = self.rl.run.plan_achievement
             out["rl_per_task"] = self.rl.run.per_task
+        if self.portfolio is not None:
+            out.update(self.portfolio.to_legacy_dict(prefix="portfolio_"))
+            out["portfolio_policy"] = self.portfolio.run.policy_name
+            out["portfolio_scores"] = self.portfolio_scores
         return out
@@ -1,9 +1,13 @@
 """시뮬레이션 실행 결과 계약."""
 from __future__ import annotations
 
-from dataclasses import dataclass, field
+from bisect import bisect_right
+from collections.abc import Iterable, Iterator, Sequence
+from dataclasses import dataclass
 from typing import Any
 
+import numpy as np
+
 from src.simulation.domain.problem import Move
 from src.simulation.domain.state import SimState
 
@@ -22,6 +26,7 @@ class HourlyStat:
     cumulative_produced: dict[int, int]
     util_rate: float
     assign_snapshot: dict[tuple[str, int], int]
+    active_eqp: int = 0  # 그 시간 생산 중 장비 수 (util_rate의 분자 — 부분문제 병합용)
 
     def to_dict(self) -> dict[str, Any]:
         return {
@@ -30,6 +35,7 @@ class HourlyStat:
             "cumulative_produced": dict(self.cumulative_produced),
             "util_rate": self.util_rate,
             "assign_snapshot": dict(self.assign_snapshot),
+            "active_eqp": self.active_eqp,
         }
 
     @classmethod
@@ -40,18 +46,99 @@ class HourlyStat:
             cumulative_produced=dict(d["cumulative_produced"]),
             util_rate=float(d["util_rate"]),
             assign_snapshot=dict(d["assign_snapshot"]),
+            active_eqp=int(d.get("active_eqp", 0)),
         )
 
 
+@dataclass(frozen=True, eq=False)
+class QuiescentSpan:
+    """정책 호출 없이 closed form으로 건넌 구간 — 시간별 통계·trace는 접근할 때 펼친다.
+
+    배치가 고정이므로 스냅샷 하나와 누적 생산 (hours+1, T)·시간별 생산 장비 수 (hours,)만 둔다.
+    """
+    start: int
+    assign_snapshot: dict[tuple[str, int], int]
+    cumulative: np.ndarray   # [k] = start+k시간 시작 시점 누적 생산
+    active: np.ndarray
+    total_eqp: int
+
+    def __len__(self) -> int:
+        return len(self.active)
+
+    def stat(self, k: int) -> HourlyStat:
+        cum = self.cumulative
+        busy = int(self.active[k])
+        return HourlyStat(
+            hour=self.start + k,
+            hourly_produce=dict(enumerate((cum[k + 1] - cum[k]).tolist())),
+            cumulative_produced=dict(enumerate(cum[k + 1].tolist())),
+            util_rate=round(busy / self.total_eqp, 4),
+            assign_snapshot=self.assign_snapshot,
+            active_eqp=busy,
+        )
+
+    def step(self, k: int) -> TraceStep:
+        return TraceStep(hour=self.start + k, moves=(), assign_snapshot=self.assign_snapshot)
+
+
+class HourlySeries(Sequence):
+    """시간순 HourlyStat/TraceStep 열 — QuiescentSpan 항목은 인덱싱·순회할 때만 시간별로 펼친다."""
+
+    def __init__(self, items: Iterable, expand: str):
+        self._items = tuple(items)
+        self._expand = expand  # "stat" | "step"
+        self._starts: list[int] = []
+        n = 0
+        for item in self._items:
+            self._starts.append(n)
+            n += len(item) if isinstance(item, QuiescentSpan) else 1
+        self._len = n
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[k] for k in range(*i.indices(self._len))]
+        if i < 0:
+            i += self._len
+        if not 0 <= i < self._len:
+            raise IndexError(i)
+        j = bisect_right(self._starts, i) - 1
+        item = self._items[j]
+        if isinstance(item, QuiescentSpan):
+            return getattr(item, self._expand)(i - self._starts[j])
+        return item
+
+    def __iter__(self) -> Iterator:
+        for item in self._items:
+            if isinstance(item, QuiescentSpan):
+                expand = getattr(item, self._expand)
+                for k in range(len(item)):
+                    yield expand(k)
+            else:
+                yield item
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Sequence) or isinstance(other, str):
+            return NotImplemented
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+
+    def __repr__(self) -> str:
+        return f"HourlySeries(len={self._len}, items={len(self._items)})"
+
+
 @dataclass(frozen=True)
 class SimulationRun:
     """Stage 2 dispatch 실행 결과."""
     final_state: SimState
-    trace: tuple[TraceStep, ...]
-    hourly_stats: tuple[HourlyStat, ...]
+    trace: Sequence[TraceStep]           # HourlySeries — 정지 구간은 QuiescentSpan 하나로 압축
+    hourly_stats: Sequence[HourlyStat]
     plan_achievement: float
     per_task: dict[str, dict]
     policy_name: str = "heuristic"
+    unit_positions: tuple[dict[tuple[str, int], list[str]], ...] | None = None  # 호기 커널 실행 시
+    unit_conversions: tuple[dict, ...] | None = None
 
     @property
     def legacy_trace(self) -> list:
@@ -70,12 +157,19 @@ class SimulationRun:
         hourly_stats: list[dict],
         metrics: dict,
         policy_name: str = "heuristic",
+        unit_positions: list[dict] | None = None,
+        unit_conversions: list[dict] | None = None,
     ) -> SimulationRun:
-        steps = tuple(
-            TraceStep(hour=h, moves=tuple(moves), assign_snapshot=dict(snap))
-            for h, moves, snap in trace
-        )
-        stats = tuple(HourlyStat.from_dict(s) for s in hourly_stats)
+        """trace·hourly_stats 항목 자리에 QuiescentSpan이 오면 펼치지 않고 그대로 담는다."""
+        steps = HourlySeries((
+            step if isinstance(step, QuiescentSpan)
+            else TraceStep(hour=step[0], moves=tuple(step[1]), assign_snapshot=dict(step[2]))
+            for step in trace
+        ), "step")
+        stats = HourlySeries((
+            stat if isinstance(stat, QuiescentSpan) else HourlyStat.from_dict(stat)
+            for stat in hourly_stats
+        ), "stat")
         return cls(
             final_state=final,
             trace=steps,
@@ -83,4 +177,6 @@ class SimulationRun:
             plan_achievement=float(metrics["plan_achievement"]),
             per_task=dict(metrics["per_task"]),
             policy_name=policy_name,
+            unit_positions=tuple(unit_positions) if unit_positions is not None else None,
+            unit_conversions=tuple(unit_conversions) if unit_conversions is not None else None,
         )
@@ -9,8 +9,8 @@ _LOG_MAX_LEN = 4000
 
 
 def guide_source_to_mode_typ(guide_source: str) -> str:
-    """가이드 산출 방식 → MODE_TYP (AI=RL, 그 외=Heuristic)."""
-    return "RL" if guide_source == "ALLOC_RL" else "Heuristic"
+    """가이드 산출 방식 → MODE_TYP (AI=RL, 최적화=OPT, CEM 탐색=CEM, 그 외=Heuristic)."""
+    return {"ALLOC_RL": "RL", "ALLOC_OPT": "OPT", "ALLOC_CEM": "CEM"}.get(guide_source, "Heuristic")
 
 
 def allocation_metrics(
@@ -34,10 +34,12 @@ def build_eqpconvplan_rows(
     trace: list,
     *,
     facid: str | None = None,
+    conversions: list[dict] | None = None,
 ) -> list[dict]:
     """batch 전환 이동 → RTS_EQPCONVPLAN_INF/HIS 행.
 
     problem.equipments(실제 호기 명단)가 있으면 전환 호기 EQP_ID·모델을 채운다.
+    conversions(호기 커널 결과)가 있으면 trace 재생을 생략한다.
     """
     from src.utils.eqp_units import track_units
 
@@ -47,7 +49,8 @@ def build_eqpconvplan_rows(
     seq = 0
     has_real_eqp = bool(problem.equipments)
     # track_units conversions는 아래 루프와 동일 순서(batch 전환 이동만)로 생성됨
-    _, conversions = track_units(problem, trace)
+    if conversions is None:
+        _, conversions = track_units(problem, trace)
 
     for hour, applied_moves, _snapshot in trace:
         event_tm = _event_tm_for_hour(rk, hour)
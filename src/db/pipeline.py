@@ -150,7 +150,7 @@ def run_inference(
         from sb3_contrib import MaskablePPO
         model = MaskablePPO.load(config.MODEL_PATH)
 
-    eval_result = report.evaluate_benchmark(problem, model)
+    eval_result = report.evaluate_benchmark(problem, model, portfolio=policy == "PORTFOLIO")
     result_doc = build_inference_result_document(problem, eval_result, policy=policy)
     result_path = save_inference_result_document(result_doc, result_json_path(rk, fac))
 
@@ -158,7 +158,7 @@ def run_inference(
         from src.db.adapter import write_inference_result
         write_inference_result(rk, result_doc)
 
-    rate = eval_result.get("rl", eval_result["heuristic"])
+    rate = eval_result.get("portfolio", eval_result.get("rl", eval_result["heuristic"]))
     log_ops(
         "infer.done",
         rule_timekey=rk,
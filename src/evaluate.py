@@ -8,7 +8,10 @@ from src.contracts.evaluation import EvaluationResult, PolicyRunResult
 from src.utils.rows import enrich_eval_result
 from src.simulation.domain.problem import ProblemInstance
 from src.stages.allocation.use_case import allocate
+from src.stages.dispatch.bound import lp_upper_bound
+from src.stages.dispatch.portfolio import run_portfolio
 from src.stages.dispatch.use_case import run_dispatch
+from src.stages.robustness.use_case import Perturbation, RobustnessSummary, monte_carlo
 
 
 def _policy_run(problem: ProblemInstance, run, extra: dict) -> PolicyRunResult:
@@ -18,25 +21,37 @@ def _policy_run(problem: ProblemInstance, run, extra: dict) -> PolicyRunResult:
         output_tables=extra.get("output_tables", {}),
         assign_rows=extra.get("assign_rows", []),
         conv_rows=extra.get("conv_rows", extra.get("eqpconvplan_rows", [])),
+        unit_conversions=extra.get("unit_conversions"),
     )
 
 
-def evaluate_benchmark(problem: ProblemInstance, model=None) -> dict:
+def _enrich(problem: ProblemInstance, run) -> dict:
+    return enrich_eval_result(
+        problem, run.legacy_trace, run.legacy_hourly_stats,
+        positions=list(run.unit_positions) if run.unit_positions is not None else None,
+        conversions=list(run.unit_conversions) if run.unit_conversions is not None else None,
+    )
+
+
+def evaluate_benchmark(problem: ProblemInstance, model=None, portfolio: bool = False) -> dict:
     """벤치마크 1건 평가 — 레거시 dict 반환 (API 호환)."""
-    return evaluate(problem, model=model).to_legacy_dict()
+    return evaluate(problem, model=model, portfolio=portfolio).to_legacy_dict()
 
 
-def evaluate(problem: ProblemInstance, model=None) -> EvaluationResult:
+def evaluate(problem: ProblemInstance, model=None, portfolio: bool = False) -> EvaluationResult:
+    """휴리스틱(·RL) 평가. portfolio=True면 등록 정책 전부를 병렬 실행해 최선 계획도 싣는다."""
     guide = allocate(problem)
-    h_run = run_dispatch(problem, guide, policy="heuristic")
-    h_extra = enrich_eval_result(problem, h_run.legacy_trace, h_run.legacy_hourly_stats)
+    if portfolio:
+        return _evaluate_portfolio(problem, guide, model)
+    h_run = run_dispatch(problem, guide, policy="heuristic", kernel="unit")
+    h_extra = _enrich(problem, h_run)
     heuristic = _policy_run(problem, h_run, h_extra)
 
     rl_result = None
     if model is not None and dispatch_model_matches(model, problem):
         rl_fn = rl_dispatch_factory(model, problem)
-        rl_run = run_dispatch(problem, guide, policy=rl_fn, policy_name="rl")
-        rl_extra = enrich_eval_result(problem, rl_run.legacy_trace, rl_run.legacy_hourly_stats)
+        rl_run = run_dispatch(problem, guide, policy=rl_fn, policy_name="rl", kernel="unit")
+        rl_extra = _enrich(problem, rl_run)
         rl_result = _policy_run(problem, rl_run, rl_extra)
 
     return EvaluationResult(
@@ -44,4 +59,52 @@ def evaluate(problem: ProblemInstance, model=None) -> EvaluationResult:
         guide=guide,
         optimal=problem.ground_truth.get("plan_achievement"),
         rl=rl_result,
+        upper_bound=lp_upper_bound(problem),
+    )
+
+
+def _evaluate_portfolio(problem: ProblemInstance, guide, model) -> EvaluationResult:
+    result = run_portfolio(problem, guide, model=model, kernel="unit")
+    enriched: dict[str, PolicyRunResult] = {}
+
+    def policy_run(name: str) -> PolicyRunResult:
+        if name not in enriched:
+            run = result.runs[name]
+            enriched[name] = _policy_run(problem, run, _enrich(problem, run))
+        return enriched[name]
+
+    if "heuristic" in result.runs:
+        heuristic = policy_run("heuristic")
+    else:
+        h_run = run_dispatch(problem, guide, policy="heuristic", kernel="unit")
+        heuristic = _policy_run(problem, h_run, _enrich(problem, h_run))
+    return EvaluationResult(
+        heuristic=heuristic,
+        guide=guide,
+        optimal=problem.ground_truth.get("plan_achievement"),
+        rl=policy_run("rl") if "rl" in result.runs else None,
+        upper_bound=lp_upper_bound(problem),
+        portfolio=policy_run(result.winner),
+        portfolio_scores=result.scores(),
     )
+
+
+def evaluate_robustness(
+    problem: ProblemInstance,
+    model=None,
+    n_replicas: int | None = None,
+    perturbation: Perturbation | None = None,
+    seed: int = 0,
+    workers: int | None = None,
+) -> dict[str, RobustnessSummary]:
+    """휴리스틱(및 RL) 계획의 Monte Carlo 분포 — P10/P50/P90 계획달성률·가동률."""
+    guide = allocate(problem)
+    runs = [run_dispatch(problem, guide, policy="heuristic")]
+    if model is not None and dispatch_model_matches(model, problem):
+        runs.append(run_dispatch(problem, guide, policy=rl_dispatch_factory(model, problem), policy_name="rl"))
+    return {
+        run.policy_name: monte_carlo(
+            problem, run, n_replicas=n_replicas, perturbation=perturbation, seed=seed, workers=workers,
+        )
+        for run in runs
+    }
@@ -5,7 +5,8 @@ from src.simulation.domain.problem import (
     Task,
     largest_remainder,
 )
-from src.simulation.domain.state import SimState
+from src.simulation.domain.index import ProblemIndex
+from src.simulation.domain.state import ArrayState, SimState
 
 __all__ = [
     "Equipment",
@@ -13,5 +14,7 @@ __all__ = [
     "ProblemInstance",
     "Task",
     "SimState",
+    "ArrayState",
+    "ProblemIndex",
     "largest_remainder",
 ]
@@ -1,4 +1,4 @@
-"""Stage 1 — 가이드 배분 값 객체."""
+"""Stage 1 — 가이드 배분 값 객체·정적 평가식."""
 from __future__ import annotations
 
 from dataclasses import dataclass
@@ -10,10 +10,38 @@ from src.simulation.domain.problem import ProblemInstance
 class GuideAllocation:
     """공정×모델 목표 장비 대수 (정수)."""
     counts: dict[tuple[str, int], int]
+    source: str = "ANALYTIC"  # ANALYTIC | ALLOC_RL | ALLOC_OPT | ALLOC_CEM — RTS_EQPALLOCATION.MODE_TYP 근거
 
     @classmethod
-    def from_raw(cls, problem: ProblemInstance, raw: dict[tuple[str, int], float | int]) -> GuideAllocation:
-        return cls(counts=problem.complete_guide_allocation(raw))
+    def from_raw(
+        cls, problem: ProblemInstance, raw: dict[tuple[str, int], float | int],
+        source: str = "ANALYTIC",
+    ) -> GuideAllocation:
+        return cls(counts=problem.complete_guide_allocation(raw), source=source)
 
     def as_dict(self) -> dict[tuple[str, int], int]:
         return dict(self.counts)
+
+
+def task_allocation_rate(problem: ProblemInstance, ti: int, counts: dict[str, int]) -> float:
+    """task 1개의 정적 달성률 — 배정 능력 × (horizon − 전환 유입 × switch_time) vs 계획."""
+    task = problem.tasks[ti]
+    if task.plan_qty <= 0:
+        return 1.0
+    idx = problem.index
+    cap = sum(c * float(idx.uph[idx.model_pos[m], ti]) for m, c in counts.items())
+    switches_in = sum(
+        max(0, c - problem.init_assign.get((m, ti), 0)) for m, c in counts.items()
+    )
+    eff_h = max(0.0, float(problem.horizon_hours) - switches_in * problem.switch_time_hours)
+    return min(cap * eff_h, task.plan_qty) / task.plan_qty
+
+
+def allocation_reward(problem: ProblemInstance, alloc: dict[tuple[str, int], int]) -> float:
+    """AllocationEnv 보상 — task별 정적 달성률 평균."""
+    per_task: list[dict[str, int]] = [{} for _ in problem.tasks]
+    for (m, ti), c in alloc.items():
+        if c and m in problem.index.model_pos and 0 <= ti < len(per_task):
+            per_task[ti][m] = c
+    rates = [task_allocation_rate(problem, ti, per_task[ti]) for ti in range(len(problem.tasks))]
+    return sum(rates) / len(rates) if rates else 0.0
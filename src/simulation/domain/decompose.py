@@ -0,0 +1,97 @@
+"""독립 부분문제 분해 — 서로 영향을 줄 수 없는 task 묶음으로 ProblemInstance를 나눈다.
+
+두 task가 상호작용하는 경우:
+  - 같은 batch (이동·tool 사용량 공유)
+  - batch가 같은 전환그룹 (batch 간 전환 이동 가능)
+  - 같은 제품 공정 체인의 앞뒤 (WIP 유입)
+모델은 task를 통해서만 상호작용하므로, 위 관계의 연결 요소끼리는 독립이다.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from src.simulation.domain.problem import ProblemInstance
+
+
+@dataclass(frozen=True)
+class Component:
+    """부분문제 + 전역 task 인덱스 매핑 (local ti → tasks[ti])."""
+    problem: ProblemInstance
+    tasks: tuple[int, ...]
+
+
+def task_components(problem: ProblemInstance) -> list[list[int]]:
+    """연결 요소별 전역 task 인덱스 (요소 내·요소 간 모두 최소 인덱스 순)."""
+    idx = problem.index
+    n = idx.n_tasks
+    parent = list(range(n))
+
+    def find(x: int) -> int:
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    def union(a: int, b: int) -> None:
+        ra, rb = find(a), find(b)
+        if ra != rb:
+            parent[max(ra, rb)] = min(ra, rb)
+
+    first_of: dict[str, int] = {}
+    for ti in range(n):
+        b = idx.task_batch[ti]
+        g = idx.group_of_batch.get(b)
+        for key in (f"batch:{b}", f"group:{g}" if g is not None else None):
+            if key is None:
+                continue
+            if key in first_of:
+                union(first_of[key], ti)
+            else:
+                first_of[key] = ti
+        nxt = idx.next_task[ti]
+        if nxt is not None:
+            union(ti, nxt)
+    groups: dict[int, list[int]] = {}
+    for ti in range(n):
+        groups.setdefault(find(ti), []).append(ti)
+    return sorted(groups.values(), key=lambda g: g[0])
+
+
+def decompose(problem: ProblemInstance) -> list[Component]:
+    """연결 요소별 부분문제.
+
+    부분문제 eqp_qty는 요소 내 초기 배정 대수이며, 어디에도 배정되지 않은 유휴 장비는
+    해당 모델이 처음 등록된 요소에 더한다. 호기 명단(equipments)은 나누지 않는다.
+    """
+    comps = task_components(problem)
+    idx = problem.index
+    assigned: dict[str, int] = {}
+    for (m, _ti), cnt in problem.init_assign.items():
+        assigned[m] = assigned.get(m, 0) + cnt
+    idle = {m: max(0, q - assigned.get(m, 0)) for m, q in problem.eqp_qty.items()}
+    out: list[Component] = []
+    for tasks in comps:
+        local = {ti: k for k, ti in enumerate(tasks)}
+        uph = {(m, local[ti]): v for (m, ti), v in problem._uph.items() if ti in local}
+        init_assign = {(m, local[ti]): c for (m, ti), c in problem.init_assign.items() if ti in local}
+        eqp_qty: dict[str, int] = {}
+        for m in idx.models:
+            eligible = any(idx.eligible[idx.model_pos[m], ti] for ti in tasks)
+            here = sum(c for (mm, _t), c in init_assign.items() if mm == m)
+            if eligible or here:
+                eqp_qty[m] = here + (idle.pop(m, 0) if eligible else 0)
+        sub = ProblemInstance(
+            rule_timekey=problem.rule_timekey,
+            horizon_hours=problem.horizon_hours,
+            switch_time_hours=problem.switch_time_hours,
+            tasks=[problem.tasks[ti] for ti in tasks],
+            _uph=uph,
+            eqp_qty=eqp_qty,
+            init_assign=init_assign,
+            tool_qty=problem.tool_qty,
+            conv_groups=problem.conv_groups,
+            facid=problem.facid,
+            switch_time_min=problem.switch_time_min,
+        )
+        out.append(Component(sub, tuple(tasks)))
+    return out
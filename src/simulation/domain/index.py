@@ -0,0 +1,112 @@
+"""ProblemInstance 정적 토폴로지 인덱스 — 문제당 1회 구축, 이후 O(1) 조회."""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from src.simulation.domain.problem import ProblemInstance
+
+
+def lot_cd_of_batch(batch_id: str) -> str:
+    """BATCH_ID → LOT_CD(슬래시 앞). 빈 값은 '-'."""
+    text = str(batch_id or "").strip()
+    if "/" in text:
+        lot = text.split("/", 1)[0].strip()
+        return lot or "-"
+    return text or "-"
+
+
+@dataclass(frozen=True)
+class ProblemIndex:
+    """next/prev 공정, batch→전환그룹, (batch, model)→tool cap, (model, task) UPH 행렬, 정적 이동 가능성."""
+    models: tuple[str, ...]
+    model_pos: dict[str, int]
+    n_tasks: int
+    next_task: tuple[int | None, ...]
+    prev_task: tuple[int | None, ...]
+    task_batch: tuple[str, ...]
+    batches: tuple[str, ...]
+    task_batch_pos: np.ndarray              # (T,) task → batches 위치
+    group_of_batch: dict[str, str | None]
+    tool_cap: dict[tuple[str, str], int]   # (batch_id, model) → tool 수
+    uph: np.ndarray                         # (M, T) float, 미등록 = 0
+    eligible: np.ndarray                    # (M, T) bool, UPH 등록 여부
+    task_models: tuple[tuple[tuple[str, float], ...], ...]  # task → ((model, uph), ...)
+    tool_cap_bm: np.ndarray                 # (B, M) int, tool_cap 배열판
+    feasible: np.ndarray                    # (M, T, T) bool, UPH 등록 + 같은 batch/전환그룹 이동
+    cross: np.ndarray                       # (T, T) bool, batch가 다른 task 쌍
+
+    @classmethod
+    def build(cls, problem: ProblemInstance) -> ProblemIndex:
+        tasks = problem.tasks
+        n = len(tasks)
+        models = tuple(sorted(problem.eqp_qty))
+        model_pos = {m: i for i, m in enumerate(models)}
+
+        by_key = {(t.plan_prod_key, t.oper_seq): i for i, t in reversed(list(enumerate(tasks)))}
+        next_task = tuple(by_key.get((t.plan_prod_key, t.oper_seq + 1)) for t in tasks)
+        prev_task = tuple(by_key.get((t.plan_prod_key, t.oper_seq - 1)) for t in tasks)
+
+        task_batch = tuple(t.batch_id for t in tasks)
+        batches = tuple(dict.fromkeys(task_batch))
+        batch_pos = {b: i for i, b in enumerate(batches)}
+
+        group_of_batch: dict[str, str | None] = {}
+        for gid, members in problem.conv_groups.items():
+            for b in members:
+                group_of_batch.setdefault(b, gid)
+        for b in batches:
+            group_of_batch.setdefault(b, None)
+
+        tool_cap = {
+            (b, m): problem.tool_qty.get((lot_cd_of_batch(b), m), 0)
+            for b in batches for m in models
+        }
+
+        uph = np.zeros((len(models), n), dtype=np.float64)
+        eligible = np.zeros((len(models), n), dtype=bool)
+        task_models: list[list[tuple[str, float]]] = [[] for _ in range(n)]
+        for (m, ti), v in problem._uph.items():
+            if m not in model_pos or not 0 <= ti < n:
+                continue
+            uph[model_pos[m], ti] = v
+            eligible[model_pos[m], ti] = True
+        for ti in range(n):
+            for m in models:
+                if eligible[model_pos[m], ti] and uph[model_pos[m], ti]:
+                    task_models[ti].append((m, float(uph[model_pos[m], ti])))
+
+        cap_bm = np.zeros((len(batches), len(models)), dtype=np.int64)
+        for (b, m), v in tool_cap.items():
+            cap_bm[batch_pos[b], model_pos[m]] = v
+
+        task_batch_pos = np.asarray([batch_pos[b] for b in task_batch], dtype=np.int64)
+        cross = task_batch_pos[:, None] != task_batch_pos[None, :]
+        groups = [group_of_batch.get(b) for b in task_batch]
+        same_group = np.asarray(
+            [[g is not None and g == h for h in groups] for g in groups], dtype=bool,
+        ).reshape(n, n)
+        reachable = (~cross | same_group) & ~np.eye(n, dtype=bool)
+        feasible = eligible[:, None, :] & reachable[None, :, :]
+
+        return cls(
+            models=models,
+            model_pos=model_pos,
+            n_tasks=n,
+            next_task=next_task,
+            prev_task=prev_task,
+            task_batch=task_batch,
+            batches=batches,
+            task_batch_pos=task_batch_pos,
+            group_of_batch=group_of_batch,
+            tool_cap=tool_cap,
+            uph=uph,
+            eligible=eligible,
+            task_models=tuple(tuple(tm) for tm in task_models),
+            tool_cap_bm=cap_bm,
+            feasible=feasible,
+            cross=cross,
+        )
@@ -1,9 +1,13 @@
 """순수 도메인 모델 — 외부 프레임워크 의존 없음."""
 from __future__ import annotations
 
-from dataclasses import dataclass, field
+import hashlib
+from dataclasses import astuple, dataclass, field
+from functools import cached_property
 from typing import NamedTuple
 
+from src.simulation.domain.index import ProblemIndex, lot_cd_of_batch
+
 
 class Move(NamedTuple):
     model: str
@@ -88,6 +92,41 @@ class ProblemInstance:
     facid: str | None = None
     equipments: list[Equipment] = field(default_factory=list)
     ground_truth: dict = field(default_factory=dict)
+    switch_time_min: float | None = None  # 분 단위 전환 시간 (이벤트 커널용, 없으면 switch_time_hours)
+
+    @property
+    def switch_minutes(self) -> float:
+        if self.switch_time_min is not None:
+            return float(self.switch_time_min)
+        return float(self.switch_time_hours) * 60.0
+
+    @cached_property
+    def index(self) -> ProblemIndex:
+        """정적 토폴로지 인덱스 (최초 접근 시 1회 구축)."""
+        return ProblemIndex.build(self)
+
+    @cached_property
+    def content_hash(self) -> str:
+        """입력 내용 해시 (ground_truth·rule_timekey·facid 제외) — 같은 문제를 다시 읽어도 같은 값."""
+        payload = (
+            self.horizon_hours, self.switch_time_hours, self.switch_time_min,
+            [astuple(t) for t in self.tasks],
+            sorted(self._uph.items()), sorted(self.eqp_qty.items()),
+            sorted(self.init_assign.items()), sorted(self.tool_qty.items()),
+            sorted((k, list(v)) for k, v in self.conv_groups.items()),
+            [astuple(e) for e in self.equipments],
+        )
+        return hashlib.sha1(repr(payload).encode("utf-8")).hexdigest()
+
+    def invalidate_index(self) -> None:
+        """tasks/_uph/tool_qty/conv_groups를 직접 수정한 뒤 인덱스·content_hash 재구축 예약."""
+        self.__dict__.pop("index", None)
+        self.__dict__.pop("content_hash", None)
+
+    def decompose(self) -> list:
+        """독립 부분문제 목록 (domain.decompose.Component)."""
+        from src.simulation.domain.decompose import decompose
+        return decompose(self)
 
     def uph_of(self, model: str, task_index: int) -> float | None:
         return self._uph.get((model, task_index))
@@ -96,36 +135,26 @@ class ProblemInstance:
         return self.tasks[task_index].batch_id
 
     def lot_cd_of(self, batch_id: str) -> str:
-        from src.db.eqpconvplan import split_batch_lot_temper
-        lot, _ = split_batch_lot_temper(batch_id)
-        return lot
+        return lot_cd_of_batch(batch_id)
 
     def tool_cap(self, batch_id: str, model: str) -> int:
-        return self.tool_qty.get((self.lot_cd_of(batch_id), model), 0)
+        cap = self.index.tool_cap.get((batch_id, model))
+        if cap is None:
+            return self.tool_qty.get((self.lot_cd_of(batch_id), model), 0)
+        return cap
 
     def conv_group_of(self, batch_id: str) -> str | None:
-        for gid, batches in self.conv_groups.items():
-            if batch_id in batches:
-                return gid
-        return None
+        return self.index.group_of_batch.get(batch_id)
 
     def can_convert(self, from_batch: str, to_batch: str) -> bool:
         g = self.conv_group_of(from_batch)
         return g is not None and g == self.conv_group_of(to_batch)
 
     def next_task_index(self, task_index: int) -> int | None:
-        t = self.tasks[task_index]
-        for i, o in enumerate(self.tasks):
-            if o.plan_prod_key == t.plan_prod_key and o.oper_seq == t.oper_seq + 1:
-                return i
-        return None
+        return self.index.next_task[task_index]
 
     def prev_task_index(self, task_index: int) -> int | None:
-        t = self.tasks[task_index]
-        for i, o in enumerate(self.tasks):
-            if o.plan_prod_key == t.plan_prod_key and o.oper_seq == t.oper_seq - 1:
-                return i
-        return None
+        return self.index.prev_task[task_index]
 
     def complete_guide_allocation(
         self, guide: dict[tuple[str, int], float | int],
@@ -167,4 +196,4 @@ class ProblemInstance:
         return result
 
     def models(self) -> list[str]:
-        return sorted(self.eqp_qty)
+        return list(self.index.models)
@@ -1,6 +1,11 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from typing import Any
+
+import numpy as np
+
+from src.simulation.domain.index import ProblemIndex
 
 
 @dataclass
@@ -11,3 +16,119 @@ class SimState:
     assign: dict[tuple[str, int], int]
     switching: dict[tuple[str, int], int]
     tool_used: dict[tuple[str, str], int]
+    _moves: Any = field(default=None, compare=False, repr=False)  # kernel MoveSet 캐시
+    _journal: list | None = field(default=None, compare=False, repr=False)  # undo 로그
+
+    def clone(self) -> SimState:
+        """O(size) 복제 — deepcopy 없이 dict 얕은 복사 (값은 모두 int). undo 로그는 복제하지 않음."""
+        ms = self._moves
+        return SimState(
+            self.hour, dict(self.produced), dict(self.wip), dict(self.assign),
+            dict(self.switching), dict(self.tool_used),
+            ms.clone() if ms is not None else None,
+        )
+
+    @property
+    def blocked(self) -> dict[tuple[str, int], int]:
+        """assign에서 빼는 생산·이동 불가 몫 — 시간 커널은 남은 전환 장비-시간(switching) 그대로."""
+        return self.switching
+
+
+@dataclass
+class ArrayState:
+    """NumPy 배열 기반 상태 — 축 순서는 ProblemIndex(models/tasks/batches)를 따른다."""
+    hour: int
+    produced: np.ndarray   # (T,) int64
+    wip: np.ndarray        # (T,) int64
+    assign: np.ndarray     # (M, T) int64
+    switching: np.ndarray  # (M, T) int64
+    tool_used: np.ndarray  # (B, M) int64
+
+    @classmethod
+    def from_sim_state(cls, idx: ProblemIndex, s: SimState) -> ArrayState:
+        n_m, n_t, n_b = len(idx.models), idx.n_tasks, len(idx.batches)
+        batch_pos = {b: i for i, b in enumerate(idx.batches)}
+        produced = np.asarray([s.produced.get(ti, 0) for ti in range(n_t)], dtype=np.int64)
+        wip = np.asarray([s.wip.get(ti, 0) for ti in range(n_t)], dtype=np.int64)
+        assign = np.zeros((n_m, n_t), dtype=np.int64)
+        switching = np.zeros((n_m, n_t), dtype=np.int64)
+        tool_used = np.zeros((n_b, n_m), dtype=np.int64)
+        for (m, ti), cnt in s.assign.items():
+            assign[idx.model_pos[m], ti] = cnt
+        for (m, ti), v in s.switching.items():
+            switching[idx.model_pos[m], ti] = v
+        for (b, m), v in s.tool_used.items():
+            if b in batch_pos and m in idx.model_pos:
+                tool_used[batch_pos[b], idx.model_pos[m]] = v
+        return cls(s.hour, produced, wip, assign, switching, tool_used)
+
+    def clone(self) -> ArrayState:
+        return ArrayState(
+            self.hour, self.produced.copy(), self.wip.copy(), self.assign.copy(),
+            self.switching.copy(), self.tool_used.copy(),
+        )
+
+    def to_sim_state(self, idx: ProblemIndex) -> SimState:
+        """dict 호환 뷰 — run_policy·sim_router·행 빌더용 (0 항목은 생략)."""
+        models = idx.models
+        produced = {ti: int(v) for ti, v in enumerate(self.produced)}
+        wip = {ti: int(v) for ti, v in enumerate(self.wip)}
+        assign = {
+            (models[mi], int(ti)): int(self.assign[mi, ti])
+            for mi, ti in zip(*np.nonzero(self.assign))
+        }
+        switching = {
+            (models[mi], int(ti)): int(self.switching[mi, ti])
+            for mi, ti in zip(*np.nonzero(self.switching))
+        }
+        tool_used = {
+            (idx.batches[bi], models[mi]): int(self.tool_used[bi, mi])
+            for bi, mi in zip(*np.nonzero(self.tool_used))
+        }
+        return SimState(self.hour, produced, wip, assign, switching, tool_used)
+
+
+class SnapshotHistory:
+    """시간별 SimState 스냅샷 이력 — fork한 자식은 부모의 앞부분을 참조로 공유한다.
+
+    부모는 뒤에 덧붙이기만 하므로 자식이 보는 접두(prefix)는 바뀌지 않는다.
+    """
+
+    __slots__ = ("_parent", "_base", "_own")
+
+    def __init__(self, snapshots: list[SimState] | None = None):
+        self._parent: SnapshotHistory | None = None
+        self._base = 0
+        self._own: list[SimState] = list(snapshots or [])
+
+    def fork(self, upto: int | None = None) -> SnapshotHistory:
+        """앞 upto개(기본 전체)를 공유하는 자식 이력."""
+        n = len(self) if upto is None else max(0, min(int(upto), len(self)))
+        child = SnapshotHistory()
+        child._parent, child._base = self, n
+        return child
+
+    def append(self, s: SimState) -> None:
+        self._own.append(s)
+
+    def __len__(self) -> int:
+        return self._base + len(self._own)
+
+    def __getitem__(self, i: int) -> SimState:
+        n = len(self)
+        if i < 0:
+            i += n
+        if not 0 <= i < n:
+            raise IndexError(i)
+        node = self
+        while i < node._base:
+            node = node._parent
+        return node._own[i - node._base]
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def owned(self) -> int:
+        """이 이력이 직접 보관하는 스냅샷 수 (공유분 제외)."""
+        return len(self._own)
@@ -1,3 +1,10 @@
+from src.simulation.kernel.batch import BatchSimulator, BatchState
+from src.simulation.kernel.events import EventSimulator, EventState
 from src.simulation.kernel.simulator import Simulator, active_eqp_count
+from src.simulation.kernel.units import UnitLedger, UnitSimulator, UnitState
+from src.simulation.kernel.vector import VectorSimulator
 
-__all__ = ["Simulator", "active_eqp_count"]
+__all__ = [
+    "BatchSimulator", "BatchState", "EventSimulator", "EventState", "Simulator",
+    "UnitLedger", "UnitSimulator", "UnitState", "VectorSimulator", "active_eqp_count",
+]
@@ -0,0 +1,258 @@
+"""다중 문제 배치 시뮬레이터 — N개 ProblemInstance를 패딩 텐서로 묶어 동시에 전이."""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Sequence
+
+import numpy as np
+
+import config
+from src.simulation.domain.problem import Move, ProblemInstance
+from src.simulation.domain.state import ArrayState, SimState
+
+
+@dataclass
+class BatchState:
+    """(N, ...) 배치 상태. 모델/태스크 축은 max_models/max_tasks로 패딩."""
+    hour: np.ndarray       # (N,)
+    produced: np.ndarray   # (N, T)
+    wip: np.ndarray        # (N, T)
+    assign: np.ndarray     # (N, M, T)
+    switching: np.ndarray  # (N, M, T)
+    tool_used: np.ndarray  # (N, B, M), B = max_tasks
+
+    def clone(self) -> BatchState:
+        return BatchState(
+            self.hour.copy(), self.produced.copy(), self.wip.copy(),
+            self.assign.copy(), self.switching.copy(), self.tool_used.copy(),
+        )
+
+
+class BatchSimulator:
+    """N개 문제를 한 번의 배열 연산으로 1시간씩 전이.
+
+    축 순서는 인스턴스별 ProblemIndex(models/tasks/batches)를 따르며,
+    빈 슬롯은 UPH=0·WIP=0·feasible=False로 채워 전이에 영향이 없다.
+    """
+
+    def __init__(self, problems: Sequence[ProblemInstance],
+                 max_tasks: int | None = None, max_models: int | None = None):
+        if not problems:
+            raise ValueError("BatchSimulator: problems가 비어 있습니다.")
+        self.problems = list(problems)
+        self.mt = mt = max_tasks if max_tasks is not None else config.MAX_TASKS
+        self.mm = mm = max_models if max_models is not None else config.MAX_MODELS
+        n = len(self.problems)
+        self.n = n
+        self.uph = np.zeros((n, mm, mt), dtype=np.float64)
+        self.feasible = np.zeros((n, mm, mt, mt), dtype=bool)
+        self.cross = np.zeros((n, mt, mt), dtype=bool)
+        self.task_batch = np.zeros((n, mt), dtype=np.int64)
+        self.tool_cap = np.zeros((n, mt, mm), dtype=np.int64)
+        self.plan = np.zeros((n, mt), dtype=np.int64)
+        self.task_mask = np.zeros((n, mt), dtype=bool)
+        self.horizon = np.zeros(n, dtype=np.int64)
+        self.switch_hours = np.zeros(n, dtype=np.int64)
+        self.n_tasks = np.zeros(n, dtype=np.int64)
+        self.next_pos = np.full((n, mt), -1, dtype=np.int64)
+        for k, p in enumerate(self.problems):
+            self._load_row(k, p)
+        self._rebuild_inflow()
+        self._rows = np.arange(n)
+
+    def _load_row(self, k: int, p: ProblemInstance) -> None:
+        mt, mm = self.mt, self.mm
+        idx = p.index
+        nm, nt = len(idx.models), idx.n_tasks
+        if nt > mt:
+            raise ValueError(f"max_tasks({mt}) < 실제 tasks({nt})")
+        if nm > mm:
+            raise ValueError(f"max_models({mm}) < 실제 models({nm})")
+        for arr in (self.uph, self.feasible, self.cross, self.task_batch, self.tool_cap,
+                    self.plan, self.task_mask):
+            arr[k] = 0
+        self.uph[k, :nm, :nt] = idx.uph
+        self.feasible[k, :nm, :nt, :nt] = idx.feasible
+        self.cross[k, :nt, :nt] = idx.cross
+        self.task_batch[k, :nt] = idx.task_batch_pos
+        for (b, m), cap in idx.tool_cap.items():
+            self.tool_cap[k, idx.batches.index(b), idx.model_pos[m]] = cap
+        self.plan[k, :nt] = [t.plan_qty for t in p.tasks]
+        self.task_mask[k, :nt] = True
+        self.horizon[k] = p.horizon_hours
+        self.switch_hours[k] = p.switch_time_hours
+        self.n_tasks[k] = nt
+        self.next_pos[k] = -1
+        for ti, nxt in enumerate(idx.next_task):
+            if nxt is not None:
+                self.next_pos[k, ti] = nxt
+
+    def _rebuild_inflow(self) -> None:
+        src = np.flatnonzero(self.next_pos >= 0)
+        self._inflow_src = src
+        self._inflow_dst = (src // self.mt) * self.mt + self.next_pos.reshape(-1)[src]
+
+    def set_problems(self, rows, problems: Sequence[ProblemInstance]) -> None:
+        """지정 슬롯의 문제 교체 (정적 텐서만 — 상태는 reset_instances로 따로 초기화)."""
+        for k, p in zip(np.asarray(rows, dtype=np.int64).tolist(), problems):
+            self.problems[k] = p
+            self._load_row(k, p)
+        self._rebuild_inflow()
+
+    # ── 상태 ──────────────────────────────────────────────
+    def reset(self) -> BatchState:
+        n, mm, mt = self.n, self.mm, self.mt
+        state = BatchState(
+            hour=np.zeros(n, dtype=np.int64),
+            produced=np.zeros((n, mt), dtype=np.int64),
+            wip=np.zeros((n, mt), dtype=np.int64),
+            assign=np.zeros((n, mm, mt), dtype=np.int64),
+            switching=np.zeros((n, mm, mt), dtype=np.int64),
+            tool_used=np.zeros((n, mt, mm), dtype=np.int64),
+        )
+        self.reset_instances(state, self._rows)
+        return state
+
+    def reset_instances(self, state: BatchState, rows) -> None:
+        """지정 인스턴스만 초기 상태로 되돌림 (벡터 env auto-reset용)."""
+        for k in np.asarray(rows, dtype=np.int64).tolist():
+            p = self.problems[k]
+            idx = p.index
+            nt = idx.n_tasks
+            state.hour[k] = 0
+            state.produced[k] = 0
+            state.wip[k] = 0
+            state.wip[k, :nt] = [t.init_wip for t in p.tasks]
+            state.assign[k] = 0
+            state.switching[k] = 0
+            state.tool_used[k] = 0
+            for (m, ti), cnt in p.init_assign.items():
+                mi = idx.model_pos[m]
+                state.assign[k, mi, ti] += cnt
+                state.tool_used[k, idx.task_batch_pos[ti], mi] += cnt
+
+    def view(self, state: BatchState, k: int) -> SimState:
+        """인스턴스 k의 dict SimState 호환 뷰."""
+        idx = self.problems[k].index
+        nm, nt, nb = len(idx.models), idx.n_tasks, len(idx.batches)
+        arr = ArrayState(
+            int(state.hour[k]), state.produced[k, :nt].copy(), state.wip[k, :nt].copy(),
+            state.assign[k, :nm, :nt].copy(), state.switching[k, :nm, :nt].copy(),
+            state.tool_used[k, :nb, :nm].copy(),
+        )
+        return arr.to_sim_state(idx)
+
+    # ── 전이 ──────────────────────────────────────────────
+    def running(self, state: BatchState) -> np.ndarray:
+        return state.hour < self.horizon
+
+    def task_capacity(self, state: BatchState) -> np.ndarray:
+        active = np.maximum(state.assign - state.switching, 0)
+        cap = np.zeros((self.n, self.mt), dtype=np.float64)
+        for mi in range(self.mm):
+            cap += active[:, mi, :] * self.uph[:, mi, :]
+        return cap
+
+    def advance_hour(self, state: BatchState, where: np.ndarray | None = None) -> np.ndarray:
+        """진행 중인 인스턴스(where가 있으면 그중 True인 것만)를 1시간 전이. 반환: (N, T) 이번 시간 생산량."""
+        run = self.running(state)
+        if where is not None:
+            run &= where
+        q = np.minimum(np.floor(self.task_capacity(state)).astype(np.int64), state.wip)
+        np.maximum(q, 0, out=q)
+        q[~run] = 0
+        state.produced += q
+        state.wip -= q
+        np.add.at(state.wip.reshape(-1), self._inflow_dst, q.reshape(-1)[self._inflow_src])
+        decayed = np.maximum(state.switching - state.assign, 0)
+        state.switching[run] = decayed[run]
+        state.hour += run
+        return q
+
+    def valid_mask(self, state: BatchState) -> np.ndarray:
+        """(N, M, T, T) bool 유효 이동 마스크."""
+        movable = (state.assign - state.switching) > 0
+        tool_ok = state.tool_used < self.tool_cap                       # (N, B, M)
+        tool_ok_t = np.take_along_axis(
+            tool_ok, self.task_batch[:, :, None], axis=1,
+        ).transpose(0, 2, 1)                                             # (N, M, T)
+        return (
+            self.feasible
+            & movable[:, :, :, None]
+            & (~self.cross[:, None, :, :] | tool_ok_t[:, :, None, :])
+        )
+
+    def apply_cells(self, state: BatchState, rows: np.ndarray, mi: np.ndarray,
+                    fi: np.ndarray, ti: np.ndarray) -> None:
+        """인스턴스별 이동 1건씩 동시 적용 (rows는 서로 달라야 함)."""
+        if len(rows) == 0:
+            return
+        state.assign[rows, mi, fi] -= 1
+        state.assign[rows, mi, ti] += 1
+        fb = self.task_batch[rows, fi]
+        tb = self.task_batch[rows, ti]
+        cross = fb != tb
+        if cross.any():
+            r, m = rows[cross], mi[cross]
+            state.switching[r, m, ti[cross]] += self.switch_hours[r]
+            state.tool_used[r, fb[cross], m] = np.maximum(state.tool_used[r, fb[cross], m] - 1, 0)
+            state.tool_used[r, tb[cross], m] += 1
+
+    def apply_moves(self, state: BatchState, moves: Sequence[Sequence[Move]]) -> list[list[Move]]:
+        """인스턴스별 이동 배치 적용. 적용 시점에 무효인 이동은 건너뛴다.
+
+        반환: 인스턴스별 실제 적용된 이동 목록.
+        """
+        applied: list[list[Move]] = [[] for _ in range(self.n)]
+        depth = max((len(mv) for mv in moves), default=0)
+        for step in range(depth):
+            cells = [
+                (k, self.problems[k].index.model_pos.get(batch[step].model, -1),
+                 batch[step].from_index, batch[step].to_index)
+                for k, batch in enumerate(moves) if step < len(batch)
+            ]
+            cells = [c for c in cells if c[1] >= 0 and 0 <= c[2] < self.mt and 0 <= c[3] < self.mt]
+            if not cells:
+                continue
+            rows, mi, fi, ti = (np.asarray(col, dtype=np.int64) for col in zip(*cells))
+            ok = self.valid_mask(state)[rows, mi, fi, ti]
+            self.apply_cells(state, rows[ok], mi[ok], fi[ok], ti[ok])
+            for k in rows[ok].tolist():
+                applied[k].append(moves[k][step])
+        return applied
+
+    # ── 지표 ──────────────────────────────────────────────
+    def achievement_rates(self, state: BatchState) -> np.ndarray:
+        safe = np.where(self.plan > 0, self.plan, 1)
+        rates = np.where(self.plan > 0, np.minimum(state.produced / safe, 1.0), 1.0)
+        return np.where(self.task_mask, rates, 0.0)
+
+    def plan_achievement(self, state: BatchState) -> np.ndarray:
+        """(N,) 인스턴스별 계획달성률 (반올림 전)."""
+        return self.achievement_rates(state).sum(axis=1) / np.maximum(self.n_tasks, 1)
+
+    def active_eqp_count(self, state: BatchState) -> np.ndarray:
+        active = np.maximum(state.assign - state.switching, 0)
+        contributing = (self.uph > 0) & (state.wip > 0)[:, None, :]
+        return (active * contributing).sum(axis=(1, 2))
+
+    def metrics(self, state: BatchState, rows=None) -> list[dict]:
+        """인스턴스별 Simulator.metrics 형식 (rows를 주면 그 인스턴스만, 순서대로)."""
+        rates = self.achievement_rates(state)
+        out = []
+        ks = range(self.n) if rows is None else np.asarray(rows, dtype=np.int64).tolist()
+        for k in ks:
+            p = self.problems[k]
+            nt = int(self.n_tasks[k])
+            per_task = {
+                f"{t.plan_prod_key}/{t.oper_id}": {
+                    "produced": int(state.produced[k, i]), "plan": t.plan_qty,
+                    "rate": round(float(rates[k, i]), 4),
+                }
+                for i, t in enumerate(p.tasks)
+            }
+            out.append({
+                "plan_achievement": round(sum(rates[k, :nt].tolist()) / nt, 4) if nt else 0.0,
+                "per_task": per_task,
+            })
+        return out
@@ -0,0 +1,184 @@
+"""이벤트 큐 커널 — 전환 완료·WIP 소진·계획 달성 시점 사이 생산을 해석적으로 적분.
+
+시간 커널(Simulator)과의 의미 차이: 시간 커널은 (model, task) 칸의 전환 잔여를 장비-시간
+합계(switching)로만 들고 그 칸의 전 대수가 함께 갚아 나가며, 갚는 동안 기존 가동 장비도 멈춘다.
+이 커널은 전환을 호기마다 완료 시각으로 추적해 기존 장비는 계속 생산하고 새로 온 장비만
+switch_time 동안 멈춘다. 같은 switch_time이라도 시간별 생산은 다를 수 있다 (장비-시간 총량은 같다).
+"""
+from __future__ import annotations
+
+import heapq
+import math
+from collections import deque
+from dataclasses import dataclass, field
+
+import config
+
+from src.simulation.domain.problem import Move, ProblemInstance
+from src.simulation.domain.state import SimState
+from src.simulation.kernel.simulator import Simulator
+
+EPS = 1e-9
+
+
+@dataclass
+class EventState(SimState):
+    """SimState + 연속 시간 유체 상태.
+
+    produced/wip dict는 정수 뷰(floor). switching은 Simulator와 같은 남은 전환 장비-시간
+    (올림 — 관측·화면용), 생산·이동에서 빼는 몫은 전환 중인 장비 대수 converting이다.
+    """
+    converting: dict[tuple[str, int], int] = field(default_factory=dict)
+    clock: float = 0.0
+    fluid_produced: list[float] = field(default_factory=list)
+    fluid_wip: list[float] = field(default_factory=list)
+    pending: list[tuple[float, str, int]] = field(default_factory=list)  # (완료 시각, model, task) heap
+    events: deque[tuple[float, str, int]] = field(default_factory=deque)  # (시각, 종류, task) 최근 N개
+
+    def clone(self) -> EventState:
+        base = super().clone()
+        return EventState(
+            base.hour, base.produced, base.wip, base.assign, base.switching, base.tool_used,
+            base._moves, None, dict(self.converting), self.clock, list(self.fluid_produced),
+            list(self.fluid_wip), list(self.pending), deque(self.events, maxlen=self.events.maxlen),
+        )
+
+    @property
+    def blocked(self) -> dict[tuple[str, int], int]:
+        return self.converting
+
+
+class EventSimulator(Simulator):
+    """분 단위 전환 시간을 반올림 없이 처리하는 이벤트 구동 시뮬레이터.
+
+    시간 경계(정책 결정 시점) 사이에서 다음 이벤트 — 전환 완료, WIP 소진, 계획 달성 —
+    까지 task별 생산 속도가 일정하므로 구간마다 선형 적분한다.
+    WIP가 빈 task는 min(용량, 상류 유입 속도)로 생산한다 (유체 근사).
+    run_policy와 그대로 호환되어 시간별 HourlyStat 버킷을 만든다.
+    max_events: EventState.events에 남길 최근 이벤트 수 (0이면 기록 안 함, None이면 config.SIM_EVENT_LOG_MAX).
+    """
+
+    def __init__(self, problem: ProblemInstance, max_events: int | None = None):
+        super().__init__(problem)
+        self.switch_h = problem.switch_minutes / 60.0
+        self.plan = [float(t.plan_qty) for t in problem.tasks]
+        self.max_events = config.SIM_EVENT_LOG_MAX if max_events is None else max_events
+
+    def reset(self) -> EventState:
+        base = super().reset()
+        return EventState(
+            base.hour, base.produced, base.wip, base.assign, base.switching, base.tool_used,
+            fluid_produced=[0.0] * self.idx.n_tasks,
+            fluid_wip=[float(base.wip[ti]) for ti in range(self.idx.n_tasks)],
+            events=deque(maxlen=self.max_events),
+        )
+
+    def apply_move(self, s: EventState, mv: Move) -> None:
+        model, fi, ti = mv
+        fb, tb = self.idx.task_batch[fi], self.idx.task_batch[ti]
+        s.assign[(model, fi)] = s.assign.get((model, fi), 0) - 1
+        if s.assign[(model, fi)] == 0:
+            del s.assign[(model, fi)]
+        s.assign[(model, ti)] = s.assign.get((model, ti), 0) + 1
+        converting = 0
+        if fb != tb:
+            if self.switch_h > 0:
+                converting = 1
+                s.converting[(model, ti)] = s.converting.get((model, ti), 0) + 1
+                heapq.heappush(s.pending, (s.clock + self.switch_h, model, ti))
+                self._sync_switching(s)
+            s.tool_used[(fb, model)] = max(0, s.tool_used.get((fb, model), 0) - 1)
+            s.tool_used[(tb, model)] = s.tool_used.get((tb, model), 0) + 1
+        if s._moves is not None:
+            s._moves.on_move(self.idx.model_pos[model], fi, ti, converting)
+
+    def rates(self, s: EventState) -> tuple[list[float], list[float]]:
+        """(생산 속도, 유입 속도) — task별 시간당 수량."""
+        n = self.idx.n_tasks
+        out, inflow = [0.0] * n, [0.0] * n
+        next_task = self.idx.next_task
+        for ti in self._topo_order():
+            cap = self.task_capacity(s, ti)
+            r = cap if s.fluid_wip[ti] > EPS else min(cap, inflow[ti])
+            out[ti] = r
+            nxt = next_task[ti]
+            if nxt is not None:
+                inflow[nxt] += r
+        return out, inflow
+
+    def advance_until(self, s: EventState, target: float) -> None:
+        """clock을 target까지 이벤트 단위로 전진."""
+        n = self.idx.n_tasks
+        while s.clock < target - EPS:
+            out, inflow = self.rates(s)
+            dt = target - s.clock
+            if s.pending:
+                dt = min(dt, s.pending[0][0] - s.clock)
+            for ti in range(n):
+                net = inflow[ti] - out[ti]
+                if s.fluid_wip[ti] > EPS and net < -EPS:
+                    dt = min(dt, s.fluid_wip[ti] / -net)
+                left = self.plan[ti] - s.fluid_produced[ti]
+                if left > EPS and out[ti] > EPS:
+                    dt = min(dt, left / out[ti])
+            dt = max(dt, 0.0)
+            s.clock += dt
+            for ti in range(n):
+                before = s.fluid_produced[ti]
+                s.fluid_produced[ti] = before + out[ti] * dt
+                if before < self.plan[ti] - EPS <= s.fluid_produced[ti]:
+                    s.events.append((s.clock, "plan_met", ti))
+                had_wip = s.fluid_wip[ti] > EPS
+                s.fluid_wip[ti] += (inflow[ti] - out[ti]) * dt
+                if s.fluid_wip[ti] <= EPS:
+                    s.fluid_wip[ti] = 0.0
+                    if had_wip:
+                        s.events.append((s.clock, "wip_exhausted", ti))
+            while s.pending and s.pending[0][0] <= s.clock + EPS:
+                _, model, ti = heapq.heappop(s.pending)
+                key = (model, ti)
+                s.converting[key] -= 1
+                if s.converting[key] <= 0:
+                    del s.converting[key]
+                if s._moves is not None:
+                    s._moves.set_movable(model, ti, s.assign.get(key, 0) - s.converting.get(key, 0))
+                s.events.append((s.clock, "conversion_done", ti))
+        s.clock = max(s.clock, target)
+        for ti in range(n):
+            s.produced[ti] = int(s.fluid_produced[ti] + EPS)
+            s.wip[ti] = int(s.fluid_wip[ti] + EPS)
+        self._sync_switching(s)
+
+    def _sync_switching(self, s: EventState) -> None:
+        """pending 전환의 남은 시간 합(장비-시간, 올림)으로 switching을 다시 쓴다."""
+        left: dict[tuple[str, int], float] = {}
+        for done_at, model, ti in s.pending:
+            left[(model, ti)] = left.get((model, ti), 0.0) + done_at - s.clock
+        s.switching.clear()
+        for key, hours in left.items():
+            if hours > EPS:
+                s.switching[key] = math.ceil(hours - EPS)
+
+    def advance_hour(self, s: EventState) -> None:
+        self.advance_until(s, float(s.hour + 1))
+        s.hour += 1
+
+    def is_quiescent(self, s: SimState) -> bool:
+        # 유체 상태는 closed-form fast_forward 대상이 아님
+        return False
+
+    def quiescent_hours(self, s: SimState) -> int:
+        return 0
+
+    # 유체 상태(clock·fluid_*·pending)는 undo 로그에 없다 — 부모 구현은 틀린 상태를 만든다
+    def checkpoint(self, s: SimState) -> int:
+        raise TypeError("EventSimulator does not support checkpoint/rollback; use clone()")
+
+    def rollback(self, s: SimState, mark: int) -> None:
+        raise TypeError("EventSimulator does not support checkpoint/rollback; use clone()")
+
+    def release(self, s: SimState) -> None:
+        raise TypeError("EventSimulator does not support checkpoint/rollback; use clone()")
+
+    def fast_forward(self, s: SimState, hours: int):
+        raise TypeError("EventSimulator has no closed-form fast_forward; use advance_hour()")
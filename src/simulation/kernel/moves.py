@@ -0,0 +1,79 @@
+"""유효 이동 집합 — 정적 가능성 텐서(ProblemIndex) + 동적 movable/tool 여유 배열."""
+from __future__ import annotations
+
+import numpy as np
+
+from src.simulation.domain.index import ProblemIndex
+from src.simulation.domain.problem import Move
+from src.simulation.domain.state import SimState
+
+
+class MoveSet:
+    """(model, from, to) 유효 이동을 상태별로 유지.
+
+    feasible[m, f, t]·cross[f, t]: ProblemIndex에 문제당 1회 구축된 정적 텐서를 공유.
+    movable[m, f]: assign - blocked(시간 커널은 switching) — 커널의 apply_move/advance_hour가 제자리 갱신.
+    headroom[b, m]: tool_cap - tool_used — 커널의 apply_move/rollback이 제자리 갱신.
+    커널 밖에서 assign/switching/tool_used를 직접 고쳤다면 ``s._moves = None``으로 다시 구축한다.
+    """
+
+    def __init__(self, idx: ProblemIndex, movable: np.ndarray, headroom: np.ndarray):
+        self.idx = idx
+        self.feasible = idx.feasible
+        self.cross = idx.cross
+        self.movable = movable
+        self.headroom = headroom
+
+    @classmethod
+    def build(cls, idx: ProblemIndex, s: SimState) -> MoveSet:
+        movable = np.zeros((len(idx.models), idx.n_tasks), dtype=np.int64)
+        for (m, ti), cnt in s.assign.items():
+            movable[idx.model_pos[m], ti] += cnt
+        for (m, ti), v in s.blocked.items():
+            movable[idx.model_pos[m], ti] -= v
+        headroom = idx.tool_cap_bm.copy()
+        batch_pos = {b: i for i, b in enumerate(idx.batches)}
+        for (b, m), used in s.tool_used.items():
+            if b in batch_pos and m in idx.model_pos:
+                headroom[batch_pos[b], idx.model_pos[m]] -= used
+        return cls(idx, movable, headroom)
+
+    def clone(self) -> MoveSet:
+        return MoveSet(self.idx, self.movable.copy(), self.headroom.copy())
+
+    def on_move(self, mi: int, fi: int, ti: int, switch_hours: int) -> None:
+        self.movable[mi, fi] -= 1
+        self.movable[mi, ti] += 1 - switch_hours
+        if self.cross[fi, ti]:
+            # tool_used: from은 max(0, used-1), to는 +1 (커널 apply_move와 같은 규칙)
+            fb, tb = self.idx.task_batch_pos[fi], self.idx.task_batch_pos[ti]
+            self.headroom[fb, mi] = min(self.headroom[fb, mi] + 1, self.idx.tool_cap_bm[fb, mi])
+            self.headroom[tb, mi] -= 1
+
+    def set_movable(self, model: str, ti: int, value: int) -> None:
+        self.movable[self.idx.model_pos[model], ti] = value
+
+    def set_tool_used(self, batch: str, model: str, used: int) -> None:
+        bi = self.idx.batches.index(batch)
+        mi = self.idx.model_pos[model]
+        self.headroom[bi, mi] = self.idx.tool_cap_bm[bi, mi] - used
+
+    def is_valid(self, mi: int, fi: int, ti: int) -> bool:
+        """단일 이동 판정 — 전체 마스크를 만들지 않는다."""
+        if self.movable[mi, fi] <= 0 or not self.feasible[mi, fi, ti]:
+            return False
+        return not self.cross[fi, ti] or self.headroom[self.idx.task_batch_pos[ti], mi] > 0
+
+    def mask(self, s: SimState) -> np.ndarray:
+        """(M, T, T) bool 유효 이동 마스크."""
+        tool_ok = (self.headroom > 0).T[:, self.idx.task_batch_pos]   # (M, T) to-task batch 여유
+        return (
+            self.feasible
+            & (self.movable > 0)[:, :, None]
+            & (~self.cross[None, :, :] | tool_ok[:, None, :])
+        )
+
+    def moves(self, s: SimState) -> list[Move]:
+        models = self.idx.models
+        mi, fi, ti = np.nonzero(self.mask(s))
+        return [Move(models[m], f, t) for m, f, t in zip(mi.tolist(), fi.tolist(), ti.tolist())]
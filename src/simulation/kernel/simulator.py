@@ -1,25 +1,49 @@
 """시뮬레이션 엔진 — 정책 없음, 상태 전이만."""
 from __future__ import annotations
 
+import numpy as np
+
 from src.simulation.domain.problem import Move, ProblemInstance
 from src.simulation.domain.state import SimState
+from src.simulation.kernel.moves import MoveSet
+
+_MISSING = object()
 
 
 def active_eqp_count(p: ProblemInstance, s: SimState) -> int:
     """Idle 제외, WIP가 남아 생산에 기여 중인 장비 대수 합."""
+    idx = p.index
+    blocked = s.blocked
     return sum(
-        max(0, s.assign.get((m, ti), 0) - s.switching.get((m, ti), 0))
-        for m in p.models()
-        for ti in range(len(p.tasks))
-        if s.wip[ti] > 0 and p.uph_of(m, ti)
+        max(0, s.assign.get((m, ti), 0) - blocked.get((m, ti), 0))
+        for ti, task_models in enumerate(idx.task_models)
+        if s.wip[ti] > 0
+        for m, _uph in task_models
     )
 
 
+def dwell_time(wip: float, cap: float, cap_prev: float | None, horizon: float) -> float | None:
+    """WIP 소진 예상 시간 — cap_prev는 이전 task 생산 능력 (첫 공정이면 None). 정의 불가면 None."""
+    H = float(horizon)
+    if wip == 0:
+        return 0.0
+    if cap <= 0:
+        return None
+    if cap_prev is None:
+        return min(wip / cap, H)
+    denom = min(cap, float(wip)) - min(cap_prev, float(wip))
+    if denom <= 0:
+        return None
+    return min(wip / denom, H)
+
+
 class Simulator:
     """1시간 단위로 전이하는 결정론적 시뮬레이터."""
 
     def __init__(self, problem: ProblemInstance):
         self.p = problem
+        self.idx = problem.index
+        self._topo: list[int] | None = None
 
     def reset(self) -> SimState:
         p = self.p
@@ -29,33 +53,162 @@ class Simulator:
         switching: dict[tuple[str, int], int] = {}
         tool_used: dict[tuple[str, str], int] = {}
         for (model, ti), cnt in assign.items():
-            key = (p.batch_of(ti), model)
+            key = (self.idx.task_batch[ti], model)
             tool_used[key] = tool_used.get(key, 0) + cnt
         return SimState(0, produced, wip, assign, switching, tool_used)
 
     def advance_hour(self, s: SimState) -> None:
-        p = self.p
+        next_task = self.idx.next_task
+        j = s._journal
+        if j is not None:
+            j.append((None, "hour", s.hour))
+            j.extend((s.wip, ti, v) for ti, v in s.wip.items())
+            j.extend((s.switching, k, v) for k, v in s.switching.items())
         inflow: dict[int, int] = {}
-        for ti in range(len(p.tasks)):
+        for ti in range(self.idx.n_tasks):
             capacity = self.task_capacity(s, ti)
             q = int(min(capacity, s.wip[ti]))
             if q <= 0:
                 continue
+            if j is not None:
+                j.append((s.produced, ti, s.produced[ti]))
             s.produced[ti] += q
             s.wip[ti] -= q
-            nxt = p.next_task_index(ti)
+            nxt = next_task[ti]
             if nxt is not None:
                 inflow[nxt] = inflow.get(nxt, 0) + q
         for ti, v in inflow.items():
             s.wip[ti] += v
+        ms = s._moves
         for key in list(s.switching):
             model, ti = key
             machines_here = s.assign.get((model, ti), 0)
             s.switching[key] = max(0, s.switching[key] - machines_here)
+            if ms is not None:
+                ms.set_movable(model, ti, machines_here - s.switching[key])
             if s.switching[key] == 0:
                 del s.switching[key]
         s.hour += 1
 
+    def is_quiescent(self, s: SimState) -> bool:
+        """정책 개입 없이 남은 시간이 결정론적으로 흘러가는 상태인지.
+
+        WIP 소진(더 이상 생산 불가) 또는 전환 없음 + 유효 이동 없음(배치 고정).
+        """
+        if not any(s.wip.values()):
+            return True
+        if any(s.switching.values()):
+            return False
+        return not self.move_set(s).mask(s).any()
+
+    def quiescent_hours(self, s: SimState) -> int:
+        """정책 호출 없이 건너뛸 수 있는 시간 수 (0이면 지금 결정이 필요하다).
+
+        WIP가 모두 소진됐으면 남은 전부. 유효 이동이 없으면 이동 불가(movable ≤ 0) 칸이
+        전환을 마쳐 이동 가능해지는 다음 시점까지 — 이동 없이는 배치·tool이 바뀌지 않는다.
+        """
+        left = self.p.horizon_hours - s.hour
+        if left <= 0:
+            return 0
+        if not any(s.wip.values()):
+            return left
+        if self.move_set(s).mask(s).any():
+            return 0
+        for key, sw in s.switching.items():
+            machines_here = s.assign.get(key, 0)
+            if 0 < machines_here <= sw:
+                left = min(left, sw // machines_here)
+        return left
+
+    def _topo_order(self) -> list[int]:
+        order = self._topo
+        if order is None:
+            n = self.idx.n_tasks
+            indeg = [0] * n
+            for nxt in self.idx.next_task:
+                if nxt is not None:
+                    indeg[nxt] += 1
+            order = [ti for ti in range(n) if indeg[ti] == 0]
+            for ti in order:
+                nxt = self.idx.next_task[ti]
+                if nxt is not None:
+                    indeg[nxt] -= 1
+                    if indeg[nxt] == 0:
+                        order.append(nxt)
+            self._topo = order
+        return order
+
+    def fixed_trajectory(self, s: SimState, hours: int) -> tuple[np.ndarray, np.ndarray]:
+        """배치 고정 구간의 시간별 (task 정수 용량, 생산 가능 장비 수) — 각각 (hours, T).
+
+        이동이 없으면 전환 잔여(switching)만 시간마다 배치 대수만큼 줄고, 다 끝나면 상수다.
+        """
+        n = self.idx.n_tasks
+        caps = np.zeros((hours, n), dtype=np.int64)
+        units = np.zeros((hours, n), dtype=np.int64)
+        left = SimState(s.hour, s.produced, s.wip, s.assign, dict(s.switching), s.tool_used)
+        for h in range(hours):
+            for ti, task_models in enumerate(self.idx.task_models):
+                caps[h, ti] = int(self.task_capacity(left, ti))
+                units[h, ti] = sum(
+                    max(0, s.assign.get((m, ti), 0) - left.switching.get((m, ti), 0))
+                    for m, _uph in task_models
+                )
+            if not any(s.assign.get(key, 0) for key in left.switching):
+                caps[h + 1:] = caps[h]
+                units[h + 1:] = units[h]
+                break
+            for key in list(left.switching):
+                rest = left.switching[key] - s.assign.get(key, 0)
+                if rest > 0:
+                    left.switching[key] = rest
+                else:
+                    del left.switching[key]
+        return caps, units
+
+    def fast_forward(
+        self, s: SimState, hours: int, trajectory: tuple[np.ndarray, np.ndarray] | None = None,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """배치가 고정된 구간을 closed form으로 ``hours``시간 전이.
+
+        task별 시간당 정수 용량 C_h(전환이 끝나는 동안만 바뀜)의 누적 CC(k) = Σ_{h<k} C_h,
+        초기 WIP W0, 누적 유입 A(h)에 대해 누적 생산 P(k) = CC(k) + min(0, min_{1≤j≤k}(W0 + A(j-1) − CC(j))).
+        advance_hour를 ``hours``번 호출한 것과 같은 상태를 만든다 (배치 변경이 없다는 전제).
+        trajectory: 호출자가 이미 구한 fixed_trajectory(s, hours) 결과 (없으면 여기서 계산).
+        반환: (P, W) — P[h]는 처음 h시간 누적 생산 (hours+1, T), W[h]는 h시간째 시작 WIP (hours+1, T).
+        """
+        n = self.idx.n_tasks
+        next_task = self.idx.next_task
+        j = s._journal
+        if j is not None:
+            j.append((None, "hour", s.hour))
+            j.extend((s.wip, ti, v) for ti, v in s.wip.items())
+            j.extend((s.produced, ti, v) for ti, v in s.produced.items())
+            j.extend((s.switching, k, v) for k, v in s.switching.items())
+        caps, _units = trajectory if trajectory is not None else self.fixed_trajectory(s, hours)
+        CC = np.cumsum(caps, axis=0)
+        P = np.zeros((hours + 1, n), dtype=np.int64)
+        A = np.zeros((hours + 1, n), dtype=np.int64)
+        for ti in self._topo_order():
+            slack = s.wip[ti] + A[:-1, ti] - CC[:, ti]
+            P[1:, ti] = CC[:, ti] + np.minimum(np.minimum.accumulate(slack), 0)
+            nxt = next_task[ti]
+            if nxt is not None:
+                A[:, nxt] += P[:, ti]
+        W0 = np.asarray([s.wip[ti] for ti in range(n)], dtype=np.int64)
+        W = W0 + A - P
+        for ti in range(n):
+            s.produced[ti] += int(P[-1, ti])
+            s.wip[ti] = int(W[-1, ti])
+        for key in list(s.switching):
+            s.switching[key] = max(0, s.switching[key] - s.assign.get(key, 0) * hours)
+            if s._moves is not None:
+                s._moves.set_movable(key[0], key[1], s.assign.get(key, 0) - s.switching[key])
+            if s.switching[key] == 0:
+                del s.switching[key]
+        s.hour += hours
+        return P, W
+
     def is_done(self, s: SimState) -> bool:
         return s.hour >= self.p.horizon_hours
 
@@ -74,35 +227,40 @@ class Simulator:
             "per_task": per_task,
         }
 
+    def move_set(self, s: SimState) -> MoveSet:
+        """상태에 부착된 유효 이동 집합 (없으면 구축)."""
+        ms = s._moves
+        if ms is None or ms.idx is not self.idx:
+            ms = MoveSet.build(self.idx, s)
+            s._moves = ms
+        return ms
+
     def valid_moves(self, s: SimState) -> list[Move]:
-        p = self.p
-        out: list[Move] = []
-        n = len(p.tasks)
-        for model in p.models():
-            for fi in range(n):
-                movable = s.assign.get((model, fi), 0) - s.switching.get((model, fi), 0)
-                if movable <= 0:
-                    continue
-                for ti in range(n):
-                    if ti == fi:
-                        continue
-                    if p.uph_of(model, ti) is None:
-                        continue
-                    fb, tb = p.batch_of(fi), p.batch_of(ti)
-                    if fb != tb:
-                        if not p.can_convert(fb, tb):
-                            continue
-                        used = s.tool_used.get((tb, model), 0)
-                        cap = p.tool_cap(tb, model)
-                        if used >= cap:
-                            continue
-                    out.append(Move(model, fi, ti))
-        return out
+        return self.move_set(s).moves(s)
+
+    def valid_move_mask(self, s: SimState) -> np.ndarray:
+        """(M, T, T) bool — 축 순서는 problem.index.models / tasks."""
+        return self.move_set(s).mask(s)
+
+    def is_valid_move(self, s: SimState, mv: Move) -> bool:
+        mi = self.idx.model_pos.get(mv.model)
+        n = self.idx.n_tasks
+        if mi is None or not (0 <= mv.from_index < n and 0 <= mv.to_index < n):
+            return False
+        return self.move_set(s).is_valid(mi, mv.from_index, mv.to_index)
 
     def apply_move(self, s: SimState, mv: Move) -> None:
         p = self.p
         model, fi, ti = mv
-        fb, tb = p.batch_of(fi), p.batch_of(ti)
+        fb, tb = self.idx.task_batch[fi], self.idx.task_batch[ti]
+        j = s._journal
+        if j is not None:
+            j.append((s.assign, (model, fi), s.assign.get((model, fi), _MISSING)))
+            j.append((s.assign, (model, ti), s.assign.get((model, ti), _MISSING)))
+            if fb != tb:
+                j.append((s.switching, (model, ti), s.switching.get((model, ti), _MISSING)))
+                j.append((s.tool_used, (fb, model), s.tool_used.get((fb, model), _MISSING)))
+                j.append((s.tool_used, (tb, model), s.tool_used.get((tb, model), _MISSING)))
         s.assign[(model, fi)] = s.assign.get((model, fi), 0) - 1
         if s.assign[(model, fi)] == 0:
             del s.assign[(model, fi)]
@@ -111,29 +269,64 @@ class Simulator:
             s.switching[(model, ti)] = s.switching.get((model, ti), 0) + p.switch_time_hours
             s.tool_used[(fb, model)] = max(0, s.tool_used.get((fb, model), 0) - 1)
             s.tool_used[(tb, model)] = s.tool_used.get((tb, model), 0) + 1
+        if s._moves is not None:
+            s._moves.on_move(
+                self.idx.model_pos[model], fi, ti, p.switch_time_hours if fb != tb else 0,
+            )
+
+    # ── undo 로그 ────────────────────────────────────────
+    def checkpoint(self, s: SimState) -> int:
+        """undo 로그 기록을 시작(또는 이어서)하고 되돌릴 지점을 반환."""
+        if s._journal is None:
+            s._journal = []
+        return len(s._journal)
+
+    def rollback(self, s: SimState, mark: int) -> None:
+        """checkpoint 이후의 apply_move/advance_hour를 모두 되돌림 (중첩 지점 허용)."""
+        j = s._journal
+        if j is None:
+            return
+        touched: set[tuple[str, int]] = set()
+        tools: set[tuple[str, str]] = set()
+        while len(j) > mark:
+            d, key, old = j.pop()
+            if d is None:
+                s.hour = old
+                continue
+            if old is _MISSING:
+                d.pop(key, None)
+            else:
+                d[key] = old
+            if d is s.assign or d is s.switching:
+                touched.add(key)
+            elif d is s.tool_used:
+                tools.add(key)
+        ms = s._moves
+        if ms is not None:
+            for model, ti in touched:
+                ms.set_movable(model, ti, s.assign.get((model, ti), 0) - s.switching.get((model, ti), 0))
+            for batch, model in tools:
+                ms.set_tool_used(batch, model, s.tool_used.get((batch, model), 0))
+
+    def release(self, s: SimState) -> None:
+        """undo 로그 기록 종료 — 이후 전이는 기록 비용이 없다."""
+        s._journal = None
 
     def task_capacity(self, s: SimState, task_index: int) -> float:
         cap = 0.0
-        for model in self.p.models():
-            active = s.assign.get((model, task_index), 0) - s.switching.get((model, task_index), 0)
-            if active > 0 and (uph := self.p.uph_of(model, task_index)):
+        blocked = s.blocked
+        for model, uph in self.idx.task_models[task_index]:
+            active = s.assign.get((model, task_index), 0) - blocked.get((model, task_index), 0)
+            if active > 0:
                 cap += active * uph
         return cap
 
     def wip_dwell_time(self, s: SimState, task_index: int) -> float | None:
-        p = self.p
         wip = s.wip[task_index]
-        H = float(p.horizon_hours)
         if wip == 0:
             return 0.0
-        cap_cur = self.task_capacity(s, task_index)
-        if cap_cur <= 0:
-            return None
-        prev_ti = p.prev_task_index(task_index)
-        if prev_ti is None:
-            return min(wip / cap_cur, H)
-        cap_prev = self.task_capacity(s, prev_ti)
-        denom = min(cap_cur, float(wip)) - min(cap_prev, float(wip))
-        if denom <= 0:
-            return None
-        return min(wip / denom, H)
+        prev_ti = self.idx.prev_task[task_index]
+        return dwell_time(
+            wip, self.task_capacity(s, task_index),
+            None if prev_ti is None else self.task_capacity(s, prev_ti), self.p.horizon_hours,
+        )
@@ -0,0 +1,179 @@
+"""호기(EQP_ID) 단위 커널 — 시뮬레이션 중 호기 위치·전환·생산을 직접 기록.
+
+track_units가 trace를 사후 재생하는 대신, 실행 중에 unit→task·unit→누적 생산을
+정수 배열로 유지한다. 전환 잔여는 Simulator의 집계 switching(장비-시간)만 쓴다.
+이동 호기 선택 규칙(출발 위치의 마지막 호기)은 track_units와 같다.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from src.simulation.domain.problem import Move, ProblemInstance
+from src.simulation.domain.state import SimState
+from src.simulation.kernel.simulator import Simulator
+from src.utils.eqp_units import initial_positions
+
+
+@dataclass
+class UnitLedger:
+    """호기 단위 상태 + 시간별 이력."""
+    eqp_ids: list[str]
+    unit_model: np.ndarray      # (U,) model 인덱스 (ProblemIndex.models)
+    unit_task: np.ndarray       # (U,) 현재 task
+    unit_produced: np.ndarray   # (U,) 누적 생산
+    stacks: dict[tuple[str, int], list[int]]
+    history: list[np.ndarray] = field(default_factory=list)   # 시간별 unit_task (이동 적용 후)
+    conversions: list[dict] = field(default_factory=list)
+    vseq: dict[str, int] = field(default_factory=dict)
+
+    @classmethod
+    def build(cls, problem: ProblemInstance) -> UnitLedger:
+        idx = problem.index
+        ids: list[str] = []
+        models: list[int] = []
+        tasks: list[int] = []
+        stacks: dict[tuple[str, int], list[int]] = {}
+        for (model, ti), units in initial_positions(problem).items():
+            for eqp_id in units:
+                stacks.setdefault((model, ti), []).append(len(ids))
+                ids.append(eqp_id)
+                models.append(idx.model_pos[model])
+                tasks.append(ti)
+        n = len(ids)
+        return cls(
+            ids, np.asarray(models, dtype=np.int64), np.asarray(tasks, dtype=np.int64),
+            np.zeros(n, dtype=np.int64), stacks,
+        )
+
+    def clone(self) -> UnitLedger:
+        return UnitLedger(
+            self.eqp_ids, self.unit_model, self.unit_task.copy(),
+            self.unit_produced.copy(), {k: list(v) for k, v in self.stacks.items()},
+            list(self.history), list(self.conversions), dict(self.vseq),
+        )
+
+    def _spawn(self, model_pos: int, ti: int, eqp_id: str) -> int:
+        self.eqp_ids = self.eqp_ids + [eqp_id]
+        self.unit_model = np.append(self.unit_model, model_pos)
+        self.unit_task = np.append(self.unit_task, ti)
+        self.unit_produced = np.append(self.unit_produced, 0)
+        return len(self.eqp_ids) - 1
+
+    def units_at(self, model: str, ti: int) -> list[str]:
+        return [self.eqp_ids[u] for u in self.stacks.get((model, ti), [])]
+
+    def positions(self, hour: int | None = None, models: tuple[str, ...] = ()) -> dict[tuple[str, int], list[str]]:
+        """(model, ti) -> [eqp_id]. hour를 주면 해당 시간 기록에서 복원."""
+        if hour is None:
+            return {k: [self.eqp_ids[u] for u in v] for k, v in self.stacks.items() if v}
+        tasks = self.history[hour]
+        out: dict[tuple[str, int], list[str]] = {}
+        for u in range(len(tasks)):
+            out.setdefault((models[self.unit_model[u]], int(tasks[u])), []).append(self.eqp_ids[u])
+        return out
+
+
+@dataclass
+class UnitState(SimState):
+    units: UnitLedger | None = None
+
+    def clone(self) -> UnitState:
+        base = super().clone()
+        return UnitState(
+            base.hour, base.produced, base.wip, base.assign, base.switching, base.tool_used,
+            base._moves, None, self.units.clone() if self.units is not None else None,
+        )
+
+
+class UnitSimulator(Simulator):
+    """Simulator + 호기 단위 원장. 집계 전이는 Simulator와 동일하다."""
+
+    def reset(self) -> UnitState:
+        base = super().reset()
+        return UnitState(
+            base.hour, base.produced, base.wip, base.assign, base.switching, base.tool_used,
+            units=UnitLedger.build(self.p),
+        )
+
+    def apply_move(self, s: UnitState, mv: Move) -> None:
+        super().apply_move(s, mv)
+        led = s.units
+        model, fi, ti = mv
+        stack = led.stacks.get((model, fi))
+        if stack:
+            u = stack.pop()
+        else:
+            # 방어: 원장 불일치 시 가상 호기로 보충 (track_units와 동일)
+            n = led.vseq.get(model, 0) + 1
+            led.vseq[model] = n
+            u = led._spawn(self.idx.model_pos[model], fi, f"{model}-V{n:03d}")
+        led.stacks.setdefault((model, ti), []).append(u)
+        led.unit_task[u] = ti
+        if self.idx.task_batch[fi] != self.idx.task_batch[ti]:
+            led.conversions.append({
+                "hour": s.hour, "eqp_id": led.eqp_ids[u], "model": model,
+                "from_index": fi, "to_index": ti,
+            })
+
+    def advance_hour(self, s: UnitState) -> None:
+        led = s.units
+        led.history.append(led.unit_task.copy())
+        before = [s.produced[ti] for ti in range(self.idx.n_tasks)]
+        snapshot = dict(s.assign)
+        super().advance_hour(s)
+        for ti in range(self.idx.n_tasks):
+            q = s.produced[ti] - before[ti]
+            if q > 0:
+                self._credit(led, snapshot, ti, q)
+
+    def _credit(self, led: UnitLedger, snapshot: dict, ti: int, q: int) -> None:
+        """rows._split_hourly_produce와 같은 규칙으로 모델·호기별 생산 배분."""
+        weights = [
+            (model, snapshot.get((model, ti), 0) * uph)
+            for model, uph in zip(self.idx.models, self.idx.uph[:, ti].tolist())
+            if snapshot.get((model, ti), 0) > 0 and uph > 0
+        ]
+        total_w = sum(w for _m, w in weights)
+        if total_w <= 0:
+            return
+        allocated = 0
+        for i, (model, w) in enumerate(weights):
+            share = q - allocated if i == len(weights) - 1 else int(q * w / total_w)
+            allocated += share
+            units = sorted(led.stacks.get((model, ti), []), key=lambda u: led.eqp_ids[u])
+            if not units:
+                continue
+            per_unit, rem = divmod(share, len(units))
+            for k, u in enumerate(units):
+                led.unit_produced[u] += per_unit + (1 if k < rem else 0)
+
+    def hourly_positions(self, s: UnitState) -> list[dict[tuple[str, int], list[str]]]:
+        """track_units(problem, trace)[0]과 같은 형태 (시간별 이동 적용 후 위치)."""
+        models = self.idx.models
+        return [s.units.positions(h, models) for h in range(len(s.units.history))]
+
+    def unit_production(self, s: UnitState) -> dict[str, int]:
+        led = s.units
+        return {eqp: int(q) for eqp, q in zip(led.eqp_ids, led.unit_produced.tolist())}
+
+    def is_quiescent(self, s: SimState) -> bool:
+        # 시간별 원장 기록이 필요하므로 fast_forward 대상에서 제외
+        return False
+
+    def quiescent_hours(self, s: SimState) -> int:
+        return 0
+
+    # 호기 원장(stacks·history·conversions)은 undo 로그에 없다 — 부모 구현은 집계와 원장을 어긋나게 한다
+    def checkpoint(self, s: SimState) -> int:
+        raise TypeError("UnitSimulator does not support checkpoint/rollback; use clone()")
+
+    def rollback(self, s: SimState, mark: int) -> None:
+        raise TypeError("UnitSimulator does not support checkpoint/rollback; use clone()")
+
+    def release(self, s: SimState) -> None:
+        raise TypeError("UnitSimulator does not support checkpoint/rollback; use clone()")
+
+    def fast_forward(self, s: SimState, hours: int):
+        raise TypeError("UnitSimulator records hourly unit history; use advance_hour()")
@@ -0,0 +1,103 @@
+"""배열 기반 시뮬레이션 커널 — Simulator와 동일한 전이를 전체 배열 연산으로 수행."""
+from __future__ import annotations
+
+import numpy as np
+
+from src.simulation.domain.problem import Move, ProblemInstance
+from src.simulation.domain.state import ArrayState, SimState
+
+
+class VectorSimulator:
+    """ArrayState 전용 결정론적 시뮬레이터 (1시간 단위).
+
+    용량·생산·하류 유입·전환 감쇠를 (M, T) 배열 연산으로 계산한다.
+    정책/행 빌더가 필요하면 ``view()``로 dict SimState 호환 뷰를 얻는다.
+    """
+
+    def __init__(self, problem: ProblemInstance):
+        self.p = problem
+        self.idx = idx = problem.index
+        self.n_models = len(idx.models)
+        self.n_tasks = idx.n_tasks
+        self.uph = idx.uph
+        self.next_task = np.asarray(
+            [-1 if n is None else n for n in idx.next_task], dtype=np.int64,
+        )
+        self._has_next = self.next_task >= 0
+        self._next_targets = self.next_task[self._has_next]
+        self.plan = np.asarray([t.plan_qty for t in problem.tasks], dtype=np.int64)
+
+    def reset(self) -> ArrayState:
+        idx = self.idx
+        wip = np.asarray([t.init_wip for t in self.p.tasks], dtype=np.int64)
+        produced = np.zeros(self.n_tasks, dtype=np.int64)
+        assign = np.zeros((self.n_models, self.n_tasks), dtype=np.int64)
+        for (m, ti), cnt in self.p.init_assign.items():
+            assign[idx.model_pos[m], ti] += cnt
+        switching = np.zeros_like(assign)
+        tool_used = np.zeros((len(idx.batches), self.n_models), dtype=np.int64)
+        np.add.at(tool_used, idx.task_batch_pos, assign.T)
+        return ArrayState(0, produced, wip, assign, switching, tool_used)
+
+    def from_state(self, s: SimState) -> ArrayState:
+        return ArrayState.from_sim_state(self.idx, s)
+
+    def view(self, a: ArrayState) -> SimState:
+        return a.to_sim_state(self.idx)
+
+    def task_capacity(self, a: ArrayState) -> np.ndarray:
+        """(T,) 시간당 용량. 모델 순서대로 누적해 dict 커널과 부동소수 결과를 맞춘다."""
+        active = np.maximum(a.assign - a.switching, 0)
+        cap = np.zeros(self.n_tasks, dtype=np.float64)
+        for mi in range(self.n_models):
+            cap += active[mi] * self.uph[mi]
+        return cap
+
+    def advance_hour(self, a: ArrayState) -> np.ndarray:
+        """1시간 전이. 반환값은 task별 이번 시간 생산량 (T,)."""
+        q = np.minimum(np.floor(self.task_capacity(a)).astype(np.int64), a.wip)
+        np.maximum(q, 0, out=q)
+        a.produced += q
+        a.wip -= q
+        np.add.at(a.wip, self._next_targets, q[self._has_next])
+        np.maximum(a.switching - a.assign, 0, out=a.switching)
+        a.hour += 1
+        return q
+
+    def apply_move(self, a: ArrayState, mv: Move) -> None:
+        idx = self.idx
+        mi = idx.model_pos[mv.model]
+        fi, ti = mv.from_index, mv.to_index
+        a.assign[mi, fi] -= 1
+        a.assign[mi, ti] += 1
+        fb, tb = idx.task_batch_pos[fi], idx.task_batch_pos[ti]
+        if fb != tb:
+            a.switching[mi, ti] += self.p.switch_time_hours
+            a.tool_used[fb, mi] = max(0, a.tool_used[fb, mi] - 1)
+            a.tool_used[tb, mi] += 1
+
+    def active_eqp_count(self, a: ArrayState) -> int:
+        active = np.maximum(a.assign - a.switching, 0)
+        contributing = self.idx.eligible & (self.uph > 0) & (a.wip > 0)[None, :]
+        return int(active[contributing].sum())
+
+    def is_done(self, a: ArrayState) -> bool:
+        return a.hour >= self.p.horizon_hours
+
+    def achievement_rates(self, a: ArrayState) -> np.ndarray:
+        plan = self.plan
+        safe = np.where(plan > 0, plan, 1)
+        return np.where(plan > 0, np.minimum(a.produced / safe, 1.0), 1.0)
+
+    def metrics(self, a: ArrayState) -> dict:
+        rates = self.achievement_rates(a)
+        per_task = {
+            f"{t.plan_prod_key}/{t.oper_id}": {
+                "produced": int(a.produced[i]), "plan": t.plan_qty, "rate": round(float(rates[i]), 4),
+            }
+            for i, t in enumerate(self.p.tasks)
+        }
+        return {
+            "plan_achievement": round(sum(rates.tolist()) / len(rates), 4) if len(rates) else 0.0,
+            "per_task": per_task,
+        }
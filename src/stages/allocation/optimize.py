@@ -0,0 +1,147 @@
+"""Stage 1 — 정수 배분 최적화 (allocation_reward 최대화).
+
+제약: 모델별 장비 수(eqp_qty), (batch, 모델)별 tool 수 — 단 초기 배치가 이미 넘는 batch는 초기 대수까지.
+보상은 task별로 분리되고 task끼리는 남은 장비·tool 벡터로만 묶이므로, batch 순으로 task를 돌며
+(task 위치, 남은 장비, 이번 batch 남은 tool) 상태에 메모이제이션한 DP로 정확해를 구한다.
+시간 제한을 넘기면 None — 호출자가 해석식 가이드로 폴백한다.
+"""
+from __future__ import annotations
+
+import itertools
+import time
+
+import config
+from src.simulation.domain.allocation import task_allocation_rate
+from src.simulation.domain.problem import ProblemInstance
+
+
+class _Timeout(Exception):
+    pass
+
+
+def _useful_max(problem: ProblemInstance, ti: int, m: str, limit: int) -> int:
+    """모델 m 단독으로 task를 채울 때 의미 있는 최대 대수 (그 이상은 전환 손실로 보상이 늘지 않음)."""
+    best_c, best_r = 0, 0.0
+    for c in range(1, limit + 1):
+        r = task_allocation_rate(problem, ti, {m: c})
+        if r > best_r + 1e-12:
+            best_c, best_r = c, r
+        if r >= 1.0:
+            break
+    return best_c
+
+
+def _task_options(problem: ProblemInstance, ti: int, models: list[str], limits: list[int]):
+    """(counts 튜플, rate) — 같은 rate를 더 적은 장비로 내는 선택지가 있으면 제외."""
+    ranges = [range(_useful_max(problem, ti, m, lim) + 1) for m, lim in zip(models, limits)]
+    scored = []
+    for combo in itertools.product(*ranges):
+        counts = {m: c for m, c in zip(models, combo) if c}
+        scored.append((combo, task_allocation_rate(problem, ti, counts)))
+    scored.sort(key=lambda x: (sum(x[0]), -x[1]))
+    kept: list[tuple[tuple[int, ...], float]] = []
+    for combo, rate in scored:
+        if any(r >= rate and all(a <= b for a, b in zip(k, combo)) for k, r in kept):
+            continue
+        kept.append((combo, rate))
+    return kept
+
+
+def optimize_allocation(
+    problem: ProblemInstance, time_limit: float | None = None,
+) -> dict[tuple[str, int], int] | None:
+    """allocation_reward 최대 정수 배분 (시간 초과 시 None)."""
+    time_limit = config.ALLOC_OPT_TIME_LIMIT_S if time_limit is None else time_limit
+    deadline = time.perf_counter() + time_limit
+    idx = problem.index
+    models = list(idx.models)
+    eqp = tuple(int(problem.eqp_qty.get(m, 0)) for m in models)
+    order = sorted(range(len(problem.tasks)), key=lambda ti: (idx.task_batch_pos[ti], ti))
+    batch_cap: dict[str, tuple[int, ...]] = {}
+    for b in idx.batches:
+        init = [0] * len(models)
+        for (m, ti), c in problem.init_assign.items():
+            if idx.task_batch[ti] == b and m in idx.model_pos:
+                init[idx.model_pos[m]] += c
+        batch_cap[b] = tuple(
+            max(problem.tool_cap(b, m), init[mi]) for mi, m in enumerate(models)
+        )
+    try:
+        options = []
+        for ti in order:
+            if time.perf_counter() >= deadline:
+                raise _Timeout
+            elig = [mi for mi, m in enumerate(models) if idx.uph[mi, ti] > 0]
+            limits = [min(eqp[mi], batch_cap[idx.task_batch[ti]][mi]) for mi in elig]
+            opts = _task_options(problem, ti, [models[mi] for mi in elig], limits)
+            options.append((elig, opts))
+        memo: dict[tuple, tuple[float, tuple[int, ...] | None]] = {}
+
+        def best(k: int, remain: tuple[int, ...], tool: tuple[int, ...]) -> float:
+            if k == len(order):
+                return 0.0
+            key = (k, remain, tool)
+            hit = memo.get(key)
+            if hit is not None:
+                return hit[0]
+            if time.perf_counter() >= deadline:
+                raise _Timeout
+            ti = order[k]
+            new_batch = k + 1 < len(order) and idx.task_batch[order[k + 1]] != idx.task_batch[ti]
+            elig, opts = options[k]
+            value, choice = -1.0, None
+            for combo, rate in opts:
+                if any(c > remain[mi] or c > tool[mi] for mi, c in zip(elig, combo)):
+                    continue
+                r2, t2 = list(remain), list(tool)
+                for mi, c in zip(elig, combo):
+                    r2[mi] -= c
+                    t2[mi] -= c
+                sub = batch_cap[idx.task_batch[order[k + 1]]] if new_batch else tuple(t2)
+                v = rate + best(k + 1, tuple(r2), sub)
+                if v > value + 1e-12:
+                    value, choice = v, combo
+            memo[key] = (value, choice)
+            return value
+
+        first_tool = batch_cap[idx.task_batch[order[0]]] if order else ()
+        best(0, eqp, first_tool)
+    except _Timeout:
+        return None
+
+    alloc: dict[tuple[str, int], int] = {}
+    remain, tool = list(eqp), list(first_tool)
+    for k, ti in enumerate(order):
+        if k > 0 and idx.task_batch[ti] != idx.task_batch[order[k - 1]]:
+            tool = list(batch_cap[idx.task_batch[ti]])
+        elig, _opts = options[k]
+        combo = memo[(k, tuple(remain), tuple(tool))][1] or ()
+        for mi, c in zip(elig, combo):
+            alloc[(models[mi], ti)] = c
+            remain[mi] -= c
+            tool[mi] -= c
+    _place_leftover(problem, alloc, remain, batch_cap)
+    return alloc
+
+
+def _place_leftover(
+    problem: ProblemInstance,
+    alloc: dict[tuple[str, int], int],
+    remain: list[int],
+    batch_cap: dict[str, tuple[int, ...]],
+) -> None:
+    """남는 장비는 초기 위치로 되돌린다 — 전환 유입이 없으므로 보상이 줄지 않는다."""
+    idx = problem.index
+    used: dict[tuple[str, str], int] = {}
+    for (m, ti), c in alloc.items():
+        used[(idx.task_batch[ti], m)] = used.get((idx.task_batch[ti], m), 0) + c
+    for (m, ti), init in sorted(problem.init_assign.items(), key=lambda x: (x[0][1], x[0][0])):
+        mi = idx.model_pos.get(m)
+        if mi is None or remain[mi] <= 0 or idx.uph[mi, ti] <= 0:
+            continue
+        b = idx.task_batch[ti]
+        add = min(remain[mi], init - alloc.get((m, ti), 0), batch_cap[b][mi] - used.get((b, m), 0))
+        if add > 0:
+            alloc[(m, ti)] = alloc.get((m, ti), 0) + add
+            used[(b, m)] = used.get((b, m), 0) + add
+            remain[mi] -= add
@@ -0,0 +1,148 @@
+"""Stage 1 — AllocationEnv logit 공간 교차 엔트로피(CEM) 탐색.
+
+AllocationEnv의 logit → 정수 배분 변환과 보상(allocation_reward)을 후보 N개에 한 번에 계산하고,
+해석식(또는 RL alloc 모델) logit에서 시작해 상위 후보로 정규분포를 갱신한다. 마감 시각까지의 최선해를 반환.
+"""
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+
+import numpy as np
+
+import config
+from envs.allocation_env import AllocationEnv
+from src.simulation.domain.problem import ProblemInstance
+
+
+@dataclass(frozen=True)
+class CEMConfig:
+    population: int = 256     # 세대당 후보 logit 수
+    elite_frac: float = 0.1   # 분포 갱신에 쓸 상위 비율
+    iterations: int = 100     # 최대 세대 수
+    time_limit_s: float = 2.0  # 벽시계 마감
+    seed: int = 0
+    init_std: float = 1.0
+    min_std: float = 0.05     # 조기 수렴 방지 하한
+    smoothing: float = 0.7    # 새 분포 반영 비율
+
+    @classmethod
+    def from_config(cls) -> CEMConfig:
+        return cls(config.ALLOC_CEM_POPULATION, config.ALLOC_CEM_ELITE_FRAC,
+                   config.ALLOC_CEM_ITERATIONS, config.ALLOC_CEM_TIME_LIMIT_S, config.ALLOC_CEM_SEED)
+
+
+class LogitEvaluator:
+    """AllocationEnv._logits_to_allocation + allocation_reward의 배치 버전 (후보 축 N)."""
+
+    def __init__(self, env: AllocationEnv):
+        p = env.p
+        self.env = env
+        self.models = env.models
+        M, T = env.n_models, env.n_tasks
+        self.elig = np.array(
+            [[p.uph_of(m, ti) is not None for ti in range(T)] for m in self.models], dtype=bool,
+        ).reshape(M, T)
+        self.uph = np.array(
+            [[p.uph_of(m, ti) or 0.0 for ti in range(T)] for m in self.models], dtype=np.float64,
+        ).reshape(M, T)
+        self.eqp = np.array([float(p.eqp_qty[m]) for m in self.models], dtype=np.float64)
+        self.tool = np.array(
+            [[float(p.tool_cap(p.batch_of(ti), m)) for ti in range(T)] for m in self.models],
+            dtype=np.float64,
+        ).reshape(M, T)
+        self.init = np.array(
+            [[p.init_assign.get((m, ti), 0) for ti in range(T)] for m in self.models],
+            dtype=np.float64,
+        ).reshape(M, T)
+        self.plan = np.array([float(t.plan_qty) for t in p.tasks], dtype=np.float64)
+        self.horizon = float(p.horizon_hours)
+        self.switch = float(p.switch_time_hours)
+        self.active = np.zeros((env.mm, env.mt), dtype=bool)
+        self.active[:M, :T] = self.elig
+        self.active = self.active.reshape(-1)
+
+    def counts(self, logits: np.ndarray) -> np.ndarray:
+        """(N, mm*mt) logit → (N, M, T) 정수 대수."""
+        env = self.env
+        M, T = env.n_models, env.n_tasks
+        L = np.asarray(logits, dtype=np.float32).astype(np.float64)
+        L = L.reshape(-1, env.mm, env.mt)[:, :M, :T]
+        L = np.where(self.elig, L, -9999.0)
+        ex = np.exp(L - L.max(axis=2, keepdims=True))
+        raw = ex / ex.sum(axis=2, keepdims=True) * self.eqp[:, None]
+        raw = np.minimum(raw, self.tool)
+        raw_sum = raw.sum(axis=2)
+        over = (raw_sum > self.eqp) & (raw_sum > 0)
+        raw = raw * np.where(over, self.eqp / np.where(over, raw_sum, 1.0), 1.0)[..., None]
+        total = np.where(raw_sum > 0, np.minimum(self.eqp, raw_sum), self.eqp)
+        empty = raw_sum <= 0
+        if empty.any():
+            n_active = self.elig.sum(axis=1)
+            uniform = np.where(self.elig, self.eqp[:, None] / np.maximum(n_active, 1)[:, None], 0.0)
+            raw = np.where(empty[..., None], uniform, raw)
+            total = np.where(empty & (n_active == 0), 0.0, total)
+        # largest_remainder: 내림 후 잔여를 (소수부, 인덱스) 내림차순으로 1씩
+        floors = np.floor(raw)
+        need = np.maximum(np.round(total) - floors.sum(axis=2), 0).astype(np.int64)
+        rem = raw - floors
+        pos = np.broadcast_to(-np.arange(T), rem.shape)
+        order = np.lexsort((pos, -rem), axis=-1)
+        rank = np.empty_like(order)
+        np.put_along_axis(rank, order, np.arange(T), axis=-1)
+        extra = need[..., None] // max(T, 1) + (rank < (need % max(T, 1))[..., None])
+        return np.where(self.elig, floors + extra, 0).astype(np.int64)
+
+    def reward(self, counts: np.ndarray) -> np.ndarray:
+        """(N, M, T) 대수 → (N,) allocation_reward."""
+        c = counts.astype(np.float64)
+        if not len(self.plan):
+            return np.zeros(len(c))
+        cap = (c * self.uph).sum(axis=1)
+        switches_in = np.maximum(0.0, c - self.init).sum(axis=1)
+        eff_h = np.maximum(0.0, self.horizon - switches_in * self.switch)
+        plan = np.where(self.plan > 0, self.plan, 1.0)
+        rate = np.where(self.plan > 0, np.minimum(cap * eff_h, plan) / plan, 1.0)
+        return rate.mean(axis=1)
+
+    def allocation(self, counts: np.ndarray) -> dict[tuple[str, int], int]:
+        return {
+            (m, ti): int(counts[mi, ti])
+            for mi, m in enumerate(self.models)
+            for ti in range(self.env.n_tasks)
+            if self.elig[mi, ti]
+        }
+
+
+def cem_allocation(
+    problem: ProblemInstance,
+    warm_starts: list[np.ndarray] | None = None,
+    cfg: CEMConfig | None = None,
+) -> dict[tuple[str, int], int]:
+    """해석식 logit(+warm_starts) 중 최선에서 시작한 CEM — 마감까지의 최선 배분."""
+    cfg = cfg or CEMConfig.from_config()
+    deadline = time.perf_counter() + cfg.time_limit_s
+    env = AllocationEnv(problem, max_tasks=config.MAX_TASKS, max_models=config.MAX_MODELS)
+    ev = LogitEvaluator(env)
+    starts = np.stack([env.analytic_target_logits(), *(warm_starts or [])]).astype(np.float32)
+    counts = ev.counts(starts)
+    scores = ev.reward(counts)
+    i = int(np.argmax(scores))
+    best_score, best_counts = float(scores[i]), counts[i]
+    mean = starts[i].astype(np.float64)
+    std = np.where(ev.active, cfg.init_std, 0.0)
+    rng = np.random.default_rng(cfg.seed)
+    n_elite = max(2, int(round(cfg.population * cfg.elite_frac)))
+    for _ in range(cfg.iterations):
+        if time.perf_counter() >= deadline:
+            break
+        pop = np.clip(mean + std * rng.standard_normal((cfg.population, len(mean))), -3.0, 3.0)
+        counts = ev.counts(pop)
+        scores = ev.reward(counts)
+        elite = np.argsort(-scores, kind="stable")[:n_elite]
+        if scores[elite[0]] > best_score + 1e-12:
+            best_score, best_counts = float(scores[elite[0]]), counts[elite[0]]
+        a = cfg.smoothing
+        mean = a * pop[elite].mean(axis=0) + (1 - a) * mean
+        std = np.where(ev.active, np.maximum(a * pop[elite].std(axis=0) + (1 - a) * std, cfg.min_std), 0.0)
+    return ev.allocation(best_counts)
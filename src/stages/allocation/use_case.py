@@ -3,26 +3,81 @@ from __future__ import annotations
 
 import warnings
 
+import numpy as np
+
 import config
 from src.simulation.domain.allocation import GuideAllocation
 from src.simulation.domain.problem import ProblemInstance
+from src.utils.parallel import parallel_map
 
 
-def allocate(problem: ProblemInstance, policy: str = "auto") -> GuideAllocation:
+def allocate(
+    problem: ProblemInstance,
+    policy: str = "auto",
+    decompose: bool = False,
+    workers: int | None = None,
+) -> GuideAllocation:
     """공정×모델 목표 장비 대수 산출.
 
-    policy: auto | analytic | rl
+    policy: auto | analytic | rl | optimize | cem (auto는 config.ALLOC_POLICY, 그것도 auto면
+    USE_ALLOC_MODEL에 따라 rl/analytic). rl·optimize가 실패·시간 초과면 해석식 가이드로 폴백.
+    cem은 해석식(·RL) logit에서 시작하는 anytime 탐색이라 마감까지의 최선해를 그대로 쓴다.
+    decompose=True면 독립 부분문제별로 작업자 프로세스에서 산출해 병합한다.
     """
+    if decompose:
+        comps = problem.decompose()
+        if len(comps) > 1:
+            guides = parallel_map(
+                _allocate_component, [(c.problem, policy) for c in comps], workers=workers,
+            )
+            merged = {
+                (m, comp.tasks[ti]): cnt
+                for comp, guide in zip(comps, guides)
+                for (m, ti), cnt in guide.counts.items()
+            }
+            return GuideAllocation.from_raw(problem, merged, _merged_source(guides))
+    if policy == "auto":
+        policy = config.ALLOC_POLICY
     if policy == "auto":
         policy = "rl" if config.USE_ALLOC_MODEL else "analytic"
     if policy == "rl":
         raw = _allocate_rl(problem)
         if raw is not None:
-            return GuideAllocation.from_raw(problem, raw)
+            return GuideAllocation.from_raw(problem, raw, "ALLOC_RL")
+    if policy == "optimize":
+        from src.stages.allocation.optimize import optimize_allocation
+
+        raw = optimize_allocation(problem)
+        if raw is not None:
+            return GuideAllocation.from_raw(problem, raw, "ALLOC_OPT")
+    if policy == "cem":
+        from src.stages.allocation.search import cem_allocation
+
+        warm = _rl_logits(problem) if config.USE_ALLOC_MODEL else None
+        raw = cem_allocation(problem, warm_starts=[warm] if warm is not None else None)
+        return GuideAllocation.from_raw(problem, raw, "ALLOC_CEM")
     return GuideAllocation.from_raw(problem, problem.plan_target_allocation_int())
 
 
-def _allocate_rl(problem: ProblemInstance) -> dict[tuple[str, int], int] | None:
+def _merged_source(guides: list[GuideAllocation]) -> str:
+    """병합 가이드의 source — 배분 대수가 가장 많은 비해석식 source (모두 해석식이면 ANALYTIC).
+
+    부분문제 일부만 rl/optimize가 폴백해도 MODE_TYP이 Heuristic으로 덮이지 않게 한다.
+    """
+    units: dict[str, int] = {}
+    for g in guides:
+        if g.source != "ANALYTIC":
+            units[g.source] = units.get(g.source, 0) + sum(g.counts.values())
+    return max(units, key=units.get) if units else "ANALYTIC"
+
+
+def _allocate_component(args: tuple) -> GuideAllocation:
+    problem, policy = args
+    return allocate(problem, policy)
+
+
+def _rl_logits(problem: ProblemInstance) -> np.ndarray | None:
+    """저장된 alloc 모델의 결정적 logit (모델이 없거나 추론 실패면 None)."""
     from agents.model_store import load_alloc_model
 
     path = config.SAVED_MODELS_DIR / "ppo_alloc.zip"
@@ -36,8 +91,18 @@ def _allocate_rl(problem: ProblemInstance) -> dict[tuple[str, int], int] | None:
         env = AllocationEnv(problem, max_tasks=config.MAX_TASKS, max_models=config.MAX_MODELS)
         obs, _ = env.reset()
         action, _ = model.predict(obs, deterministic=True)
-        env.step(action)
-        return env.get_allocation()
+        return np.asarray(action, dtype=np.float32)
     except Exception as e:
         warnings.warn(f"AllocationEnv 추론 실패 ({e!r}); 해석식 가이드로 폴백.")
         return None
+
+
+def _allocate_rl(problem: ProblemInstance) -> dict[tuple[str, int], int] | None:
+    action = _rl_logits(problem)
+    if action is None:
+        return None
+    from envs.allocation_env import AllocationEnv
+    env = AllocationEnv(problem, max_tasks=config.MAX_TASKS, max_models=config.MAX_MODELS)
+    env.reset()
+    env.step(action)
+    return env.get_allocation()
@@ -0,0 +1,179 @@
+"""LP 완화 상한 — ground_truth 없는 스냅샷에도 즉시 쓸 수 있는 gap 기준.
+
+계획 구간을 최대 _MAX_BUCKETS개 시간 구간(bucket)으로 묶어 LP 크기가 H와 무관하다
+(H ≤ _MAX_BUCKETS면 1시간 구간 — 시간별 LP와 같다). 변수 (모두 연속, ≥ 0):
+- y[m, b, k]: 구간 k 동안 batch b에 있는 model m 장비-시간, p[m, b, k]: 그 구간 최대 장비 수
+  (1시간 구간이면 y와 같은 변수)
+- in[m, b, k]: 구간 k에 b로 새로 들어온(전환) 장비 수 — 장비당 switch_time_hours 장비-시간 손실
+- x[m, t, k]: task t에서 실제 생산하는 장비-시간
+- q[t, k]: 생산량, a[t]: 계획 인정량 (≤ plan_qty)
+
+제약: 전환그룹 안에서만 이동 · tool 수(tool_qty) 상한 · 구간 끝 누적 생산 ≤ 초기 WIP + 전 공정
+누적 유입(1시간 지연 — 여러 시간 구간은 그 구간 유입까지 인정) · 누적 생산 장비-시간 ≤ 누적 체류
+− 전환 손실(구간 끝 기준 최소 손실). 목적: Σ a[t] / plan_qty[t].
+정수 시뮬레이터의 모든 계획은 이 LP의 가능해이므로 최적값은 plan_achievement의 상한이다.
+"""
+from __future__ import annotations
+
+import math
+
+import numpy as np
+
+from src.simulation.domain.problem import ProblemInstance
+from src.simulation.domain.state import SimState
+from src.utils.simplex import linprog_max
+
+# 시간 구간 수 상한 — NumPy 단체법(dense)으로도 H=168에서 수십 ms
+_MAX_BUCKETS = 24
+
+
+class _LP:
+    def __init__(self):
+        self.cols: dict[tuple, int] = {}
+        self.rows: list[tuple[dict[int, float], float]] = []
+
+    def var(self, key: tuple) -> int:
+        return self.cols.setdefault(key, len(self.cols))
+
+    def le(self, coefs: dict[int, float], rhs: float) -> None:
+        self.rows.append((coefs, rhs))
+
+    def solve(self, objective: dict[int, float]) -> float:
+        n = len(self.cols)
+        c = np.zeros(n)
+        for j, v in objective.items():
+            c[j] = v
+        A = np.zeros((len(self.rows), n))
+        b = np.zeros(len(self.rows))
+        for i, (coefs, rhs) in enumerate(self.rows):
+            for j, v in coefs.items():
+                A[i, j] += v
+            b[i] = rhs
+        value, _x = linprog_max(c, A, b)
+        return value
+
+
+def _add(coefs: dict[int, float], j: int, v: float) -> None:
+    coefs[j] = coefs.get(j, 0.0) + v
+
+
+def _buckets(H: int) -> list[tuple[int, int]]:
+    """[시작, 끝) 시간 구간 — 최대 _MAX_BUCKETS개, H가 작으면 1시간씩."""
+    n = min(H, _MAX_BUCKETS)
+    edges = sorted({round(H * k / n) for k in range(n + 1)})
+    return list(zip(edges[:-1], edges[1:]))
+
+
+def lp_upper_bound(problem: ProblemInstance) -> float:
+    """plan_achievement 상한 (소수 4자리 올림 — 반올림된 달성률과 바로 비교 가능)."""
+    if not problem.tasks:
+        return 0.0
+    return min(1.0, math.ceil(lp_bound(problem) * 1e4 - 1e-6) / 1e4)
+
+
+def lp_bound(problem: ProblemInstance, state: SimState | None = None) -> float:
+    """반올림 없는 LP 상한 — state를 주면 그 시간 경계부터 남은 구간의 상한 (분기한정 가지치기용).
+
+    state의 배치·WIP에서 출발하고 이미 생산한 양은 그대로 인정한다. 진행 중인 전환 잔여는
+    무시한다 (장비를 더 일찍 쓰게 하는 완화라 상한은 그대로 유효하다).
+    """
+    idx = problem.index
+    tasks = problem.tasks
+    if not tasks:
+        return 0.0
+    S = problem.switch_time_hours
+    if state is None:
+        H, assign = problem.horizon_hours, problem.init_assign
+        wip = [t.init_wip for t in tasks]
+        produced = [0] * len(tasks)
+    else:
+        H, assign = problem.horizon_hours - state.hour, state.assign
+        wip = [state.wip[ti] for ti in range(len(tasks))]
+        produced = [state.produced[ti] for ti in range(len(tasks))]
+    done = sum(min(q / t.plan_qty, 1.0) if t.plan_qty > 0 else 1.0 for q, t in zip(produced, tasks))
+    if H <= 0:
+        return done / len(tasks)
+    buckets = _buckets(H)
+    K = len(buckets)
+    lp = _LP()
+
+    units0: dict[tuple[str, str], int] = {}
+    for (m, ti), cnt in assign.items():
+        if cnt > 0 and m in idx.model_pos:
+            key = (m, idx.task_batch[ti])
+            units0[key] = units0.get(key, 0) + cnt
+
+    def region(b: str):
+        g = idx.group_of_batch.get(b)
+        return ("group", g) if g is not None else ("batch", b)
+
+    regions: dict[tuple[str, tuple], list[str]] = {}
+    for m in idx.models:
+        held = {region(b) for (mm, b), c in units0.items() if mm == m}
+        for b in idx.batches:
+            if region(b) in held:
+                regions.setdefault((m, region(b)), []).append(b)
+
+    def peak(m: str, b: str, k: int) -> int:
+        start, end = buckets[k]
+        return lp.var(("y" if end - start == 1 else "p", m, b, k))
+
+    # 장비 위치·전환
+    for (m, r), batches in regions.items():
+        total = sum(units0.get((m, b), 0) for b in batches)
+        for k, (start, end) in enumerate(buckets):
+            lp.le({lp.var(("y", m, b, k)): 1.0 for b in batches}, float(total * (end - start)))
+        for b in batches:
+            y0 = units0.get((m, b), 0)
+            cap = max(idx.tool_cap.get((b, m), 0), y0)
+            for k, (start, end) in enumerate(buckets):
+                y, top, arrive = lp.var(("y", m, b, k)), peak(m, b, k), lp.var(("in", m, b, k))
+                lp.le({top: 1.0}, cap)
+                if top != y:
+                    lp.le({y: 1.0, top: -float(end - start)}, 0.0)
+                if k == 0:
+                    lp.le({top: 1.0, arrive: -1.0}, y0)
+                else:
+                    lp.le({top: 1.0, peak(m, b, k - 1): -1.0, arrive: -1.0}, 0.0)
+            b_tasks = [
+                ti for ti in range(idx.n_tasks)
+                if idx.task_batch[ti] == b and idx.uph[idx.model_pos[m], ti] > 0
+            ]
+            for k, (_start, end) in enumerate(buckets):
+                coefs: dict[int, float] = {}
+                for kk in range(k + 1):
+                    for ti in b_tasks:
+                        _add(coefs, lp.var(("x", m, ti, kk)), 1.0)
+                    _add(coefs, lp.var(("y", m, b, kk)), -1.0)
+                    loss = min(S, end - buckets[kk][1] + 1)
+                    _add(coefs, lp.var(("in", m, b, kk)), float(loss))
+                lp.le(coefs, 0.0)
+
+    # 생산·WIP 흐름
+    objective: dict[int, float] = {}
+    for ti, t in enumerate(tasks):
+        prev = idx.prev_task[ti]
+        for k, (start, end) in enumerate(buckets):
+            coefs = {lp.var(("q", ti, k)): 1.0}
+            for m, uph in idx.task_models[ti]:
+                key = ("x", m, ti, k)
+                if key in lp.cols:
+                    _add(coefs, lp.cols[key], -uph)
+            lp.le(coefs, 0.0)
+            cum = {lp.var(("q", ti, kk)): 1.0 for kk in range(k + 1)}
+            if prev is not None:
+                inflow = k + 1 if end - start > 1 else k
+                for kk in range(inflow):
+                    _add(cum, lp.var(("q", prev, kk)), -1.0)
+            lp.le(cum, float(wip[ti]))
+        if t.plan_qty > produced[ti]:
+            a = lp.var(("a", ti))
+            lp.le({a: 1.0}, float(t.plan_qty - produced[ti]))
+            coefs = {a: 1.0}
+            for k in range(K):
+                _add(coefs, lp.var(("q", ti, k)), -1.0)
+            lp.le(coefs, 0.0)
+            objective[a] = 1.0 / t.plan_qty
+
+    value = lp.solve(objective) if objective else 0.0
+    return (value + done) / len(tasks)
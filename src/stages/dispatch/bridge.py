@@ -1,28 +1,21 @@
 """Gym DispatchEnv ↔ kernel SimState 동기화."""
 from __future__ import annotations
 
-import config
 from src.simulation.domain.problem import ProblemInstance
 from src.simulation.domain.state import SimState
 from src.simulation.kernel.simulator import Simulator
 
 
 class DispatchBridge:
-    """RL 모델 추론 시 env._state 직접 접근을 캡슐화."""
+    """RL 모델 추론 시 env 상태 연결(attach_state)·이동 반영(record_move)을 캡슐화."""
 
     def __init__(self, problem: ProblemInstance):
-        from envs.dispatch_env import DispatchEnv
-        self._env = DispatchEnv(
-            problem,
-            max_tasks=config.MAX_TASKS,
-            max_models=config.MAX_MODELS,
-            dwell_obs=config.DWELL_OBS,
-        )
+        from envs.prepared import prepare_dispatch
+        self._env = prepare_dispatch(problem).make(with_target=False)
 
     def plan_moves(self, sim: Simulator, state: SimState, model) -> list:
         env = self._env
-        env._state = state
-        env._substeps = 0
+        env.attach_state(state)
         moves = []
         for _ in range(env.max_substeps):
             obs = env._obs()
@@ -32,8 +25,9 @@ class DispatchBridge:
             if action == 0:
                 break
             mv = env.move_list[action - 1]
-            if mv in set(sim.valid_moves(state)):
+            if sim.is_valid_move(state, mv):
                 sim.apply_move(state, mv)
+                env.record_move(mv)
                 moves.append(mv)
             else:
                 break
@@ -0,0 +1,369 @@
+"""분기한정(branch-and-bound) 정확해 — 벤치마크·스냅샷의 ground_truth 생성용.
+
+탐색 트리: 시간마다 '이번 시간에 도달 가능한 배치(이동 후 assign·switching·tool_used)'로 분기한다.
+같은 배치에 이르는 이동 순서들은 하나로 합친다 (시간 내 메모이제이션).
+
+가지치기:
+- 상한(admissible): model×batch 장비-시간 상한(같은 전환 영역에서 올 수 있는 대수·tool 여유·전환 손실)으로
+  task별 남은 생산 ≤ min(남은 계획, Σ UPH × 장비-시간, 자기+상류 WIP), 전체 증가분 ≤ model마다
+  장비-시간을 달성률 증가가 큰 batch부터 채운 값. 자식 정렬·가지치기에 쓴다.
+- 전개 직전에는 그 상태에서 출발하는 LP 완화 상한(bound.lp_bound)으로 한 번 더 거른다.
+- 지배(dominance): 같은 (hour, assign, switching)에서 produced·wip이 모두 크거나 같고 tool_used가
+  작거나 같은 상태를 이미 전개했다면 건너뛴다 — 가능한 이동·생산이 모두 그 상태 이하이다.
+
+루트의 첫 시간 분기는 작업자 프로세스에 나눠 풀고, incumbent(현재 최선값)는 공유 메모리로 주고받는다.
+"""
+from __future__ import annotations
+
+import math
+import multiprocessing as mp
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import numpy as np
+
+import config
+from src.simulation.domain.problem import Move, ProblemInstance
+from src.simulation.domain.state import SimState
+from src.simulation.kernel.simulator import Simulator
+from src.stages.dispatch.bound import lp_bound, lp_upper_bound
+from src.utils.json_io import load_problem, save_problem
+from src.utils.parallel import parallel_map
+
+_TOL = 1e-9
+
+
+@dataclass
+class ExactResult:
+    """plan_achievement는 찾은 최선, upper_bound는 증명된 상한 (optimal이면 같다)."""
+    plan_achievement: float
+    upper_bound: float
+    optimal: bool
+    plan: list[list[Move]] = field(default_factory=list)  # 시간별 이동
+    nodes: int = 0
+    seconds: float = 0.0
+
+    def to_ground_truth(self) -> dict:
+        return {
+            "plan_achievement": round(self.plan_achievement, 4),
+            "upper_bound": round(self.upper_bound, 4),
+            "optimal": self.optimal,
+            "source": "exact",
+        }
+
+
+def achievement(p: ProblemInstance, s: SimState) -> float:
+    """Simulator.metrics의 plan_achievement (반올림 전)."""
+    rates = [
+        min(s.produced[i] / t.plan_qty, 1.0) if t.plan_qty > 0 else 1.0
+        for i, t in enumerate(p.tasks)
+    ]
+    return sum(rates) / len(rates) if rates else 0.0
+
+
+def _config_key(s: SimState) -> tuple:
+    return (
+        tuple(sorted((k, v) for k, v in s.assign.items() if v)),
+        tuple(sorted((k, v) for k, v in s.switching.items() if v)),
+        tuple(sorted((k, v) for k, v in s.tool_used.items() if v)),
+    )
+
+
+class BranchAndBound:
+    """한 프로세스의 DFS — incumbent는 mp.Value('d')로 다른 작업자와 공유."""
+
+    def __init__(self, problem: ProblemInstance, deadline: float, epsilon: float, incumbent):
+        self.p = problem
+        self.sim = Simulator(problem)
+        self.idx = problem.index
+        self.deadline = deadline
+        self.epsilon = epsilon
+        self.incumbent = incumbent
+        self.nodes = 0
+        self.timed_out = False
+        self.open_bound = -math.inf  # 시간 초과·epsilon으로 전개하지 못한 노드의 상한 최대
+        self.best = -math.inf
+        self.best_plan: list[list[Move]] = []
+        idx = self.idx
+        n = idx.n_tasks
+        # task → batch one-hot (T, B), batch → 전환 가능 영역(같은 전환그룹, 없으면 자기 batch) one-hot (B, R)
+        self._task_batch = np.zeros((n, len(idx.batches)))
+        self._task_batch[np.arange(n), idx.task_batch_pos] = 1.0
+        regions = [idx.group_of_batch[b] or ("batch", b) for b in idx.batches]
+        region_pos = {r: i for i, r in enumerate(dict.fromkeys(regions))}
+        self._batch_region = np.zeros((len(idx.batches), len(region_pos)))
+        self._batch_region[np.arange(len(regions)), [region_pos[r] for r in regions]] = 1.0
+        plan = np.asarray([t.plan_qty for t in problem.tasks], dtype=np.float64)
+        self._counted = plan > 0                       # plan 0인 task는 항상 달성률 1
+        self._free = float(n - self._counted.sum())
+        self._plan = np.where(self._counted, plan, np.inf)
+        self._eqp = np.asarray([problem.eqp_qty.get(m, 0) for m in idx.models], dtype=np.float64)
+        self._upstream = np.zeros((n, n))              # [t, u] = u가 t의 상류 공정
+        for ti in range(n):
+            nxt = idx.next_task[ti]
+            while nxt is not None:
+                self._upstream[nxt, ti] = 1.0
+                nxt = idx.next_task[nxt]
+        self._tool_keys = sorted({(b, m) for b in idx.batches for m in idx.models})
+        self._seen: dict[tuple, list[np.ndarray]] = {}
+
+    # ── 상한·지배 ────────────────────────────────────────
+    def unit_hours(self, s: SimState) -> np.ndarray:
+        """(M, B) 남은 시간 동안 model m이 batch b에서 생산할 수 있는 장비-시간 상한.
+
+        지금 b에 있는 장비: 남은 시간 전부 − 칸마다 갚아야 할 전환 잔여.
+        그 밖에서 올 수 있는 장비: 같은 전환 영역에 있고 tool 여유(cap − 현재 대수) 이내,
+        각각 전환 시간만큼 손해 — 도중에 나갔다 들어오는 교대는 이보다 적게 일한다.
+        """
+        p, idx = self.p, self.idx
+        hours_left = p.horizon_hours - s.hour
+        n_m = len(idx.models)
+        assign = np.zeros((n_m, idx.n_tasks))
+        lost = np.zeros((n_m, idx.n_tasks))
+        for (m, ti), v in s.assign.items():
+            assign[idx.model_pos[m], ti] = v
+        for (m, ti), v in s.switching.items():
+            lost[idx.model_pos[m], ti] = v
+        lost = np.minimum(lost, assign * hours_left)
+        here = assign @ self._task_batch                                    # (M, B)
+        reach = (here @ self._batch_region) @ self._batch_region.T          # (M, B) 영역 내 전체 대수
+        newcomers = np.clip(np.minimum(reach - here, idx.tool_cap_bm.T - here), 0, None)
+        stay = np.clip(here * hours_left - lost @ self._task_batch, 0, None)
+        return stay + newcomers * max(0, hours_left - p.switch_time_hours)
+
+    def upper_bound(self, s: SimState) -> float:
+        """min(task별 완화, 장비-시간 완화) — 둘 다 unit_hours(도달 가능·tool·전환 손실 반영) 기준.
+
+        task별: 남은 생산 ≤ min(남은 계획, Σ_m UPH × 그 batch 장비-시간, 자기+상류 WIP).
+        장비-시간: model마다 남은 장비-시간을 batch별 상한 안에서 달성률 증가가 큰 batch부터 채운다.
+        """
+        p, idx = self.p, self.idx
+        n = idx.n_tasks
+        if not n:
+            return 0.0
+        hours_left = p.horizon_hours - s.hour
+        uh = self.unit_hours(s)
+        rate = (idx.uph * uh[:, idx.task_batch_pos]).sum(axis=0)             # (T,) 남은 기간 생산 상한
+        produced = np.fromiter((s.produced[ti] for ti in range(n)), np.float64, n)
+        wip = np.fromiter((s.wip[ti] for ti in range(n)), np.float64, n)
+        extra = np.minimum(rate, wip + self._upstream @ wip)
+        plan = self._plan
+        now = np.minimum(produced / plan, 1.0)
+        task_gain = float((np.minimum((produced + extra) / plan, 1.0) - now).sum())
+        open_ = (extra > 0) & (now < 1.0) & self._counted
+        ratio = np.where(open_, idx.uph / plan, 0.0)                            # (M, T) 장비-시간당 달성률 증가
+        best = (ratio[:, :, None] * self._task_batch[None, :, :]).max(axis=1)  # (M, B)
+        lost = np.zeros(len(idx.models))
+        for (m, ti), v in s.switching.items():
+            lost[idx.model_pos[m]] += min(v, s.assign.get((m, ti), 0) * hours_left)
+        left = np.clip(self._eqp * hours_left - lost, 0, None)
+        order = np.argsort(-best, axis=1, kind="stable")
+        gain = np.take_along_axis(best, order, axis=1)
+        cap = np.take_along_axis(uh, order, axis=1)
+        filled = np.minimum(np.cumsum(cap, axis=1), left[:, None])
+        used = np.diff(filled, axis=1, prepend=0.0)
+        unit_gain = float((used * gain).sum())
+        base = float(now[self._counted].sum()) + self._free
+        return (base + min(task_gain, unit_gain)) / n
+
+    def dominated(self, s: SimState) -> bool:
+        """같은 키에서 이미 전개한 상태가 s를 지배하면 True, 아니면 s를 기록하고 False."""
+        n = self.idx.n_tasks
+        key = (s.hour, _config_key(s)[:2])
+        vec = np.asarray(
+            [s.produced[ti] for ti in range(n)] + [s.wip[ti] for ti in range(n)]
+            + [-s.tool_used.get(k, 0) for k in self._tool_keys],
+            dtype=np.int64,
+        )
+        seen = self._seen.setdefault(key, [])
+        if any(np.all(v >= vec) for v in seen):
+            return True
+        seen.append(vec)
+        return False
+
+    # ── 분기 ─────────────────────────────────────────────
+    def expired(self) -> bool:
+        if not self.timed_out and time.time() >= self.deadline:
+            self.timed_out = True
+        return self.timed_out
+
+    def hour_configs(self, s: SimState) -> list[tuple[list[Move], SimState]]:
+        """이번 시간에 이동만으로 도달 가능한 서로 다른 배치 (이동 없음 포함)."""
+        sim = self.sim
+        out = [([], s.clone())]
+        seen = {_config_key(s)}
+        stack = [out[0]]
+        while stack and not self.expired():
+            moves, st = stack.pop()
+            for mv in sim.valid_moves(st):
+                child = st.clone()
+                sim.apply_move(child, mv)
+                key = _config_key(child)
+                if key in seen:
+                    continue
+                seen.add(key)
+                item = (moves + [mv], child)
+                out.append(item)
+                stack.append(item)
+        return out
+
+    def children(self, s: SimState) -> list[tuple[float, list[Move], SimState]]:
+        """(상한, 이동, 다음 시간 상태) — 상한 내림차순, 동률이면 이동이 적은 배치부터."""
+        out = []
+        for moves, st in self.hour_configs(s):
+            self.sim.advance_hour(st)
+            out.append((self.upper_bound(st), moves, st))
+        out.sort(key=lambda c: (-c[0], len(c[1])))
+        return out
+
+    def _improve(self, value: float, plan: list[list[Move]]) -> None:
+        if value > self.best + _TOL:
+            self.best, self.best_plan = value, plan
+        with self.incumbent.get_lock():
+            if value > self.incumbent.value:
+                self.incumbent.value = value
+
+    def search(self, s: SimState, plan: list[list[Move]]) -> None:
+        """s(시간 시작 상태)부터 DFS. plan은 s까지 온 시간별 이동."""
+        self.nodes += 1
+        sim = self.sim
+        if self.expired():
+            self.open_bound = max(self.open_bound, self.upper_bound(s))
+            return
+        if not sim.is_done(s) and sim.is_quiescent(s):
+            hours = self.p.horizon_hours - s.hour
+            sim.fast_forward(s, hours)
+            plan = plan + [[] for _ in range(hours)]
+        if sim.is_done(s):
+            self._improve(achievement(self.p, s), plan)
+            return
+        if self.dominated(s):
+            return
+        # 전개(배치 열거) 전에 LP 상한으로 한 번 더 — 공정 간 WIP 흐름·장비 공유까지 반영한다
+        lp = lp_bound(self.p, s)
+        if lp <= self.incumbent.value + _TOL:
+            return
+        if lp <= self.incumbent.value + self.epsilon:
+            self.open_bound = max(self.open_bound, lp)
+            return
+        kids = self.children(s)
+        if self.timed_out:  # 배치 열거가 중간에 끊김 — s의 상한이 하위 전체를 덮는다
+            self.open_bound = max(self.open_bound, min(self.upper_bound(s), lp))
+            return
+        for i, (ub, moves, child) in enumerate(kids):
+            if self.expired():
+                self.open_bound = max(self.open_bound, max(k[0] for k in kids[i:]))
+                return
+            if ub <= self.incumbent.value + _TOL:
+                break  # 내림차순이므로 나머지도 전부 가지치기
+            if ub <= self.incumbent.value + self.epsilon:
+                self.open_bound = max(self.open_bound, ub)
+                continue
+            self.search(child, plan + [moves])
+
+
+# ── 병렬 부분트리 ───────────────────────────────────────
+_WORKER: tuple | None = None
+
+
+def _init_worker(problem: ProblemInstance, deadline: float, epsilon: float, incumbent) -> None:
+    global _WORKER
+    _WORKER = (problem, deadline, epsilon, incumbent)
+
+
+def _solve_subtree(job: tuple[list[Move], SimState]) -> tuple[float, list[list[Move]], float, int]:
+    moves, child = job
+    problem, deadline, epsilon, incumbent = _WORKER
+    bb = BranchAndBound(problem, deadline, epsilon, incumbent)
+    if bb.upper_bound(child) > incumbent.value + _TOL:
+        bb.search(child, [moves])
+    return bb.best, bb.best_plan, bb.open_bound, bb.nodes
+
+
+def _incumbent(problem: ProblemInstance) -> tuple[float, list[list[Move]]]:
+    """초기 incumbent — config.EXACT_INCUMBENT_POLICIES 중 최선 계획."""
+    from src.stages.dispatch.use_case import run_dispatch
+
+    best, plan = -math.inf, []
+    for name in config.EXACT_INCUMBENT_POLICIES:
+        run = run_dispatch(problem, policy=name)
+        value = achievement(problem, run.final_state)
+        if value > best + _TOL:
+            best, plan = value, [list(step.moves) for step in run.trace]
+    return best, plan
+
+
+def solve_exact(
+    problem: ProblemInstance,
+    time_limit: float | None = None,
+    epsilon: float | None = None,
+    workers: int | None = None,
+) -> ExactResult:
+    """최대 plan_achievement 계획 탐색.
+
+    time_limit(초) 안에 끝나면 optimal=True. epsilon>0이면 상한이 incumbent+epsilon 이하인
+    가지를 버리는 bounded-suboptimal 탐색 — 결과는 최적해와 epsilon 이내.
+    """
+    time_limit = config.EXACT_TIME_LIMIT_S if time_limit is None else time_limit
+    epsilon = config.EXACT_EPSILON if epsilon is None else epsilon
+    t0 = time.time()
+    deadline = t0 + time_limit
+    best, best_plan = _incumbent(problem)
+    incumbent = mp.Value("d", best)
+    root = BranchAndBound(problem, deadline, epsilon, incumbent)
+    s = root.sim.reset()
+    results = []
+    if root.sim.is_quiescent(s):
+        root.search(s, [])
+    else:
+        root.nodes = 1
+        jobs = []
+        for _ub, moves, child in root.children(s):
+            child._moves = None
+            jobs.append((moves, child))
+        if root.timed_out:
+            root.open_bound = root.upper_bound(s)
+        else:
+            results = parallel_map(
+                _solve_subtree, jobs, workers=workers,
+                initializer=_init_worker, initargs=(problem, deadline, epsilon, incumbent),
+            )
+    open_bound, nodes = root.open_bound, root.nodes
+    if root.best > best + _TOL:
+        best, best_plan = root.best, root.best_plan
+    for value, plan, sub_open, sub_nodes in results:
+        nodes += sub_nodes
+        open_bound = max(open_bound, sub_open)
+        if value > best + _TOL:
+            best, best_plan = value, plan
+    # 시간 초과로 남은 가지의 상한은 문제 전체 LP 상한으로 자른다 (4자리 올림 — 그 자리까지 최적이면 증명)
+    upper = max(best, min(open_bound, lp_upper_bound(problem)))
+    return ExactResult(
+        plan_achievement=best,
+        upper_bound=upper,
+        optimal=open_bound <= best + _TOL or upper <= math.ceil(best * 1e4 - 1e-6) / 1e4,
+        plan=best_plan,
+        nodes=nodes,
+        seconds=round(time.time() - t0, 3),
+    )
+
+
+def write_ground_truth(
+    path: str | Path,
+    time_limit: float | None = None,
+    epsilon: float | None = None,
+    workers: int | None = None,
+    overwrite: bool = False,
+) -> ExactResult | None:
+    """JSON의 ground_truth를 정확해로 채워 save_problem으로 다시 쓴다.
+
+    이미 plan_achievement가 있으면 overwrite=True일 때만 덮어쓴다 (note 등 기존 키는 유지).
+    """
+    problem = load_problem(path)
+    if "plan_achievement" in problem.ground_truth and not overwrite:
+        return None
+    result = solve_exact(problem, time_limit=time_limit, epsilon=epsilon, workers=workers)
+    problem.ground_truth = {**problem.ground_truth, **result.to_ground_truth()}
+    save_problem(problem, path)
+    return result
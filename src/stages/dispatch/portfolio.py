@@ -0,0 +1,101 @@
+"""Stage 2 — 포트폴리오 디스패치: 등록 정책 전부를 같은 문제·가이드로 동시에 돌려 최선 계획 채택.
+
+등록 정책은 프로세스 풀에서, RL(모델 객체라 pickle 비용이 큼)은 그동안 부모 프로세스에서 실행한다
+— 벽시계 시간은 합이 아니라 가장 느린 정책 하나.
+순위: 계획달성률 내림차순 → 전환 수 오름차순 → 정책 이름.
+"""
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+
+import config
+from src.contracts.simulation import SimulationRun
+from src.simulation.domain.allocation import GuideAllocation
+from src.simulation.domain.problem import ProblemInstance
+from src.stages.dispatch.use_case import run_dispatch
+from src.utils.parallel import resolve_workers, shutdown_shared_pools
+from agents.registry import list_dispatch
+
+
+@dataclass(frozen=True)
+class PortfolioResult:
+    winner: str
+    runs: dict[str, SimulationRun] = field(default_factory=dict)
+
+    @property
+    def best(self) -> SimulationRun:
+        return self.runs[self.winner]
+
+    def scores(self) -> dict[str, dict]:
+        return {
+            name: {"plan_achievement": run.plan_achievement, "conversions": conversions(run)}
+            for name, run in self.runs.items()
+        }
+
+
+def conversions(run: SimulationRun) -> int:
+    return sum(len(step.moves) for step in run.trace)
+
+
+def _rank(name: str, run: SimulationRun) -> tuple:
+    return (-run.plan_achievement, conversions(run), name)
+
+
+_JOB: dict = {}
+
+
+def _init_worker(problem: ProblemInstance, guide: GuideAllocation | None, kernel: str) -> None:
+    import agents  # noqa: F401 — register
+
+    # 포트폴리오 작업자 안에서 beam/mcts가 다시 풀을 띄우지 않게 — 자식 프로세스에선 atexit
+    # 정리가 돌지 않아, 손자 프로세스가 남으면 작업자가 끝나지 못하고 풀 종료가 멈춘다.
+    config.BEAM_WORKERS = 1
+    config.MCTS_WORKERS = 1
+    _JOB.update(problem=problem, guide=guide, kernel=kernel)
+
+
+def _run_remote(name: str) -> SimulationRun:
+    try:
+        return run_dispatch(_JOB["problem"], _JOB["guide"], policy=name, kernel=_JOB["kernel"])
+    finally:
+        shutdown_shared_pools(wait=True)
+
+
+def run_portfolio(
+    problem: ProblemInstance,
+    guide: GuideAllocation | None = None,
+    model=None,
+    policies: list[str] | None = None,
+    kernel: str = "unit",
+    workers: int | None = None,
+) -> PortfolioResult:
+    """policies(기본 config.PORTFOLIO_POLICIES, 비면 list_dispatch()) + model이 맞으면 "rl"."""
+    import agents  # noqa: F401 — register
+
+    names = list(policies or config.PORTFOLIO_POLICIES or list_dispatch())
+    rl_fn = None
+    if model is not None:
+        from agents.model_store import dispatch_model_matches
+        from agents.rl_dispatch import rl_dispatch_factory
+
+        if dispatch_model_matches(model, problem):
+            rl_fn = rl_dispatch_factory(model, problem)
+    runs: dict[str, SimulationRun] = {}
+    n_workers = min(resolve_workers(workers or config.PORTFOLIO_WORKERS), len(names))
+    if n_workers <= 1:
+        for name in names:
+            runs[name] = run_dispatch(problem, guide, policy=name, kernel=kernel)
+        if rl_fn is not None:
+            runs["rl"] = run_dispatch(problem, guide, policy=rl_fn, policy_name="rl", kernel=kernel)
+    else:
+        with ProcessPoolExecutor(
+            max_workers=n_workers, initializer=_init_worker, initargs=(problem, guide, kernel),
+        ) as pool:
+            futures = {name: pool.submit(_run_remote, name) for name in names}
+            if rl_fn is not None:
+                runs["rl"] = run_dispatch(problem, guide, policy=rl_fn, policy_name="rl", kernel=kernel)
+            for name, fut in futures.items():
+                runs[name] = fut.result()
+    winner = min(runs, key=lambda n: _rank(n, runs[n]))
+    return PortfolioResult(winner=winner, runs=runs)
@@ -1,10 +1,17 @@
 """Stage 2 — 디스패치 실행."""
 from __future__ import annotations
 
+from typing import Callable
+
 from src.contracts.simulation import SimulationRun
 from src.simulation.domain.allocation import GuideAllocation
-from src.simulation.domain.problem import ProblemInstance
+from src.simulation.domain.decompose import Component
+from src.simulation.domain.problem import Move, ProblemInstance
+from src.simulation.domain.state import SimState
+from src.simulation.kernel.events import EventSimulator
 from src.simulation.kernel.simulator import Simulator
+from src.simulation.kernel.units import UnitSimulator
+from src.utils.parallel import parallel_map
 from agents.protocol import PolicyFn
 from agents.registry import get_dispatch
 from agents.runner import run_policy
@@ -15,13 +22,104 @@ def run_dispatch(
     guide: GuideAllocation | None = None,
     policy: str | PolicyFn = "heuristic",
     policy_name: str | None = None,
+    kernel: str = "hour",
+    decompose: bool = False,
+    workers: int | None = None,
+    policy_factory: Callable[[ProblemInstance], PolicyFn] | None = None,
 ) -> SimulationRun:
-    """가이드(선택)를 참고하며 horizon까지 시뮬레이션."""
-    sim = Simulator(problem)
-    if callable(policy):
+    """가이드(선택)를 참고하며 horizon까지 시뮬레이션.
+
+    kernel="event"면 분 단위 전환·연속 생산 이벤트 커널(EventSimulator),
+    kernel="unit"이면 호기 위치·전환을 함께 기록하는 UnitSimulator를 쓴다.
+    decompose=True면 독립 부분문제(ProblemInstance.decompose)를 작업자 프로세스에서
+    나눠 풀고 하나의 SimulationRun으로 합친다. 문제에 묶인 정책(RL 등)은 부분문제의 지역
+    task 인덱스를 모르므로 callable policy 대신 policy_factory(problem → PolicyFn)를 넘긴다
+    — 부분문제마다 만들어 순차 실행한다.
+    """
+    kernels = {"hour": Simulator, "event": EventSimulator, "unit": UnitSimulator}
+    if kernel not in kernels:
+        raise ValueError(f"unknown kernel: {kernel}")
+    if decompose:
+        comps = problem.decompose()
+        if len(comps) > 1:
+            if callable(policy) and policy_factory is None:
+                raise ValueError("decompose=True needs a registered policy name or policy_factory, not a callable")
+            return _run_decomposed(problem, comps, policy, policy_name, kernel, workers, policy_factory)
+    sim = kernels[kernel](problem)
+    if policy_factory is not None:
+        policy_fn = policy_factory(problem)
+        name = policy_name or "custom"
+    elif callable(policy):
         policy_fn = policy
         name = policy_name or "custom"
     else:
         policy_fn = get_dispatch(policy)
         name = policy
     return run_policy(sim, policy_fn, policy_name=name)
+
+
+def _dispatch_component(args: tuple) -> SimulationRun:
+    problem, policy, policy_name, kernel, policy_factory = args
+    return run_dispatch(
+        problem, policy=policy, policy_name=policy_name, kernel=kernel, policy_factory=policy_factory,
+    )
+
+
+def _run_decomposed(
+    problem: ProblemInstance,
+    comps: list[Component],
+    policy: str | PolicyFn,
+    policy_name: str | None,
+    kernel: str,
+    workers: int | None,
+    policy_factory: Callable[[ProblemInstance], PolicyFn] | None = None,
+) -> SimulationRun:
+    jobs = [(c.problem, policy, policy_name, kernel, policy_factory) for c in comps]
+    runs = parallel_map(_dispatch_component, jobs, workers=1 if policy_factory is not None else workers)
+    return merge_runs(problem, comps, runs)
+
+
+def merge_runs(problem: ProblemInstance, comps: list[Component], runs: list[SimulationRun]) -> SimulationRun:
+    """부분문제 실행 결과를 전역 task 인덱스로 되돌려 하나의 SimulationRun으로 병합.
+
+    호기 단위 기록(unit_positions)은 부분문제마다 가상 호기 번호가 겹치므로 병합하지 않는다
+    — 행 빌더가 병합된 trace로 재생한다.
+    """
+    total_eqp = sum(problem.eqp_qty.values()) or 1
+    trace: list = []
+    hourly_stats: list[dict] = []
+    for h in range(problem.horizon_hours):
+        moves: list[Move] = []
+        snapshot: dict[tuple[str, int], int] = {}
+        hourly: dict[int, int] = {}
+        cumulative: dict[int, int] = {}
+        active = 0
+        for comp, run in zip(comps, runs):
+            g = comp.tasks
+            step, stat = run.trace[h], run.hourly_stats[h]
+            moves.extend(Move(mv.model, g[mv.from_index], g[mv.to_index]) for mv in step.moves)
+            snapshot.update({(m, g[ti]): c for (m, ti), c in step.assign_snapshot.items()})
+            hourly.update({g[ti]: q for ti, q in stat.hourly_produce.items()})
+            cumulative.update({g[ti]: q for ti, q in stat.cumulative_produced.items()})
+            active += stat.active_eqp
+        hourly_stats.append({
+            "hour": h,
+            "hourly_produce": dict(sorted(hourly.items())),
+            "cumulative_produced": dict(sorted(cumulative.items())),
+            "util_rate": round(active / total_eqp, 4),
+            "assign_snapshot": snapshot,
+            "active_eqp": active,
+        })
+        trace.append((h, moves, snapshot))
+    final = SimState(problem.horizon_hours, {}, {}, {}, {}, {})
+    for comp, run in zip(comps, runs):
+        g, s = comp.tasks, run.final_state
+        final.produced.update({g[ti]: v for ti, v in s.produced.items()})
+        final.wip.update({g[ti]: v for ti, v in s.wip.items()})
+        final.assign.update({(m, g[ti]): v for (m, ti), v in s.assign.items()})
+        final.switching.update({(m, g[ti]): v for (m, ti), v in s.switching.items()})
+        final.tool_used.update(s.tool_used)
+    final.produced = dict(sorted(final.produced.items()))
+    final.wip = dict(sorted(final.wip.items()))
+    metrics = Simulator(problem).metrics(final)
+    return SimulationRun.from_legacy(final, trace, hourly_stats, metrics, policy_name=runs[0].policy_name)
@@ -0,0 +1,118 @@
+"""Stage 2 — what-if 분기: 한 시점 상태에서 정책·수동 이동 조합별로 horizon까지 병렬 실행."""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+
+from src.simulation.domain.problem import Move, ProblemInstance
+from src.simulation.domain.state import SimState
+from src.simulation.kernel.simulator import Simulator
+from src.utils.parallel import parallel_map, resolve_workers
+from agents.protocol import PolicyFn
+
+
+@dataclass(frozen=True)
+class Branch:
+    policy: str | None = None     # 등록 정책 이름 또는 "rl" (None이면 수동 이동만)
+    moves: tuple[Move, ...] = ()  # 분기 시각에 먼저 적용할 이동
+    label: str = ""
+
+
+@dataclass
+class BranchResult:
+    branch: Branch
+    state: SimState                                           # horizon 도달 상태
+    snapshots: list[SimState] = field(default_factory=list)  # 분기 이후 advance마다의 스냅샷
+    conversions: int = 0                                      # 분기 이후 적용한 이동 수
+    metrics: dict = field(default_factory=dict)
+    policy_available: bool = True                             # rl 모델이 없으면 False
+
+
+def policy_fn_for(name: str | None, problem: ProblemInstance) -> PolicyFn | None:
+    """정책 이름 → PolicyFn ("rl"은 저장 모델이 없으면 None)."""
+    if name is None or name == "manual":
+        return None
+    if name == "rl":
+        from agents.model_store import load_dispatch_model
+        from agents.rl_dispatch import rl_dispatch_factory
+
+        model = load_dispatch_model()
+        return rl_dispatch_factory(model, problem) if model is not None else None
+    import agents  # noqa: F401 — register
+    from agents.registry import get_dispatch
+
+    return get_dispatch(name)
+
+
+def policy_fns_for(names, problem: ProblemInstance) -> dict[str | None, PolicyFn | None]:
+    """서로 다른 정책 이름마다 PolicyFn을 한 번씩 — 분기마다 rl 모델을 다시 읽지 않는다."""
+    return {name: policy_fn_for(name, problem) for name in dict.fromkeys(names)}
+
+
+def check_moves(sim: Simulator, s: SimState, moves: tuple[Move, ...]) -> int | None:
+    """순서대로 적용 가능한지 검사 — 처음 막히는 이동의 위치 (모두 가능하면 None). s는 그대로."""
+    trial = s.clone()
+    for i, mv in enumerate(moves):
+        if not sim.is_valid_move(trial, mv):
+            return i
+        sim.apply_move(trial, mv)
+    return None
+
+
+def run_branch(
+    problem: ProblemInstance,
+    state: SimState,
+    branch: Branch,
+    policies: dict[str | None, PolicyFn | None] | None = None,
+) -> BranchResult:
+    """policies(정책 이름 → PolicyFn 캐시)를 넘기면 없는 이름만 만들어 채운다."""
+    sim = Simulator(problem)
+    s = state.clone()
+    n_moves = 0
+    for mv in branch.moves:
+        sim.apply_move(s, mv)
+        n_moves += 1
+    if policies is None:
+        policy_fn = policy_fn_for(branch.policy, problem)
+    else:
+        if branch.policy not in policies:
+            policies[branch.policy] = policy_fn_for(branch.policy, problem)
+        policy_fn = policies[branch.policy]
+    snapshots: list[SimState] = []
+    while not sim.is_done(s):
+        if policy_fn is not None:
+            n_moves += len(policy_fn(sim, s) or [])
+        sim.advance_hour(s)
+        snapshots.append(s.clone())
+    return BranchResult(
+        branch=branch, state=s, snapshots=snapshots, conversions=n_moves,
+        metrics=sim.metrics(s),
+        policy_available=policy_fn is not None or branch.policy in (None, "manual"),
+    )
+
+
+_JOB: dict = {}
+
+
+def _init_worker(problem: ProblemInstance, state: SimState) -> None:
+    _JOB.update(problem=problem, state=state, policies={})
+
+
+def _run_remote(branch: Branch) -> BranchResult:
+    return run_branch(_JOB["problem"], _JOB["state"], branch, _JOB["policies"])
+
+
+def run_branches(
+    problem: ProblemInstance,
+    state: SimState,
+    branches: list[Branch],
+    workers: int | None = None,
+) -> list[BranchResult]:
+    """분기별 결과 (입력 순서). 문제·분기 시점 상태는 작업자마다 한 번만 넘긴다.
+
+    작업자 수는 분기 수와 config.SIM_WORKERS(0이면 CPU 수)를 넘지 않는다 — 요청이 더 달라고 해도.
+    정책은 작업자마다 이름별로 한 번만 만든다.
+    """
+    workers = min(len(branches), resolve_workers(workers), resolve_workers())
+    return parallel_map(
+        _run_remote, branches, workers=workers, initializer=_init_worker, initargs=(problem, state),
+    )
@@ -0,0 +1,185 @@
+"""Monte Carlo 강건성 평가 — UPH 노이즈·장비 고장·WIP 지터 하에서 계획 재생."""
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass, field
+from typing import Any, Sequence
+
+import numpy as np
+
+import config
+from src.contracts.simulation import SimulationRun
+from src.simulation.domain.problem import Move, ProblemInstance
+from src.simulation.domain.state import SimState
+from src.simulation.kernel.simulator import Simulator
+from src.utils.parallel import parallel_map
+
+
+@dataclass(frozen=True)
+class Perturbation:
+    """레플리카별 확률 교란 파라미터."""
+    uph_cv: float = 0.05        # (모델, task)별 UPH 배율 변동계수 (lognormal, 평균 1)
+    outage_rate: float = 0.01   # 배정 장비 1대·1시간당 고장 확률
+    mttr_hours: float = 2.0     # 평균 수리 시간 (지수분포, 올림)
+    wip_cv: float = 0.10        # 초기 WIP 배율 변동계수
+
+
+@dataclass(frozen=True)
+class RobustnessSummary:
+    """정책 1개의 레플리카 분포 요약."""
+    policy: str
+    replicas: int
+    nominal: float
+    plan_achievement: dict[str, float] = field(default_factory=dict)
+    utilization: dict[str, float] = field(default_factory=dict)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "policy": self.policy,
+            "replicas": self.replicas,
+            "nominal": self.nominal,
+            "plan_achievement": dict(self.plan_achievement),
+            "utilization": dict(self.utilization),
+        }
+
+
+class PerturbedSimulator(Simulator):
+    """결정론 커널 + 레플리카 교란 (UPH 배율, 시간별 고장 대수, 초기 WIP)."""
+
+    def __init__(self, problem: ProblemInstance, uph_scale: np.ndarray,
+                 down: dict[tuple[int, str, int], int], init_wip: Sequence[int]):
+        super().__init__(problem)
+        self.uph_scale = uph_scale
+        self.down = down
+        self.init_wip = list(init_wip)
+
+    def reset(self) -> SimState:
+        s = super().reset()
+        for ti, w in enumerate(self.init_wip):
+            s.wip[ti] = w
+        return s
+
+    def available(self, s: SimState, model: str, ti: int) -> int:
+        key = (model, ti)
+        return (s.assign.get(key, 0) - s.switching.get(key, 0)
+                - self.down.get((s.hour, model, ti), 0))
+
+    def task_capacity(self, s: SimState, task_index: int) -> float:
+        cap = 0.0
+        model_pos = self.idx.model_pos
+        for model, uph in self.idx.task_models[task_index]:
+            active = self.available(s, model, task_index)
+            if active > 0:
+                cap += active * uph * self.uph_scale[model_pos[model], task_index]
+        return cap
+
+    def active_units(self, s: SimState) -> int:
+        return sum(
+            max(0, self.available(s, m, ti))
+            for ti, task_models in enumerate(self.idx.task_models)
+            if s.wip[ti] > 0
+            for m, _uph in task_models
+        )
+
+
+def _lognormal(rng: np.random.Generator, cv: float, size) -> np.ndarray:
+    if cv <= 0:
+        return np.ones(size)
+    sigma = math.sqrt(math.log1p(cv * cv))
+    return rng.lognormal(-0.5 * sigma * sigma, sigma, size)
+
+
+def sample_replica(
+    problem: ProblemInstance,
+    snapshots: Sequence[dict[tuple[str, int], int]],
+    pert: Perturbation,
+    rng: np.random.Generator,
+) -> PerturbedSimulator:
+    """교란 1세트 샘플. 고장은 계획 스냅샷의 배정 장비에서 발생한다."""
+    idx = problem.index
+    uph_scale = _lognormal(rng, pert.uph_cv, idx.uph.shape)
+    wip_scale = _lognormal(rng, pert.wip_cv, len(problem.tasks))
+    init_wip = [int(round(t.init_wip * f)) for t, f in zip(problem.tasks, wip_scale)]
+    down: dict[tuple[int, str, int], int] = {}
+    if pert.outage_rate > 0:
+        for h, snap in enumerate(snapshots):
+            for (m, ti), cnt in snap.items():
+                n_fail = int(rng.binomial(cnt, pert.outage_rate)) if cnt > 0 else 0
+                for _ in range(n_fail):
+                    dur = max(1, math.ceil(rng.exponential(pert.mttr_hours)))
+                    for hh in range(h, min(h + dur, problem.horizon_hours)):
+                        down[(hh, m, ti)] = down.get((hh, m, ti), 0) + 1
+    return PerturbedSimulator(problem, uph_scale, down, init_wip)
+
+
+def replay_plan(sim: PerturbedSimulator, plan: Sequence[Sequence[Move]]) -> tuple[float, float]:
+    """시간별 이동 계획 재생 → (계획달성률, 평균 가동률). 무효 이동은 건너뛴다."""
+    p = sim.p
+    s = sim.reset()
+    total_eqp = sum(p.eqp_qty.values()) or 1
+    util = 0.0
+    for h in range(p.horizon_hours):
+        for mv in plan[h] if h < len(plan) else ():
+            if sim.is_valid_move(s, mv):
+                sim.apply_move(s, mv)
+        util += sim.active_units(s) / total_eqp
+        sim.advance_hour(s)
+    rates = [
+        min(s.produced[i] / t.plan_qty, 1.0) if t.plan_qty > 0 else 1.0
+        for i, t in enumerate(p.tasks)
+    ]
+    return (sum(rates) / len(rates) if rates else 0.0,
+            util / p.horizon_hours if p.horizon_hours else 0.0)
+
+
+# ── 작업자 (initializer로 문제/계획 1회 전달) ────────────────
+_WORKER: dict[str, Any] = {}
+
+
+def _init_worker(problem: ProblemInstance, plan, snapshots, pert: Perturbation, seed: int) -> None:
+    _WORKER.update(problem=problem, plan=plan, snapshots=snapshots, pert=pert, seed=seed)
+
+
+def _run_replica(replica: int) -> tuple[float, float]:
+    w = _WORKER
+    rng = np.random.default_rng([w["seed"], replica])
+    sim = sample_replica(w["problem"], w["snapshots"], w["pert"], rng)
+    return replay_plan(sim, w["plan"])
+
+
+def _quantiles(values: np.ndarray) -> dict[str, float]:
+    p10, p50, p90 = np.percentile(values, [10, 50, 90])
+    return {
+        "p10": round(float(p10), 4), "p50": round(float(p50), 4),
+        "p90": round(float(p90), 4), "mean": round(float(values.mean()), 4),
+    }
+
+
+def monte_carlo(
+    problem: ProblemInstance,
+    run: SimulationRun,
+    n_replicas: int | None = None,
+    perturbation: Perturbation | None = None,
+    seed: int = 0,
+    workers: int | None = None,
+) -> RobustnessSummary:
+    """결정론 실행(run)의 이동 계획을 교란된 레플리카마다 재생해 분포를 요약.
+
+    레플리카 r의 난수는 (seed, r)로 고정되어 작업자 수와 무관하게 재현된다.
+    """
+    n = n_replicas if n_replicas is not None else config.MC_REPLICAS
+    pert = perturbation or Perturbation()
+    plan = [list(step.moves) for step in run.trace]
+    snapshots = [dict(step.assign_snapshot) for step in run.trace]
+    results = parallel_map(
+        _run_replica, range(n), workers=workers,
+        initializer=_init_worker, initargs=(problem, plan, snapshots, pert, seed),
+    )
+    arr = np.asarray(results, dtype=np.float64).reshape(-1, 2)
+    return RobustnessSummary(
+        policy=run.policy_name,
+        replicas=n,
+        nominal=run.plan_achievement,
+        plan_achievement=_quantiles(arr[:, 0]) if n else {},
+        utilization=_quantiles(arr[:, 1]) if n else {},
+    )
@@ -2,38 +2,23 @@
 from __future__ import annotations
 
 import logging
-import random
+from functools import partial
 from pathlib import Path
 
 import numpy as np
 import stable_baselines3 as sb3
 import torch
-from stable_baselines3.common.vec_env import DummyVecEnv
 
 import config
 from src.simulation.domain.problem import ProblemInstance
 from src.training.callbacks import ConvergenceLogger
 from src.training.log_io import append_training_point, reset_training_log
+from src.training.vec_env import make_vec_env
 from envs.allocation_env import AllocationEnv
 
 log = logging.getLogger(__name__)
 
 
-def _analytic_target_logits(env: AllocationEnv) -> np.ndarray:
-    p = env.p
-    analytic = p.plan_target_allocation()
-    logits = np.full((env.mm * env.mt,), -3.0, dtype=np.float32)
-    eps = 1e-6
-    for mi, model in enumerate(env.models):
-        eqp = max(1.0, float(p.eqp_qty[model]))
-        for ti in range(env.n_tasks):
-            if p.uph_of(model, ti) is None:
-                continue
-            frac = analytic.get((model, ti), 0.0) / eqp
-            logits[mi * env.mt + ti] = float(np.clip(np.log(frac + eps) + 3.0, -3.0, 3.0))
-    return logits
-
-
 def behavior_clone_alloc(model, problems, epochs: int, lr: float):
     if epochs <= 0 or not problems:
         return
@@ -42,7 +27,7 @@ def behavior_clone_alloc(model, problems, epochs: int, lr: float):
         env = AllocationEnv(p, max_tasks=config.MAX_TASKS, max_models=config.MAX_MODELS)
         obs, _ = env.reset()
         obs_list.append(obs)
-        tgt_list.append(_analytic_target_logits(env))
+        tgt_list.append(env.analytic_target_logits())
         mask = np.zeros((env.mm * env.mt,), dtype=np.float32)
         for mi, m in enumerate(env.models):
             for ti in range(env.n_tasks):
@@ -75,7 +60,8 @@ def behavior_clone_alloc(model, problems, epochs: int, lr: float):
 
 def train_alloc_model(problems: list[ProblemInstance], ppo_steps: int = 5000,
                       bc_epochs: int = config.BC_EPOCHS, lr: float = config.BC_LR,
-                      save_path: Path | None = None):
+                      save_path: Path | None = None, n_envs: int | None = None):
+    """n_envs 작업자가 문제 샤드에서 episode마다 문제를 다시 고른다 (기본 TRAIN_N_ENVS)."""
     if not problems:
         raise ValueError("Alloc 학습 문제가 없습니다.")
     save_path = Path(save_path) if save_path else (config.SAVED_MODELS_DIR / "ppo_alloc.zip")
@@ -91,20 +77,20 @@ def train_alloc_model(problems: list[ProblemInstance], ppo_steps: int = 5000,
             "Alloc 학습 가능한 문제가 없습니다. MAX_TASKS/MAX_MODELS를 확인하세요."
         )
 
-    def _vec_env():
-        return DummyVecEnv([lambda: AllocationEnv(random.choice(same), max_tasks=config.MAX_TASKS,
-                                                     max_models=config.MAX_MODELS)])
-
     reset_training_log("alloc")
     log.info("[alloc] PPO 학습 시작 — %s timesteps, %s problems", ppo_steps, len(same))
-    model = sb3.PPO("MlpPolicy", _vec_env(), verbose=1, n_steps=64, batch_size=32)
-    behavior_clone_alloc(model, same, bc_epochs, lr)
-    model.set_env(_vec_env())
-    model.learn(
-        total_timesteps=ppo_steps,
-        progress_bar=False,
-        callback=ConvergenceLogger("alloc"),
-    )
+    make_env = partial(AllocationEnv, max_tasks=config.MAX_TASKS, max_models=config.MAX_MODELS)
+    vec_env = make_vec_env(same, make_env, n_envs)
+    try:
+        model = sb3.PPO("MlpPolicy", vec_env, verbose=1, n_steps=64, batch_size=32)
+        behavior_clone_alloc(model, same, bc_epochs, lr)
+        model.learn(
+            total_timesteps=ppo_steps,
+            progress_bar=False,
+            callback=ConvergenceLogger("alloc"),
+        )
+    finally:
+        vec_env.close()
     log.info("[alloc] PPO 학습 완료 — 저장 %s", save_path)
     model.save(save_path)
     return model
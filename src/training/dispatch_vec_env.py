@@ -0,0 +1,290 @@
+"""DispatchEnv N개를 한 프로세스에서 lockstep으로 진행하는 VecEnv (BatchSimulator 기반).
+
+관측·마스크·보상은 DispatchEnv와 같은 정의를 (N, ...) 배열 연산으로 계산한다 —
+env별 Python 객체나 프로세스 간 통신이 없어 작은 MLP 정책의 rollout 비용이 줄어든다.
+슬롯 k는 문제 샤드 problems[k::N]에서 episode마다 문제를 다시 고른다 (시드 seed+k).
+"""
+from __future__ import annotations
+
+from typing import Callable, Sequence
+
+import numpy as np
+from gymnasium import spaces
+from stable_baselines3.common.vec_env.base_vec_env import VecEnv, VecEnvIndices
+
+from envs.sampling import shard_problems
+from src.simulation.domain.problem import ProblemInstance
+from src.simulation.kernel.batch import BatchSimulator
+
+
+class DispatchVecEnv(VecEnv):
+    # get_attr/set_attr/env_method는 슬롯 모두가 같은 값을 갖는 것만 — 슬롯별 상태는 (N, ...) 배열 안에 있다
+    _SHARED_ATTRS = frozenset({
+        "render_mode", "dwell_lambda", "alloc_lambda", "dwell_obs",
+        "guide_util_threshold", "guide_band_pct", "action_masks",
+    })
+    _SETTABLE_ATTRS = frozenset({"dwell_lambda", "guide_util_threshold", "guide_band_pct"})
+
+    def __init__(self, problems: Sequence[ProblemInstance], n_envs: int,
+                 max_tasks: int, max_models: int,
+                 dwell_lambda: float = 0.0, alloc_lambda: float = 0.0,
+                 target_allocation: Callable[[ProblemInstance], dict] | None = None,
+                 dwell_obs: bool = False,
+                 guide_util_threshold: float = 0.0, guide_band_pct: float = 0.0,
+                 seed: int = 0):
+        if not problems:
+            raise ValueError("DispatchVecEnv: problems가 비어 있습니다.")
+        n, mt, mm = max(1, int(n_envs)), max_tasks, max_models
+        self.mt, self.mm = mt, mm
+        self.dwell_lambda = dwell_lambda
+        self.alloc_lambda = alloc_lambda
+        self.dwell_obs = dwell_obs
+        self.guide_util_threshold = guide_util_threshold
+        self.guide_band_pct = guide_band_pct
+        self._target_fn = target_allocation
+        self._targets: dict[int, dict] = {}
+        self.shards = [shard_problems(list(problems), n, k) for k in range(n)]
+        self._rngs = [np.random.default_rng(seed + k) for k in range(n)]
+
+        # action 배치는 DispatchEnv.move_list와 동일 (model, from, to; from≠to), 0 = commit
+        mi, fi, ti = np.meshgrid(np.arange(mm), np.arange(mt), np.arange(mt), indexing="ij")
+        off = fi != ti
+        self._act_flat = (mi[off] * mt * mt + fi[off] * mt + ti[off]).astype(np.int64)
+        self._act_mi, self._act_fi, self._act_ti = mi[off], fi[off], ti[off]
+        n_actions = len(self._act_flat) + 1
+        obs_dim = mt * 2 + 2 * mm * mt + 1 + (mt if dwell_obs else 0)
+        self.render_mode = None
+        super().__init__(
+            n,
+            spaces.Box(low=0.0, high=1.0, shape=(obs_dim,), dtype=np.float32),
+            spaces.Discrete(n_actions),
+        )
+
+        # 슬롯별 정규화 상수 — 문제가 바뀔 때만 다시 채운다
+        self.bs = BatchSimulator([s[0] for s in self.shards], max_tasks=mt, max_models=mm)
+        self._plan_den = np.ones((n, mt))
+        self._max_wip = np.ones((n, 1))
+        self._assign_den = np.ones((n, mm, 1))
+        self._change_den = np.ones((n, mm, 1))
+        self._horizon = np.ones((n, 1))
+        self._total_plan = np.ones(n)
+        self._total_eqp = np.ones(n)
+        self._max_substeps = np.ones(n, dtype=np.int64)
+        self._has_prev = np.zeros((n, mt), dtype=bool)
+        self._prev_flat = np.zeros((n, mt), dtype=np.int64)  # 이전 task의 (N*T) 평탄 위치
+        self._target = np.zeros((n, mm, mt))
+        self._target_on = np.zeros((n, mm, mt), dtype=bool)
+        for k, p in enumerate(self.bs.problems):
+            self._load_row(k, p)
+
+        self._state = self.bs.reset()
+        self._substeps = np.zeros(n, dtype=np.int64)
+        self._mask: np.ndarray | None = None
+        self._actions = np.zeros(n, dtype=np.int64)
+        self._rows = np.arange(n)
+        # 마지막 관측 시점의 dwell (정의 불가는 0, ok=False) — 이동이 없던 슬롯의 shaping에 재사용
+        self._dwell_d = np.zeros((n, mt))
+        self._dwell_ok = np.zeros((n, mt), dtype=bool)
+        self._buf = np.zeros((n, obs_dim), dtype=np.float32)
+        o = 2 * mt
+        self._o_plan = self._buf[:, :mt]
+        self._o_wip = self._buf[:, mt:o]
+        self._o_assign = self._buf[:, o:o + mm * mt].reshape(n, mm, mt)
+        o += mm * mt
+        self._o_change = self._buf[:, o:o + mm * mt].reshape(n, mm, mt)
+        o += mm * mt
+        self._o_hour = self._buf[:, o]
+        self._o_dwell = self._buf[:, o + 1:] if dwell_obs else None
+
+    # ── 슬롯 문제 ─────────────────────────────────────────
+    def _load_row(self, k: int, p: ProblemInstance) -> None:
+        idx = p.index
+        nm, nt, mt = len(idx.models), idx.n_tasks, self.mt
+        eqp = np.asarray([max(1, p.eqp_qty[m]) for m in idx.models], dtype=np.float64)
+        self._plan_den[k] = 1.0
+        self._plan_den[k, :nt] = [max(1, t.plan_qty) for t in p.tasks]
+        self._max_wip[k] = max([t.init_wip for t in p.tasks] + [1])
+        self._assign_den[k] = 1.0
+        self._assign_den[k, :nm, 0] = eqp
+        self._change_den[k] = 1.0
+        if p.switch_time_hours > 0:
+            self._change_den[k, :nm, 0] = p.switch_time_hours * eqp
+        self._horizon[k] = max(1, p.horizon_hours)
+        self._total_plan[k] = sum(t.plan_qty for t in p.tasks) or 1
+        self._total_eqp[k] = sum(p.eqp_qty.values()) or 1
+        self._max_substeps[k] = sum(p.eqp_qty.values()) + 1
+        self._has_prev[k] = False
+        self._prev_flat[k] = k * mt
+        for ti, prev in enumerate(idx.prev_task):
+            if prev is not None:
+                self._has_prev[k, ti] = True
+                self._prev_flat[k, ti] = k * mt + prev
+        self._target[k] = 0.0
+        self._target_on[k] = False
+        for (m, ti), tgt in self._target_for(p).items():
+            if m in idx.model_pos and 0 <= ti < mt:
+                self._target[k, idx.model_pos[m], ti] = tgt
+                self._target_on[k, idx.model_pos[m], ti] = True
+
+    def _target_for(self, p: ProblemInstance) -> dict:
+        if self._target_fn is None or self.alloc_lambda == 0.0:
+            return {}
+        key = id(p)
+        if key not in self._targets:
+            self._targets[key] = self._target_fn(p)
+        return self._targets[key]
+
+    def _reset_rows(self, rows: np.ndarray) -> None:
+        """슬롯별로 샤드에서 문제를 다시 뽑고 초기 상태로."""
+        changed, picks = [], []
+        for k in rows.tolist():
+            shard = self.shards[k]
+            p = shard[int(self._rngs[k].integers(len(shard)))]
+            if p is not self.bs.problems[k]:
+                changed.append(k)
+                picks.append(p)
+                self._load_row(k, p)
+        if changed:
+            self.bs.set_problems(changed, picks)
+        self.bs.reset_instances(self._state, rows)
+        self._substeps[rows] = 0
+        self._mask = None
+
+    # ── 관측·보상 ─────────────────────────────────────────
+    def _achieved(self) -> np.ndarray:
+        return np.minimum(self._state.produced, self.bs.plan).sum(axis=1).astype(np.float64)
+
+    def _dwell(self) -> tuple[np.ndarray, np.ndarray]:
+        """(N, T) wip_dwell_time과 정의 여부 (simulator.dwell_time과 같은 분기, 정의 불가는 0)."""
+        cap = self.bs.task_capacity(self._state)
+        wip = self._state.wip.astype(np.float64)
+        cap_prev = cap.reshape(-1)[self._prev_flat]
+        denom = np.where(self._has_prev, np.minimum(cap, wip) - np.minimum(cap_prev, wip), cap)
+        empty = wip == 0
+        ok = empty | ((cap > 0) & (denom > 0))
+        d = np.minimum(wip / np.where(ok & ~empty, denom, 1.0), self._horizon)
+        d[~ok | empty] = 0.0
+        return d, ok
+
+    def _dwell_shaping(self, d: np.ndarray, ok: np.ndarray) -> np.ndarray:
+        remaining = np.maximum(0, self.bs.plan - self._state.produced)
+        w = np.where((remaining > 0) & ok, remaining, 0) / self._total_plan[:, None]
+        return self.dwell_lambda * (w * d / self._horizon).sum(axis=1)
+
+    def _alloc_guide(self) -> np.ndarray:
+        s = self._state
+        util = self.bs.active_eqp_count(s) / self._total_eqp
+        use = self._target_on & (s.wip > 0)[:, None, :]
+        band = self.guide_band_pct
+        lower = self._target * (1.0 - band)
+        upper = self._target * (1.0 + band)
+        over = np.maximum(lower - s.assign, 0.0) + np.maximum(s.assign - upper, 0.0)
+        pen = np.where(use, over / self._assign_den, 0.0).sum(axis=(1, 2))
+        count = use.sum(axis=(1, 2))
+        r = self.alloc_lambda * (1.0 - pen / np.maximum(count, 1))
+        return np.where((count > 0) & (util >= self.guide_util_threshold), r, 0.0)
+
+    def _obs(self) -> np.ndarray:
+        """관측 버퍼를 현재 상태로 채워 사본 반환 (dwell 캐시도 갱신)."""
+        s = self._state
+        np.divide(np.maximum(self.bs.plan - s.produced, 0), self._plan_den, out=self._o_plan)
+        np.minimum(s.wip / self._max_wip, 1.0, out=self._o_wip)
+        np.divide(s.assign, self._assign_den, out=self._o_assign)
+        np.minimum(s.switching / self._change_den, 1.0, out=self._o_change)
+        np.divide(s.hour, self._horizon[:, 0], out=self._o_hour)
+        if self.dwell_obs or self.dwell_lambda:
+            self._dwell_d, self._dwell_ok = self._dwell()
+            if self._o_dwell is not None:
+                np.divide(self._dwell_d, self._horizon, out=self._o_dwell)
+        return self._buf.copy()
+
+    def action_masks(self) -> np.ndarray:
+        """(N, n_actions) 유효 action — 전이마다 한 번만 계산 (캐시 배열 공유, 호출자는 수정 금지)."""
+        if self._mask is None:
+            valid = self.bs.valid_mask(self._state).reshape(self.num_envs, -1)
+            mask = np.empty((self.num_envs, self.action_space.n), dtype=bool)
+            mask[:, 0] = True
+            mask[:, 1:] = valid[:, self._act_flat]
+            self._mask = mask
+        return self._mask
+
+    # ── VecEnv ────────────────────────────────────────────
+    def reset(self):
+        for k, seed in enumerate(self._seeds):
+            if seed is not None:
+                self._rngs[k] = np.random.default_rng(seed)
+        self._reset_seeds()
+        self._reset_options()
+        self._reset_rows(self._rows)
+        return self._obs()
+
+    def step_async(self, actions: np.ndarray) -> None:
+        self._actions = np.asarray(actions, dtype=np.int64).reshape(self.num_envs)
+
+    def step_wait(self):
+        s, bs, a = self._state, self.bs, self._actions
+        before = self._achieved()
+        move = a != 0
+        a_idx = np.maximum(a - 1, 0)
+        ok = move & self.action_masks()[self._rows, a]
+        rows = self._rows[ok]
+        bs.apply_cells(s, rows, self._act_mi[a_idx[ok]], self._act_fi[a_idx[ok]], self._act_ti[a_idx[ok]])
+        self._substeps[move] += 1
+        commit = ~move | (self._substeps >= self._max_substeps)
+        reward = np.zeros(self.num_envs)
+        if commit.any():
+            if self.dwell_lambda:
+                if (ok & commit).any():
+                    d, dok = self._dwell()
+                else:
+                    d, dok = self._dwell_d, self._dwell_ok
+                reward += np.where(commit, self._dwell_shaping(d, dok), 0.0)
+            if self.alloc_lambda:
+                reward += np.where(commit, self._alloc_guide(), 0.0)
+            bs.advance_hour(s, where=commit)
+            self._substeps[commit] = 0
+        self._mask = None
+        reward += (self._achieved() - before) / self._total_plan
+        done = ~bs.running(s)
+        infos: list[dict] = [{} for _ in range(self.num_envs)]
+        if done.any():
+            ended = self._rows[done]
+            terminal = self._obs()
+            for k, m in zip(ended.tolist(), bs.metrics(s, ended)):
+                reward[k] += m["plan_achievement"]
+                infos[k] = {
+                    "plan_achievement": m["plan_achievement"],
+                    "per_task": m["per_task"],
+                    "terminal_observation": terminal[k],
+                }
+            self._reset_rows(ended)
+        return self._obs(), reward.astype(np.float32), done, infos
+
+    def close(self) -> None:
+        pass
+
+    def get_attr(self, attr_name: str, indices: VecEnvIndices = None) -> list:
+        """슬롯별 값 — problem은 각 슬롯의 현재 문제, 그 밖에는 공유 설정만."""
+        if attr_name == "problem":
+            return [self.bs.problems[k] for k in self._get_indices(indices)]
+        if attr_name not in self._SHARED_ATTRS:
+            raise AttributeError(f"DispatchVecEnv has no per-env attribute {attr_name!r}")
+        value = getattr(self, attr_name)
+        return [value for _ in self._get_indices(indices)]
+
+    def set_attr(self, attr_name: str, value, indices: VecEnvIndices = None) -> None:
+        """공유 설정만, 그리고 모든 슬롯에 한꺼번에만 바꿀 수 있다."""
+        if attr_name not in self._SETTABLE_ATTRS:
+            raise AttributeError(f"DispatchVecEnv attribute {attr_name!r} cannot be set per env")
+        if sorted(self._get_indices(indices)) != list(range(self.num_envs)):
+            raise ValueError(f"DispatchVecEnv attribute {attr_name!r} is shared; set it for all envs")
+        setattr(self, attr_name, value)
+
+    def env_method(self, method_name: str, *method_args, indices: VecEnvIndices = None, **method_kwargs) -> list:
+        if method_name == "action_masks":
+            mask = self.action_masks()
+            return [mask[k] for k in self._get_indices(indices)]
+        raise AttributeError(f"DispatchVecEnv does not support env_method({method_name!r})")
+
+    def env_is_wrapped(self, wrapper_class, indices: VecEnvIndices = None) -> list[bool]:
+        return [False for _ in self._get_indices(indices)]
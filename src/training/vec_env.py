@@ -0,0 +1,39 @@
+"""학습용 VecEnv — 작업자마다 문제 샤드를 맡아 reset마다 재표본 (n_envs>1이면 SubprocVecEnv)."""
+from __future__ import annotations
+
+from functools import partial
+from typing import Callable
+
+import gymnasium as gym
+from stable_baselines3.common.monitor import Monitor
+from stable_baselines3.common.vec_env import DummyVecEnv, SubprocVecEnv, VecEnv
+
+import config
+from envs.sampling import ProblemSamplingEnv, shard_problems
+from src.simulation.domain.problem import ProblemInstance
+
+
+def _worker_env(problems: list[ProblemInstance], make_env: Callable[[ProblemInstance], gym.Env],
+                seed: int) -> gym.Env:
+    return Monitor(ProblemSamplingEnv(problems, make_env, seed=seed))
+
+
+def make_vec_env(
+    problems: list[ProblemInstance],
+    make_env: Callable[[ProblemInstance], gym.Env],
+    n_envs: int | None = None,
+    seed: int | None = None,
+) -> VecEnv:
+    """작업자 rank는 problems[rank::n_envs]를 맡고 시드 seed+rank로 문제를 고른다.
+
+    make_env는 작업 프로세스로 넘어가므로 모듈 수준 함수(또는 partial)여야 한다.
+    """
+    n_envs = max(1, int(n_envs or config.TRAIN_N_ENVS))
+    seed = config.TRAIN_SEED if seed is None else seed
+    fns = [
+        partial(_worker_env, shard_problems(problems, n_envs, rank), make_env, seed + rank)
+        for rank in range(n_envs)
+    ]
+    if n_envs == 1:
+        return DummyVecEnv(fns)
+    return SubprocVecEnv(fns)
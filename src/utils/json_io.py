@@ -5,16 +5,13 @@ import json
 from pathlib import Path
 
 import config
+from src.simulation.domain.index import lot_cd_of_batch
 from src.simulation.domain.problem import Equipment, ProblemInstance, Task
 
 
 def _lot_cd_from_batch(batch_id: str) -> str:
     """batch_id → LOT_CD (json_io는 db 패키지 import 금지 — 순환 import 방지)."""
-    text = str(batch_id or "").strip()
-    if "/" in text:
-        lot = text.split("/", 1)[0].strip()
-        return lot or "-"
-    return text or "-"
+    return lot_cd_of_batch(batch_id)
 
 
 def _task_wip_qty(task_data: dict) -> int:
@@ -77,6 +74,9 @@ def load_problem(path: str | Path) -> ProblemInstance:
         facid=data.get("facid") or data.get("fac_id"),
         equipments=equipments,
         ground_truth=data.get("ground_truth", {}),
+        switch_time_min=(
+            float(data["switch_time_min"]) if data.get("switch_time_min") is not None else None
+        ),
     )
 
 
@@ -131,6 +131,8 @@ def problem_to_dict(problem: ProblemInstance, include_ground_truth: bool = True)
         "init_assign": init_assign,
         "tool_qty": tool_qty,
     }
+    if problem.switch_time_min is not None:
+        data["switch_time_min"] = problem.switch_time_min
     if problem.facid:
         data["facid"] = problem.facid
     if problem.equipments:
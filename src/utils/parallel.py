@@ -0,0 +1,77 @@
+"""프로세스 풀 map·재사용 풀 — 작업자 수 1이면 같은 프로세스에서 순차 실행."""
+from __future__ import annotations
+
+import atexit
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Iterable, TypeVar
+
+import config
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+def resolve_workers(workers: int | None = None) -> int:
+    """None/0 → config.SIM_WORKERS → os.cpu_count()."""
+    if not workers:
+        workers = config.SIM_WORKERS or os.cpu_count() or 1
+    return max(1, int(workers))
+
+
+def parallel_map(
+    fn: Callable[[T], R],
+    items: Iterable[T],
+    workers: int | None = None,
+    initializer: Callable[..., Any] | None = None,
+    initargs: tuple = (),
+) -> list[R]:
+    """순서를 보존하는 map.
+
+    initializer는 작업자마다 1회 실행된다 — 큰 읽기 전용 객체(ProblemInstance 등)는
+    항목마다 pickle하지 말고 initargs로 한 번만 넘긴다.
+    """
+    items = list(items)
+    n_workers = min(resolve_workers(workers), len(items))
+    if n_workers <= 1:
+        if initializer is not None:
+            initializer(*initargs)
+        return [fn(x) for x in items]
+    chunksize = max(1, math.ceil(len(items) / (n_workers * 4)))
+    with ProcessPoolExecutor(
+        max_workers=n_workers, initializer=initializer, initargs=initargs,
+    ) as pool:
+        return list(pool.map(fn, items, chunksize=chunksize))
+
+
+_SHARED: dict[str, tuple[Any, int, ProcessPoolExecutor]] = {}
+
+
+def shared_pool(
+    name: str,
+    token: Any,
+    workers: int,
+    initializer: Callable[..., Any] | None = None,
+    initargs: tuple = (),
+) -> ProcessPoolExecutor:
+    """호출 간 재사용하는 풀 — token(보통 ProblemInstance)이 바뀔 때만 새로 만든다.
+
+    시간 예산이 짧은 정책(beam 등)이 매 결정마다 프로세스를 띄우지 않도록 한다.
+    """
+    cur = _SHARED.get(name)
+    if cur is not None and cur[0] is token and cur[1] == workers:
+        return cur[2]
+    if cur is not None:
+        cur[2].shutdown(wait=False, cancel_futures=True)
+    pool = ProcessPoolExecutor(max_workers=workers, initializer=initializer, initargs=initargs)
+    _SHARED[name] = (token, workers, pool)
+    return pool
+
+
+@atexit.register
+def shutdown_shared_pools(wait: bool = False) -> None:
+    """재사용 풀 전부 종료 — 풀을 띄운 쪽이 자식 프로세스라면 wait=True로 직접 불러야 한다 (atexit 미실행)."""
+    for _token, _workers, pool in _SHARED.values():
+        pool.shutdown(wait=wait, cancel_futures=True)
+    _SHARED.clear()
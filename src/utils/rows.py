@@ -67,20 +67,22 @@ def build_assign_rows(
     hourly_stats: list[dict],
     sys_id: str | None = None,
     trace: list | None = None,
+    positions: list[dict] | None = None,
 ) -> list[dict]:
     """RTS_ASSIGN_INF/HIS — 시간대 × 장비 배치·생산. SEQ_NO는 EQP_ID(호기)별.
 
     trace가 있으면 호기 단위 추적(eqp_units)으로 EQP_ID 연속성을 보장하고,
     problem.equipments(실제 호기 명단)가 있으면 실제 호기 ID를 사용한다.
-    trace가 없으면 시간대별 가상 번호 부여(레거시)로 동작.
+    positions(호기 커널의 시간별 위치)가 있으면 trace 재생 없이 그대로 쓴다.
+    둘 다 없으면 시간대별 가상 번호 부여(레거시)로 동작.
     """
     sys_id = sys_id or config.SYS_ID
     rows: list[dict] = []
     seq_by_eqp: dict[str, int] = {}
     rule_timekey = problem.rule_timekey
 
-    hourly_positions = None
-    if trace is not None:
+    hourly_positions = positions
+    if hourly_positions is None and trace is not None:
         from src.utils.eqp_units import track_units
         hourly_positions, _ = track_units(problem, trace)
 
@@ -136,10 +138,12 @@ def build_assign_rows(
     return finalize_assign_rows(rows)
 
 
-def build_eqpconvplan_rows(problem: ProblemInstance, trace: list) -> list[dict]:
+def build_eqpconvplan_rows(
+    problem: ProblemInstance, trace: list, conversions: list[dict] | None = None,
+) -> list[dict]:
     """RTS_EQPCONVPLAN_INF/HIS — batch 전환 계획."""
     from src.db.eqpconvplan import build_eqpconvplan_rows as _build
-    return _build(problem, trace)
+    return _build(problem, trace, conversions=conversions)
 
 
 def build_conv_rows(problem: ProblemInstance, trace: list, sys_id: str | None = None) -> list[dict]:
@@ -208,7 +212,11 @@ def build_guide_rows(
 
 
 def detect_guide_source() -> str:
-    """가이드 산출 방식: ANALYTIC | ALLOC_RL."""
+    """가이드 산출 방식 (설정 기준): ANALYTIC | ALLOC_RL | ALLOC_OPT | ALLOC_CEM."""
+    if config.ALLOC_POLICY == "optimize":
+        return "ALLOC_OPT"
+    if config.ALLOC_POLICY == "cem":
+        return "ALLOC_CEM"
     alloc_path = config.SAVED_MODELS_DIR / "ppo_alloc.zip"
     if config.USE_ALLOC_MODEL and alloc_path.exists():
         return "ALLOC_RL"
@@ -223,19 +231,21 @@ def build_inference_result_document(
 ) -> dict:
     """추론 결과 JSON (가이드 + 동적 운영). schema_version=1."""
     sys_id = sys_id or config.SYS_ID
+    use_pf = policy == "PORTFOLIO" and eval_result.get("portfolio") is not None
     use_rl = policy == "RL" and eval_result.get("rl") is not None
-    assign_key = "rl_assign_rows" if use_rl else "assign_rows"
-    conv_key = "rl_eqpconvplan_rows" if use_rl else "eqpconvplan_rows"
-    achievement = eval_result.get("rl" if use_rl else "heuristic", 0.0)
-    util = eval_result.get("rl_avg_utilization" if use_rl else "avg_utilization", 0.0)
-    guide_src = detect_guide_source()
+    prefix = "portfolio_" if use_pf else "rl_" if use_rl else ""
+    assign_key = f"{prefix}assign_rows"
+    conv_key = f"{prefix}eqpconvplan_rows"
+    achievement = eval_result.get(prefix.rstrip("_") or "heuristic", 0.0)
+    util = eval_result.get(f"{prefix}avg_utilization", 0.0)
+    guide_src = eval_result.get("guide_source") or detect_guide_source()
     alloc_rows = build_eqpallocation_rows(
         problem, eval_result.get("guide_allocation", {}), guide_src, sys_id,
     )
     doc = {
         "schema_version": 1,
         "rule_timekey": problem.rule_timekey,
-        "policy": "RL" if use_rl else "HEURISTIC",
+        "policy": "PORTFOLIO" if use_pf else "RL" if use_rl else "HEURISTIC",
         "plan_achievement": float(achievement),
         "eqp_util_rate": float(util or 0.0),
         "guide": {
@@ -247,10 +257,15 @@ def build_inference_result_document(
             "assign_rows": eval_result.get(assign_key, []),
             "eqpconvplan_rows": eval_result.get(
                 conv_key,
-                eval_result.get("rl_conv_rows" if use_rl else "conv_rows", []),
+                eval_result.get(f"{prefix}conv_rows", []),
             ),
         },
     }
+    if use_pf:
+        doc["portfolio"] = {
+            "winner": eval_result.get("portfolio_policy"),
+            "scores": eval_result.get("portfolio_scores", {}),
+        }
     if problem.facid:
         doc["facid"] = problem.facid
     return doc
@@ -324,12 +339,14 @@ def build_output_tables(
     hourly_stats: list[dict],
     trace: list,
     sys_id: str | None = None,
+    positions: list[dict] | None = None,
+    conversions: list[dict] | None = None,
 ) -> dict[str, list[dict]]:
-    """출력 테이블별 행 dict."""
+    """출력 테이블별 행 dict. positions/conversions는 호기 커널 결과 (없으면 trace 재생)."""
     sid = sys_id or config.SYS_ID
     return {
-        config.ASSIGN_TABLE: build_assign_rows(problem, hourly_stats, sid, trace=trace),
-        config.EQPCONVPLAN_TABLE: build_eqpconvplan_rows(problem, trace),
+        config.ASSIGN_TABLE: build_assign_rows(problem, hourly_stats, sid, trace=trace, positions=positions),
+        config.EQPCONVPLAN_TABLE: build_eqpconvplan_rows(problem, trace, conversions=conversions),
     }
 
 
@@ -358,10 +375,16 @@ def guide_allocation_rows(problem, guide_allocation: dict) -> list[dict]:
     return rows
 
 
-def enrich_eval_result(problem: ProblemInstance, trace: list, hourly_stats: list[dict]) -> dict:
+def enrich_eval_result(
+    problem: ProblemInstance,
+    trace: list,
+    hourly_stats: list[dict],
+    positions: list[dict] | None = None,
+    conversions: list[dict] | None = None,
+) -> dict:
     """evaluate_benchmark 반환 dict에 출력 테이블별 행 추가."""
-    tables = build_output_tables(problem, hourly_stats, trace)
-    return {
+    tables = build_output_tables(problem, hourly_stats, trace, positions=positions, conversions=conversions)
+    out = {
         "hourly_stats": hourly_stats,
         "output_tables": tables,
         "assign_rows": tables[config.ASSIGN_TABLE],
@@ -371,3 +394,6 @@ def enrich_eval_result(problem: ProblemInstance, trace: list, hourly_stats: list
         "avg_utilization": avg_utilization(hourly_stats),
         "trace": trace,
     }
+    if conversions is not None:
+        out["unit_conversions"] = list(conversions)
+    return out
@@ -0,0 +1,71 @@
+"""작은 LP 풀이 — scipy(HiGHS)가 있으면 사용, 없으면 NumPy 단체법(tableau)."""
+from __future__ import annotations
+
+import numpy as np
+
+_TOL = 1e-9
+
+
+def linprog_max(c: np.ndarray, A: np.ndarray, b: np.ndarray) -> tuple[float, np.ndarray]:
+    """max c·x  s.t.  A x ≤ b,  x ≥ 0  (b ≥ 0 — 원점이 가능해라 1단계가 필요 없다).
+
+    반환: (최적값, x). 비유계면 ValueError.
+    """
+    c = np.asarray(c, dtype=np.float64)
+    A = np.asarray(A, dtype=np.float64).reshape(-1, len(c))
+    b = np.asarray(b, dtype=np.float64)
+    if (b < -_TOL).any():
+        raise ValueError("linprog_max: b must be non-negative")
+    try:
+        from scipy.optimize import linprog
+    except ImportError:
+        return _tableau_max(c, A, np.maximum(b, 0.0))
+    res = linprog(-c, A_ub=A, b_ub=b, bounds=(0, None), method="highs")
+    if res.status == 3:
+        raise ValueError("linprog_max: unbounded")
+    if res.status != 0:
+        return _tableau_max(c, A, np.maximum(b, 0.0))
+    return float(-res.fun), np.asarray(res.x)
+
+
+def _tableau_max(c: np.ndarray, A: np.ndarray, b: np.ndarray) -> tuple[float, np.ndarray]:
+    """Dantzig 규칙 단체법 — 퇴화 pivot이 이어지면 Bland 규칙으로 바꿔 순환을 막는다."""
+    m, n = A.shape
+    T = np.zeros((m + 1, n + m + 1))
+    T[:m, :n] = A
+    T[:m, n:n + m] = np.eye(m)
+    T[:m, -1] = b
+    T[m, :n] = -c
+    basis = list(range(n, n + m))
+    degenerate = 0
+    for _ in range(50 * (m + n) + 100):
+        z = T[m, :-1]
+        if degenerate > 50:
+            cand = np.nonzero(z < -_TOL)[0]
+            if not len(cand):
+                break
+            col = int(cand[0])
+        else:
+            col = int(np.argmin(z))
+            if z[col] >= -_TOL:
+                break
+        colv = T[:m, col]
+        pos = colv > _TOL
+        if not pos.any():
+            raise ValueError("linprog_max: unbounded")
+        ratios = np.full(m, np.inf)
+        ratios[pos] = T[:m, -1][pos] / colv[pos]
+        best = ratios.min()
+        ties = np.nonzero(ratios <= best + _TOL)[0]
+        row = int(min(ties, key=lambda r: basis[r]))
+        degenerate = degenerate + 1 if best <= _TOL else 0
+        T[row] /= T[row, col]
+        others = np.abs(T[:, col]) > 0
+        others[row] = False
+        T[others] -= np.outer(T[others, col], T[row])
+        basis[row] = col
+    else:
+        raise RuntimeError("linprog_max: iteration limit")
+    x = np.zeros(n + m)
+    x[basis] = T[:m, -1]
+    return float(T[m, -1]), x[:n]
@@ -20,7 +20,8 @@ def _task_label(t) -> str:
     return f"{t.plan_prod_key}/{t.oper_id}"
 
 
-def gantt_rows(problem: ProblemInstance, assign_rows: list[dict], trace: list) -> list[dict]:
+def gantt_rows(problem: ProblemInstance, assign_rows: list[dict], trace: list,
+               conversions: list[dict] | None = None) -> list[dict]:
     task_by_key = {(t.plan_prod_key, t.oper_id): t for t in problem.tasks}
     segments: list[dict] = []
     for r in merge_assign_rows(assign_rows):
@@ -37,7 +38,8 @@ def gantt_rows(problem: ProblemInstance, assign_rows: list[dict], trace: list) -
             "end": _iso(r["END_TIME"]),
             "qty": r["PRODUCE_QTY"],
         })
-    _, conversions = track_units(problem, trace)
+    if conversions is None:
+        _, conversions = track_units(problem, trace)
     for c in conversions:
         start_tm = event_tm_for_hour(problem.rule_timekey, c["hour"])
         end = _parse_tm(start_tm) + timedelta(hours=problem.switch_time_hours)
@@ -63,6 +63,7 @@ def algo_view(problem: ProblemInstance, result: dict, prefix: str = "") -> dict
     assign_rows = g("assign_rows", []) or []
     conv_rows = g("conv_rows", []) or []
     trace = g("trace", []) or []
+    unit_conversions = g("unit_conversions")
     util = g("avg_utilization")
     if util is None:
         util = avg_utilization(hourly_stats)
@@ -82,7 +83,7 @@ def algo_view(problem: ProblemInstance, result: dict, prefix: str = "") -> dict
             for k, v in per_task.items()
         ],
         "hourly": _hourly_view(problem, hourly_stats),
-        "gantt": gantt_rows(problem, assign_rows, trace),
+        "gantt": gantt_rows(problem, assign_rows, trace, unit_conversions),
         "conversions": _conversion_rows(conv_rows),
         "allocation_pivot": allocation_pivot(
             problem, result.get("guide_allocation", {}), per_task,
@@ -113,10 +114,12 @@ def build_detail_payload(name: str, problem: ProblemInstance, result: dict,
     for view in (heuristic_view, rl_view):
         _attach_static_kpis(view)
 
-    for view, trace_key in ((heuristic_view, "trace"), (rl_view, "rl_trace")):
+    for view, prefix in ((heuristic_view, ""), (rl_view, "rl_")):
         if view is None:
             continue
-        _, convs = track_units(problem, result.get(trace_key, []) or [])
+        convs = result.get(f"{prefix}unit_conversions")
+        if convs is None:
+            _, convs = track_units(problem, result.get(f"{prefix}trace", []) or [])
         view["kpis"]["converting_eqp_count"] = len({c["eqp_id"] for c in convs})
 
     guide_rows = list(guide_allocation_rows(problem, result.get("guide_allocation", {})))
@@ -166,6 +169,7 @@ def build_detail_payload(name: str, problem: ProblemInstance, result: dict,
             if cnt > 0
         ],
         "optimal": problem.ground_truth.get("plan_achievement"),
+        "upper_bound": result.get("upper_bound"),
         "rl_status": rl_status,
         "guide": guide_rows,
         "env_type": env_type,
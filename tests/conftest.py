@@ -0,0 +1,19 @@
+"""공유 fixture — 벤치마크 문제 로드 (테스트마다 새로 읽어 상호 간섭 없음)."""
+import pytest
+
+from config import BENCHMARKS_DIR
+from src.utils.json_io import load_problem
+
+# 학습 VecEnv 테스트용 벤치마크 부분집합
+TRAIN_NAMES = ("benchmark_01", "benchmark_02", "benchmark_04", "benchmark_10", "benchmark_12")
+
+
+@pytest.fixture
+def problems():
+    """벤치마크 전체 (파일명 순)."""
+    return [load_problem(p) for p in sorted(BENCHMARKS_DIR.glob("*.json"))]
+
+
+@pytest.fixture
+def train_problems():
+    return [load_problem(BENCHMARKS_DIR / f"{n}.json") for n in TRAIN_NAMES]
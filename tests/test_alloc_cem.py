@@ -0,0 +1,58 @@
+"""Stage 1 cem 정책 — 배치 logit 평가가 AllocationEnv와 일치, warm start 이상의 보상."""
+import numpy as np
+
+import config
+from config import BENCHMARKS_DIR
+from envs.allocation_env import AllocationEnv
+from src.db.eqpallocation import guide_source_to_mode_typ
+from src.simulation.domain.allocation import allocation_reward
+from src.stages.allocation.search import CEMConfig, LogitEvaluator, cem_allocation
+from src.stages.allocation.use_case import allocate
+from src.utils.json_io import load_problem
+
+
+def test_vector_evaluator_matches_env(problems):
+    rng = np.random.default_rng(0)
+    for p in problems:
+        env = AllocationEnv(p, max_tasks=config.MAX_TASKS, max_models=config.MAX_MODELS)
+        ev = LogitEvaluator(env)
+        logits = rng.uniform(-3, 3, size=(64, env.action_space.shape[0])).astype(np.float32)
+        logits[0] = env.analytic_target_logits()
+        logits[1] = 0.0
+        counts = ev.counts(logits)
+        rewards = ev.reward(counts)
+        for n in range(len(logits)):
+            alloc = env._logits_to_allocation(logits[n])
+            assert ev.allocation(counts[n]) == alloc
+            assert abs(rewards[n] - allocation_reward(p, alloc)) < 1e-12
+
+
+def test_cem_improves_on_warm_start_and_is_deterministic(problems):
+    cfg = CEMConfig(population=64, iterations=20, time_limit_s=30.0, seed=1)
+    for p in problems:
+        env = AllocationEnv(p, max_tasks=config.MAX_TASKS, max_models=config.MAX_MODELS)
+        env.reset()
+        _obs, start, *_ = env.step(env.analytic_target_logits())
+        alloc = cem_allocation(p, cfg=cfg)
+        assert allocation_reward(p, alloc) >= start
+        assert alloc == cem_allocation(p, cfg=cfg)
+        per_model: dict[str, int] = {}
+        for (m, _ti), c in alloc.items():
+            per_model[m] = per_model.get(m, 0) + c
+        assert all(v <= p.eqp_qty[m] for m, v in per_model.items())
+
+
+def test_cem_deadline_returns_warm_start():
+    p = load_problem(BENCHMARKS_DIR / "benchmark_02.json")
+    env = AllocationEnv(p, max_tasks=config.MAX_TASKS, max_models=config.MAX_MODELS)
+    alloc = cem_allocation(p, cfg=CEMConfig(time_limit_s=0.0))
+    assert alloc == env._logits_to_allocation(env.analytic_target_logits())
+
+
+def test_allocate_cem_source(monkeypatch):
+    monkeypatch.setattr(config, "USE_ALLOC_MODEL", False)
+    monkeypatch.setattr(config, "ALLOC_CEM_ITERATIONS", 5)
+    p = load_problem(BENCHMARKS_DIR / "benchmark_10.json")
+    guide = allocate(p, policy="cem")
+    assert guide.source == "ALLOC_CEM"
+    assert guide_source_to_mode_typ(guide.source) == "CEM"
@@ -0,0 +1,77 @@
+"""Stage 1 optimize 정책 — 전수 탐색과 같은 보상·해석식 폴백·MODE_TYP."""
+import itertools
+import random
+
+import numpy as np
+
+from src.db.eqpallocation import build_eqpallocation_rows, guide_source_to_mode_typ
+from src.simulation.domain.allocation import allocation_reward
+from src.stages.allocation.optimize import optimize_allocation
+from src.stages.allocation.use_case import allocate
+from src.utils.json_io import load_problem
+from config import BENCHMARKS_DIR
+
+
+def _feasible(p, alloc) -> bool:
+    idx = p.index
+    per_model, per_batch, init_batch = {}, {}, {}
+    for (m, ti), c in alloc.items():
+        per_model[m] = per_model.get(m, 0) + c
+        key = (idx.task_batch[ti], m)
+        per_batch[key] = per_batch.get(key, 0) + c
+    for (m, ti), c in p.init_assign.items():
+        key = (idx.task_batch[ti], m)
+        init_batch[key] = init_batch.get(key, 0) + c
+    return (
+        all(v <= p.eqp_qty[m] for m, v in per_model.items())
+        and all(v <= max(p.tool_cap(b, m), init_batch.get((b, m), 0)) for (b, m), v in per_batch.items())
+    )
+
+
+def _brute_force(p) -> float:
+    cells = [(m, ti) for m in p.models() for ti in range(len(p.tasks)) if p.uph_of(m, ti)]
+    best = 0.0
+    for combo in itertools.product(*[range(p.eqp_qty[m] + 1) for m, _ti in cells]):
+        alloc = dict(zip(cells, combo))
+        if _feasible(p, alloc):
+            best = max(best, allocation_reward(p, alloc))
+    return best
+
+
+def test_optimize_matches_brute_force_on_benchmarks(problems):
+    for p in problems:
+        alloc = optimize_allocation(p, time_limit=60)
+        assert _feasible(p, alloc)
+        assert abs(allocation_reward(p, alloc) - _brute_force(p)) < 1e-9
+
+
+def test_allocation_env_reward_uses_domain_function(problems):
+    from envs.allocation_env import AllocationEnv
+
+    rng = random.Random(0)
+    for p in problems:
+        env = AllocationEnv(p)
+        env.reset()
+        _obs, reward, *_ = env.step(np.asarray([rng.uniform(-3, 3) for _ in range(env.action_space.shape[0])]))
+        assert reward == allocation_reward(p, env.get_allocation())
+
+
+def test_allocate_optimize_source_and_fallback(monkeypatch):
+    import config
+
+    p = load_problem(BENCHMARKS_DIR / "benchmark_10.json")
+    guide = allocate(p, policy="optimize")
+    assert guide.source == "ALLOC_OPT"
+    assert allocation_reward(p, guide.counts) >= allocation_reward(p, p.plan_target_allocation_int())
+    monkeypatch.setattr(config, "ALLOC_OPT_TIME_LIMIT_S", 0.0)
+    fallback = allocate(p, policy="optimize")
+    assert fallback.source == "ANALYTIC"
+    assert fallback.counts == allocate(p, policy="analytic").counts
+
+
+def test_opt_guide_rows_mode_typ():
+    assert guide_source_to_mode_typ("ALLOC_OPT") == "OPT"
+    p = load_problem(BENCHMARKS_DIR / "benchmark_02.json")
+    guide = allocate(p, policy="optimize")
+    rows = build_eqpallocation_rows(p, guide.as_dict(), guide.source)
+    assert rows and all(r["MODE_TYP"] == "OPT" for r in rows)
@@ -0,0 +1,60 @@
+"""beam 디스패치 정책 — rollout 개선 보장·예산 0 폴백·병렬 일치·마감 후 풀 비움."""
+import dataclasses
+import os
+import time
+
+import config
+from agents.beam import BeamConfig, beam_plan
+from agents.registry import get_dispatch
+from src.simulation.kernel.simulator import Simulator
+from src.stages.dispatch.use_case import run_dispatch
+from src.utils.parallel import shared_pool
+
+
+def test_beam_is_registered():
+    assert get_dispatch("beam").__name__ == "beam_actions"
+
+
+def test_beam_never_worse_than_heuristic(monkeypatch, problems):
+    monkeypatch.setattr(config, "BEAM_BUDGET_MS", 60_000.0)
+    monkeypatch.setattr(config, "BEAM_WORKERS", 1)
+    for p in problems:
+        base = run_dispatch(p, policy="heuristic").plan_achievement
+        run = run_dispatch(p, policy="beam")
+        assert run.policy_name == "beam"
+        assert run.plan_achievement >= base
+
+
+def test_zero_budget_falls_back_to_heuristic(monkeypatch, problems):
+    monkeypatch.setattr(config, "BEAM_BUDGET_MS", 0.0)
+    for p in problems:
+        assert run_dispatch(p, policy="beam").legacy_trace == run_dispatch(p, policy="heuristic").legacy_trace
+
+
+def test_pool_rollouts_match_serial(problems):
+    p = problems[0]
+    sim = Simulator(p)
+    s = sim.reset()
+    serial = beam_plan(sim, s, BeamConfig(budget_ms=60_000.0, workers=1))
+    pooled = beam_plan(sim, s, BeamConfig(budget_ms=60_000.0, workers=2))
+    assert pooled == serial
+    assert s.assign == sim.reset().assign  # beam_plan은 상태를 바꾸지 않는다
+
+
+def test_pool_is_idle_once_budget_expires(problems):
+    # rollout 1회가 예산보다 훨씬 긴 문제 — 마감 뒤 대기열·실행 중 rollout이 풀에 남지 않아야 한다
+    p = problems[-1]
+    p = dataclasses.replace(p, horizon_hours=20_000, tasks=[
+        dataclasses.replace(t, plan_qty=t.plan_qty * 10_000, init_wip=t.init_wip * 10_000) for t in p.tasks
+    ])
+    sim = Simulator(p)
+    s = sim.reset()
+    cfg = BeamConfig(width=8, topk=8, depth=6, budget_ms=50.0, workers=2)
+    beam_plan(sim, s, cfg)  # 풀 기동
+    t0 = time.perf_counter()
+    beam_plan(sim, s, cfg)
+    assert time.perf_counter() - t0 < 0.5
+    pool = shared_pool("beam_rollout", p, 2)
+    t0 = time.perf_counter()
+    pool.submit(os.getpid).result()
+    assert time.perf_counter() - t0 < 0.3
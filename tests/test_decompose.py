@@ -0,0 +1,115 @@
+import pytest
+
+import agents  # noqa: F401 — register
+from agents.registry import get_dispatch
+from src.simulation.domain.problem import ProblemInstance, Task
+from src.simulation.kernel.simulator import Simulator
+from src.stages.allocation.use_case import allocate
+from src.stages.dispatch.use_case import run_dispatch
+from src.utils.json_io import load_problem
+from config import BENCHMARKS_DIR
+
+
+def _islands(n_islands: int = 3) -> ProblemInstance:
+    """섬마다 batch·전환그룹이 분리된 2공정 체인 2개."""
+    tasks, uph, init_assign, tool_qty, groups = [], {}, {}, {}, {}
+    for k in range(n_islands):
+        b1, b2 = f"L{k}A", f"L{k}B"
+        groups[f"G{k}"] = [b1, b2]
+        for j, batch in enumerate((b1, b2)):
+            for o in range(2):
+                ti = len(tasks)
+                tasks.append(Task(f"P{k}{j}", f"OP{o}", o + 1, batch, 300, 400 if o == 0 else 0))
+                uph[("M1", ti)] = 50.0 + 10 * o
+                uph[("M2", ti)] = 40.0
+            tool_qty[(batch, "M1")] = 4
+            tool_qty[(batch, "M2")] = 4
+        init_assign[("M1", len(tasks) - 4)] = 2
+        init_assign[("M2", len(tasks) - 1)] = 1
+    return ProblemInstance(
+        rule_timekey="2026010100000000", horizon_hours=8, switch_time_hours=1, tasks=tasks,
+        _uph=uph, eqp_qty={"M1": 2 * n_islands + 1, "M2": n_islands}, init_assign=init_assign,
+        tool_qty=tool_qty, conv_groups=groups,
+    )
+
+
+def test_decompose_splits_independent_islands():
+    p = _islands(3)
+    comps = p.decompose()
+    assert [c.tasks for c in comps] == [(0, 1, 2, 3), (4, 5, 6, 7), (8, 9, 10, 11)]
+    assert sum(sum(c.problem.eqp_qty.values()) for c in comps) == sum(p.eqp_qty.values())
+    for c in comps:
+        assert c.problem.tasks == [p.tasks[ti] for ti in c.tasks]
+
+
+def test_benchmarks_with_shared_group_stay_whole():
+    p = load_problem(sorted(BENCHMARKS_DIR.glob("*.json"))[0])
+    comps = p.decompose()
+    assert sorted(ti for c in comps for ti in c.tasks) == list(range(len(p.tasks)))
+
+
+def test_decomposed_dispatch_matches_monolithic():
+    p = _islands(3)
+    whole = run_dispatch(p, policy="heuristic")
+    for workers in (1, 2):
+        split = run_dispatch(p, policy="heuristic", decompose=True, workers=workers)
+        assert split.plan_achievement == whole.plan_achievement
+        assert split.per_task == whole.per_task
+        assert [h.cumulative_produced for h in split.hourly_stats] == \
+            [h.cumulative_produced for h in whole.hourly_stats]
+        assert [h.util_rate for h in split.hourly_stats] == [h.util_rate for h in whole.hourly_stats]
+        assert [h.active_eqp for h in split.hourly_stats] == [h.active_eqp for h in whole.hourly_stats]
+        sim = Simulator(p)
+        s = sim.reset()
+        for step in split.trace:
+            for mv in step.moves:
+                assert sim.is_valid_move(s, mv)
+                sim.apply_move(s, mv)
+            assert s.assign == step.assign_snapshot
+            sim.advance_hour(s)
+        assert s.produced == split.final_state.produced
+
+
+def test_decomposed_dispatch_rejects_problem_bound_callable():
+    p = _islands(2)
+    with pytest.raises(ValueError):
+        run_dispatch(p, policy=get_dispatch("heuristic"), decompose=True)
+
+
+def test_decomposed_dispatch_builds_policy_per_component():
+    p = _islands(3)
+    bound: list = []
+
+    def factory(problem):
+        heuristic = get_dispatch("heuristic")
+        bound.append(problem)
+
+        def policy(sim, s):
+            assert sim.p is problem  # 부분문제에 묶인 정책 — 지역 task 인덱스
+            return heuristic(sim, s)
+        return policy
+
+    split = run_dispatch(p, policy_factory=factory, policy_name="bound", decompose=True)
+    assert len(bound) == len(p.decompose())
+    assert split.policy_name == "bound"
+    assert split.per_task == run_dispatch(p, policy="heuristic").per_task
+
+
+def test_decomposed_allocation_covers_all_tasks():
+    p = _islands(2)
+    guide = allocate(p, policy="analytic", decompose=True, workers=1)
+    assert set(guide.counts) == set(allocate(p, policy="analytic").counts)
+
+
+def test_decomposed_allocation_keeps_non_analytic_source(monkeypatch):
+    from src.db.eqpallocation import guide_source_to_mode_typ
+    from src.stages.allocation import use_case
+
+    def rl_first_island(comp):  # 섬 0만 RL 성공, 나머지는 해석식 폴백
+        return comp.plan_target_allocation_int() if comp.tasks[0].plan_prod_key.startswith("P0") else None
+
+    monkeypatch.setattr(use_case, "_allocate_rl", rl_first_island)
+    guide = allocate(_islands(3), policy="rl", decompose=True, workers=1)
+    assert guide.source == "ALLOC_RL" and guide_source_to_mode_typ(guide.source) == "RL"
+    monkeypatch.setattr(use_case, "_allocate_rl", lambda comp: None)
+    assert allocate(_islands(3), policy="rl", decompose=True, workers=1).source == "ANALYTIC"
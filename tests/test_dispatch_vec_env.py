@@ -0,0 +1,104 @@
+import numpy as np
+
+from envs.dispatch_env import DispatchEnv
+from src.stages.allocation.use_case import allocate
+from src.training.dispatch_vec_env import DispatchVecEnv
+
+KW = dict(max_tasks=8, max_models=5, dwell_lambda=0.3, alloc_lambda=0.3, dwell_obs=True,
+          guide_util_threshold=0.5, guide_band_pct=0.2)
+
+
+def _target(p):
+    return allocate(p).as_dict()
+
+
+def test_vec_env_matches_per_problem_dispatch_envs(train_problems):
+    ps = train_problems
+    vec = DispatchVecEnv(ps, len(ps), target_allocation=_target, **KW)  # 슬롯마다 문제 1개
+    envs = [DispatchEnv(p, target_allocation=_target(p), **KW) for p in ps]
+    obs = vec.reset()
+    np.testing.assert_allclose(obs, np.stack([e.reset(seed=0)[0] for e in envs]), atol=1e-6)
+    rng = np.random.default_rng(0)
+    episodes = 0
+    for _ in range(600):
+        mask = vec.action_masks()
+        np.testing.assert_array_equal(mask, np.stack([e.action_masks() for e in envs]))
+        acts = np.array([
+            int(rng.choice(np.flatnonzero(m))) if rng.random() < 0.8 else 0 for m in mask
+        ])
+        acts[0] = int(np.flatnonzero(~mask[0])[0]) if rng.random() < 0.05 else acts[0]
+        obs, rew, done, infos = vec.step(acts)
+        for k, e in enumerate(envs):
+            o, r, term, _trunc, info = e.step(int(acts[k]))
+            assert term == done[k]
+            assert abs(r - rew[k]) < 1e-5
+            if term:
+                episodes += 1
+                np.testing.assert_allclose(infos[k]["terminal_observation"], o, atol=1e-6)
+                assert infos[k]["plan_achievement"] == info["plan_achievement"]
+                o, _ = e.reset()
+            np.testing.assert_allclose(obs[k], o, atol=1e-6)
+    assert episodes > len(ps)
+
+
+def test_vec_env_resamples_problems_from_slot_shards(train_problems):
+    ps = train_problems
+
+    def picks(seed):
+        vec = DispatchVecEnv(ps, 2, max_tasks=8, max_models=5, seed=seed)
+        vec.reset()
+        seen = []
+        for _ in range(300):
+            _obs, _r, done, _i = vec.step(np.zeros(2, dtype=np.int64))
+            if done.any():
+                seen.append(tuple(ps.index(p) for p in vec.bs.problems))
+        return seen
+
+    seen = picks(1)
+    assert seen == picks(1)
+    assert {row[0] for row in seen} <= {0, 2, 4}
+    assert {row[1] for row in seen} <= {1, 3}
+    assert len(set(seen)) > 1
+
+
+def test_native_training_runs(tmp_path, monkeypatch, train_problems):
+    import config
+    from src.training.dispatch import train_model
+
+    monkeypatch.setattr(config, "TRAIN_VEC_ENV", "native")
+    out = tmp_path / "m.zip"
+    model = train_model(train_problems[:2], ppo_steps=256, bc_epochs=2, save_path=out, n_envs=4)
+    assert out.exists() and model.n_envs == 4
+
+
+def test_vec_env_attrs_follow_per_env_contract(train_problems):
+    import pytest
+
+    ps = train_problems[:3]
+    vec = DispatchVecEnv(ps, 3, **KW)
+    assert vec.get_attr("problem") == list(vec.bs.problems)
+    assert vec.get_attr("problem", indices=[1]) == [vec.bs.problems[1]]
+    assert vec.get_attr("dwell_lambda") == [0.3, 0.3, 0.3]
+    assert len(vec.get_attr("action_masks")) == 3  # MaskablePPO의 마스크 지원 확인
+    with pytest.raises(AttributeError):
+        vec.get_attr("_state")
+    vec.set_attr("dwell_lambda", 0.1)
+    assert vec.dwell_lambda == 0.1
+    with pytest.raises(ValueError):
+        vec.set_attr("dwell_lambda", 0.2, indices=[0])
+    with pytest.raises(AttributeError):
+        vec.set_attr("problem", ps[0])
+    with pytest.raises(AttributeError):
+        vec.env_method("reset")
+
+
+def test_native_vec_env_defaults_to_batched_slots(monkeypatch, train_problems):
+    import config
+    from src.training.dispatch import make_native_vec_env
+
+    monkeypatch.setattr(config, "TRAIN_N_ENVS", 1)
+    monkeypatch.setattr(config, "TRAIN_NATIVE_N_ENVS", 3)
+    assert make_native_vec_env(train_problems).num_envs == 3
+    monkeypatch.setattr(config, "TRAIN_N_ENVS", 2)
+    assert make_native_vec_env(train_problems).num_envs == 2
+    assert make_native_vec_env(train_problems, n_envs=5).num_envs == 5
@@ -53,3 +53,28 @@ def test_next_task_index_follows_oper_seq():
     p = load_problem(BENCHMARKS_DIR / "benchmark_01.json")
     # 단일 OPER → 다음 공정 없음
     assert p.next_task_index(0) is None
+
+
+def test_problem_index_matches_scan_lookups():
+    p = load_problem(BENCHMARKS_DIR / "benchmark_12.json")
+    idx = p.index
+    assert idx is p.index  # 문제당 1회 구축
+    for ti, t in enumerate(p.tasks):
+        nxt = next((i for i, o in enumerate(p.tasks)
+                    if o.plan_prod_key == t.plan_prod_key and o.oper_seq == t.oper_seq + 1), None)
+        prv = next((i for i, o in enumerate(p.tasks)
+                    if o.plan_prod_key == t.plan_prod_key and o.oper_seq == t.oper_seq - 1), None)
+        assert p.next_task_index(ti) == nxt
+        assert p.prev_task_index(ti) == prv
+        for mi, m in enumerate(p.models()):
+            assert idx.uph[mi, ti] == (p.uph_of(m, ti) or 0.0)
+            assert p.tool_cap(t.batch_id, m) == p.tool_qty.get((p.lot_cd_of(t.batch_id), m), 0)
+    assert p.conv_group_of("B1") == "G1"
+    assert p.conv_group_of("B_UNKNOWN") is None
+
+
+def test_lot_cd_of_splits_temper_suffix():
+    p = load_problem(BENCHMARKS_DIR / "benchmark_01.json")
+    assert p.lot_cd_of("L1/25") == "L1"
+    assert p.lot_cd_of("L1") == "L1"
+    assert p.lot_cd_of("") == "-"
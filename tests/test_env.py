@@ -1,3 +1,4 @@
+import pytest
 import numpy as np
 from src.utils.json_io import load_problem
 from envs.dispatch_env import DispatchEnv
@@ -78,3 +79,102 @@ def test_guide_reward_band_tolerates_small_deviation():
     )
     env.reset(seed=0)
     assert abs(env._alloc_guide_reward() - 1.0) < 1e-9
+
+
+def _reference_obs(env) -> np.ndarray:
+    """리스트로 매번 새로 만드는 이전 관측 구성 — 버퍼 증분 갱신과 비교용."""
+    p, s = env.p, env._state
+    plan_part = [0.0] * env.mt
+    for i, t in enumerate(p.tasks):
+        rem = max(0, t.plan_qty - s.produced[i])
+        plan_part[i] = rem / t.plan_qty if t.plan_qty else 0.0
+    max_wip = max([t.init_wip for t in p.tasks] + [1])
+    wip_part = [0.0] * env.mt
+    for i in range(env.n_tasks):
+        wip_part[i] = min(1.0, s.wip[i] / max_wip)
+    assign_part = [0.0] * (env.mm * env.mt)
+    change_part = [0.0] * (env.mm * env.mt)
+    for mi, m in enumerate(env.models):
+        for i in range(env.n_tasks):
+            assign_part[mi * env.mt + i] = s.assign.get((m, i), 0) / max(1, p.eqp_qty[m])
+            change_part[mi * env.mt + i] = min(
+                1.0, s.switching.get((m, i), 0) / (p.switch_time_hours * max(1, p.eqp_qty[m]))
+            )
+    base = plan_part + wip_part + assign_part + change_part + [s.hour / max(1, p.horizon_hours)]
+    H = float(p.horizon_hours)
+    dwell_part = [0.0] * env.mt
+    for i in range(env.n_tasks):
+        d = env.sim.wip_dwell_time(s, i)
+        dwell_part[i] = 0.0 if d is None else min(d, H) / H
+    return np.asarray(base + dwell_part, dtype=np.float32)
+
+
+def _reference_shaping(env) -> float:
+    p, s = env.p, env._state
+    H = float(p.horizon_hours)
+    total_plan = sum(t.plan_qty for t in p.tasks) or 1
+    shaping = 0.0
+    for i, t in enumerate(p.tasks):
+        remaining = max(0, t.plan_qty - s.produced[i])
+        d = env.sim.wip_dwell_time(s, i)
+        if remaining and d is not None:
+            shaping += remaining / total_plan * min(d, H) / H
+    return env.dwell_lambda * shaping
+
+
+def test_incremental_obs_matches_full_rebuild():
+    rng = np.random.default_rng(0)
+    for name in ("benchmark_02", "benchmark_04", "benchmark_10"):
+        p = load_problem(BENCHMARKS_DIR / f"{name}.json")
+        env = DispatchEnv(p, max_tasks=8, max_models=5, dwell_obs=True, dwell_lambda=0.5)
+        obs, _ = env.reset(seed=0)
+        done = False
+        while not done:
+            np.testing.assert_allclose(obs, _reference_obs(env), rtol=1e-6, atol=1e-7)
+            assert abs(env._dwell_shaping_reward() - _reference_shaping(env)) < 1e-9
+            mask = env.action_masks()
+            valid = np.flatnonzero(mask)
+            action = int(rng.choice(valid)) if rng.random() < 0.7 else 0
+            obs, _r, done, _t, _info = env.step(action)
+
+
+def test_obs_is_a_copy_of_the_buffer():
+    p = load_problem(BENCHMARKS_DIR / "benchmark_01.json")
+    env = DispatchEnv(p)
+    obs, _ = env.reset(seed=0)
+    before = obs.copy()
+    env.step(0)
+    np.testing.assert_array_equal(obs, before)
+
+
+def test_mask_computed_once_per_transition(monkeypatch):
+    p = load_problem(BENCHMARKS_DIR / "benchmark_12.json")
+    env = DispatchEnv(p, max_tasks=8, max_models=5)
+    calls = []
+    orig = env.sim.valid_move_mask
+    monkeypatch.setattr(env.sim, "valid_move_mask", lambda s: calls.append(1) or orig(s))
+    monkeypatch.setattr(env.sim, "valid_moves", lambda s: pytest.fail("valid_moves called"))
+    env.reset(seed=0)
+    rng = np.random.default_rng(1)
+    transitions, done = 0, False
+    while not done:
+        mask = env.action_masks()
+        assert env.action_masks() is mask
+        fresh = np.zeros(env.action_space.n, dtype=bool)
+        fresh[env._action_of[orig(env._state)]] = True
+        fresh[0] = True
+        np.testing.assert_array_equal(mask, fresh)
+        valid = np.flatnonzero(mask)
+        _obs, _r, done, _t, _i = env.step(int(rng.choice(valid)) if rng.random() < 0.7 else 0)
+        transitions += 1
+    assert len(calls) == transitions
+
+
+def test_masked_out_action_is_a_noop_substep():
+    p = load_problem(BENCHMARKS_DIR / "benchmark_02.json")
+    env = DispatchEnv(p)
+    env.reset(seed=0)
+    invalid = int(np.flatnonzero(~env.action_masks())[0])
+    before = dict(env._state.assign)
+    _obs, r, _d, _t, _i = env.step(invalid)
+    assert env._state.assign == before and r == 0.0 and env._substeps == 1
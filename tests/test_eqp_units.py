@@ -103,3 +103,42 @@ def test_rows_to_problem_assign_cnt_takes_precedence():
     p = rows_to_problem(rows, horizon_hours=3)
     assert p.init_assign == {("M1", 0): 1}
     assert len(p.equipments) == 1
+
+
+def _sorted_positions(hourly):
+    return [{k: sorted(v) for k, v in pos.items()} for pos in hourly]
+
+
+def test_unit_kernel_matches_trace_replay():
+    from src.stages.dispatch.use_case import run_dispatch
+    from src.utils.rows import build_assign_rows
+
+    for path in sorted(TEST_DATA_DIR.glob("*.json")):
+        p = load_problem(path)
+        run = run_dispatch(p, policy="heuristic", kernel="unit")
+        hourly, conversions = track_units(p, run.legacy_trace)
+        assert _sorted_positions(run.unit_positions) == _sorted_positions(hourly)
+        assert list(run.unit_conversions) == conversions
+        replayed = build_assign_rows(p, run.legacy_hourly_stats, trace=run.legacy_trace)
+        native = build_assign_rows(p, run.legacy_hourly_stats, positions=list(run.unit_positions))
+        assert native == replayed
+        produced = {}
+        for r in replayed:
+            produced[r["EQP_ID"]] = produced.get(r["EQP_ID"], 0) + r["PRODUCE_QTY"]
+        units = run.final_state.units
+        native_produced = {e: int(q) for e, q in zip(units.eqp_ids, units.unit_produced) if q}
+        assert native_produced == produced
+
+
+def test_unit_kernel_rejects_undo_log_and_fast_forward():
+    import pytest
+
+    from src.simulation.kernel.units import UnitSimulator
+
+    sim = UnitSimulator(load_problem(sorted(TEST_DATA_DIR.glob("*.json"))[0]))
+    s = sim.reset()
+    for call in (lambda: sim.checkpoint(s), lambda: sim.rollback(s, 0), lambda: sim.release(s),
+                 lambda: sim.fast_forward(s, 1)):
+        with pytest.raises(TypeError):
+            call()
+    assert s._journal is None and s.hour == 0
@@ -0,0 +1,124 @@
+"""분기한정 정확해 — 벤치마크 ground_truth 재현·전수 탐색과 일치·ground_truth 기록."""
+import json
+import math
+import multiprocessing as mp
+import shutil
+
+from src.simulation.domain.problem import ProblemInstance, Task
+from src.stages.dispatch.exact import BranchAndBound, achievement, solve_exact, write_ground_truth
+from src.utils.json_io import load_problem
+from config import BENCHMARKS_DIR
+
+
+def _tiny(seed: int) -> ProblemInstance:
+    uph = {("M1", 0): 60.0, ("M1", 1): 40.0, ("M1", 2): 50.0, ("M2", 1): 60.0,
+           ("M2", 2): 40.0, ("M2", 3): 50.0, ("M1", 3): 30.0}
+    return ProblemInstance(
+        rule_timekey="T", horizon_hours=3, switch_time_hours=1,
+        tasks=[
+            Task("P1", "OP10", 1, "B1", 100 + 20 * seed, 150),
+            Task("P1", "OP20", 2, "B1", 100, 0),
+            Task("P2", "OP10", 1, "B2", 80, 120 - 10 * seed),
+            Task("P2", "OP20", 2, "B2", 90 + 10 * seed, 30),
+        ],
+        _uph=uph, eqp_qty={"M1": 2, "M2": 1},
+        init_assign={("M1", 0): 2, ("M2", 1): 1},
+        tool_qty={("B1", "M1"): 2, ("B2", "M1"): 1, ("B1", "M2"): 1, ("B2", "M2"): 1},
+        conv_groups={"G1": ["B1", "B2"]},
+    )
+
+
+def _brute_force(p: ProblemInstance) -> float:
+    bb = BranchAndBound(p, math.inf, 0.0, mp.Value("d", 0.0))
+
+    def rec(s):
+        if bb.sim.is_done(s):
+            return achievement(p, s)
+        return max(rec(child) for _ub, _m, child in bb.children(s))
+
+    return rec(bb.sim.reset())
+
+
+def test_exact_reproduces_benchmark_ground_truth():
+    for path in sorted(BENCHMARKS_DIR.glob("*.json")):
+        p = load_problem(path)
+        r = solve_exact(p, time_limit=60, workers=1)
+        assert r.optimal
+        assert round(r.plan_achievement, 4) == p.ground_truth["plan_achievement"], path.name
+
+
+def test_exact_matches_brute_force():
+    for seed in range(2):
+        p = _tiny(seed)
+        r = solve_exact(p, time_limit=60, workers=1)
+        assert r.optimal
+        assert abs(r.plan_achievement - _brute_force(p)) < 1e-9
+        sim = BranchAndBound(p, math.inf, 0.0, mp.Value("d", 0.0)).sim
+        s = sim.reset()
+        for moves in r.plan:
+            for mv in moves:
+                assert sim.is_valid_move(s, mv)
+                sim.apply_move(s, mv)
+            sim.advance_hour(s)
+        assert abs(achievement(p, s) - r.plan_achievement) < 1e-9
+
+
+def test_parallel_subtrees_agree_with_serial():
+    p = _tiny(1)
+    a = solve_exact(p, time_limit=60, workers=1)
+    b = solve_exact(p, time_limit=60, workers=2)
+    assert b.optimal and abs(a.plan_achievement - b.plan_achievement) < 1e-9
+
+
+def test_time_limit_reports_bound():
+    p = _tiny(2)
+    r = solve_exact(p, time_limit=0.0, workers=1)
+    assert r.upper_bound >= r.plan_achievement
+    assert r.optimal == (r.upper_bound <= r.plan_achievement + 1e-9)
+
+
+def test_write_ground_truth(tmp_path):
+    src = sorted(BENCHMARKS_DIR.glob("*.json"))[9]
+    path = tmp_path / src.name
+    shutil.copy(src, path)
+    assert write_ground_truth(path) is None  # 손으로 넣은 값은 유지
+    data = json.loads(path.read_text(encoding="utf-8"))
+    data.pop("ground_truth")
+    path.write_text(json.dumps(data), encoding="utf-8")
+    r = write_ground_truth(path, time_limit=60, workers=1)
+    gt = load_problem(path).ground_truth
+    assert gt["source"] == "exact" and gt["optimal"] is True
+    assert gt["plan_achievement"] == round(r.plan_achievement, 4) == 1.0
+
+
+def test_exact_proves_optimality_on_mixed_fleet():
+    # 3개 batch·전환그룹 1개·model 3종 9대 — 상한이 도달 가능 영역·tool·전환 손실과 LP로 좁혀져야 끝난다
+    from src.stages.dispatch.bound import lp_upper_bound
+
+    p = ProblemInstance(
+        rule_timekey="T", horizon_hours=4, switch_time_hours=1,
+        tasks=[
+            Task("P0", "OP0", 1, "B1", 557, 517),
+            Task("P0", "OP1", 2, "B1", 336, 74),
+            Task("P1", "OP0", 1, "B2", 462, 741),
+            Task("P1", "OP1", 2, "B3", 702, 92),
+        ],
+        _uph={("M1", 1): 50.0, ("M1", 2): 60.0, ("M1", 3): 30.0, ("M2", 1): 50.0, ("M2", 3): 80.0,
+              ("M3", 0): 40.0, ("M3", 1): 30.0, ("M3", 2): 40.0, ("M3", 3): 80.0},
+        eqp_qty={"M1": 4, "M2": 3, "M3": 2},
+        init_assign={("M1", 2): 1, ("M1", 3): 3, ("M2", 1): 1, ("M2", 3): 2, ("M3", 2): 2},
+        tool_qty={("B1", "M1"): 2, ("B1", "M2"): 2, ("B1", "M3"): 1, ("B2", "M1"): 2, ("B2", "M2"): 3,
+                  ("B2", "M3"): 3, ("B3", "M1"): 2, ("B3", "M2"): 3, ("B3", "M3"): 3},
+        conv_groups={"G1": ["B1", "B2", "B3"]},
+    )
+    r = solve_exact(p, time_limit=120, workers=1)
+    assert r.optimal and r.upper_bound == r.plan_achievement
+    assert r.plan_achievement <= lp_upper_bound(p)
+    sim = BranchAndBound(p, math.inf, 0.0, mp.Value("d", 0.0)).sim
+    s = sim.reset()
+    for moves in r.plan:
+        for mv in moves:
+            assert sim.is_valid_move(s, mv)
+            sim.apply_move(s, mv)
+        sim.advance_hour(s)
+    assert abs(achievement(p, s) - r.plan_achievement) < 1e-9
@@ -0,0 +1,97 @@
+"""heap·NumPy 휴리스틱이 기존 전수 탐색 루프와 같은 이동을 내는지."""
+import random
+
+from agents.heuristic import _remaining, heuristic_actions, heuristic_vec_actions
+from src.simulation.domain.problem import ProblemInstance, Task
+from src.simulation.kernel.simulator import Simulator
+from src.utils.json_io import load_problem
+from config import BENCHMARKS_DIR
+
+
+def _reference_actions(sim, s):
+    """기존 구현 (매 회 유효 이동 전체 재생성·이득 재계산)."""
+    p = sim.p
+    idx = p.index
+    moves = []
+    for _ in range(sum(p.eqp_qty.values()) + 1):
+        best, best_gain = None, 0.0
+        for mv in sim.valid_moves(s):
+            from_rem = _remaining(p, s, mv.from_index)
+            from_wip = s.wip[mv.from_index]
+            to_rem = _remaining(p, s, mv.to_index)
+            mi = idx.model_pos[mv.model]
+            uph_to = float(idx.uph[mi, mv.to_index])
+            uph_from = float(idx.uph[mi, mv.from_index])
+            same_batch = idx.task_batch[mv.from_index] == idx.task_batch[mv.to_index]
+            to_has_eqp = any(s.assign.get((m, mv.to_index), 0) > 0 for m in idx.models)
+            if from_rem > 0 and from_wip > 0:
+                better_here = same_batch and uph_to > uph_from
+                fill_empty_free = same_batch and to_rem > 0 and not to_has_eqp and uph_to >= uph_from
+                if not (better_here or fill_empty_free):
+                    continue
+            hours_left = p.horizon_hours - s.hour - (0 if same_batch else p.switch_time_hours)
+            gain = min(to_rem, s.wip[mv.to_index], uph_to * max(0, hours_left))
+            if gain > best_gain:
+                best, best_gain = mv, gain
+        if best is None:
+            break
+        sim.apply_move(s, best)
+        moves.append(best)
+    return moves
+
+
+def _fleet(n_products: int, n_opers: int, seed: int) -> ProblemInstance:
+    rng = random.Random(seed)
+    tasks, uph, init_assign = [], {}, {}
+    models = ["M1", "M2", "M3"]
+    for k in range(n_products):
+        batch = f"B{1 + k % 3}"
+        for o in range(n_opers):
+            ti = len(tasks)
+            tasks.append(Task(f"P{k}", f"OP{o}", o + 1, batch, rng.randint(100, 600),
+                              rng.randint(200, 800) if o == 0 else rng.choice([0, 50])))
+            for m in models:
+                if rng.random() < 0.7:
+                    uph[(m, ti)] = float(rng.choice([30, 40, 40, 55, 60]))
+            for m in models:
+                if (m, ti) in uph and rng.random() < 0.5:
+                    init_assign[(m, ti)] = rng.randint(1, 3)
+    eqp = {m: sum(c for (mm, _t), c in init_assign.items() if mm == m) for m in models}
+    return ProblemInstance(
+        rule_timekey="T", horizon_hours=8, switch_time_hours=1, tasks=tasks,
+        _uph=uph, eqp_qty=eqp, init_assign=init_assign,
+        tool_qty={(f"B{i}", m): rng.randint(1, 6) for i in (1, 2, 3) for m in models},
+        conv_groups={"G1": ["B1", "B2", "B3"]},
+    )
+
+
+def _assert_same_each_hour(p: ProblemInstance):
+    sim = Simulator(p)
+    s = sim.reset()
+    while not sim.is_done(s):
+        ref, vec = s.clone(), s.clone()
+        expected = _reference_actions(sim, ref)
+        assert heuristic_vec_actions(sim, vec) == expected
+        assert heuristic_actions(sim, s) == expected
+        assert (s.assign, s.switching, s.tool_used) == (ref.assign, ref.switching, ref.tool_used)
+        sim.advance_hour(s)
+
+
+def test_heap_heuristic_matches_reference_on_benchmarks():
+    for path in sorted(BENCHMARKS_DIR.glob("*.json")):
+        _assert_same_each_hour(load_problem(path))
+
+
+def test_heap_heuristic_matches_reference_on_random_fleets():
+    for seed in range(6):
+        _assert_same_each_hour(_fleet(n_products=8, n_opers=3, seed=seed))
+
+
+def test_heuristic_vec_is_registered_for_run_dispatch():
+    from src.stages.dispatch.use_case import run_dispatch
+
+    p = load_problem(sorted(BENCHMARKS_DIR.glob("*.json"))[0])
+    a = run_dispatch(p, policy="heuristic")
+    b = run_dispatch(p, policy="heuristic_vec")
+    assert b.policy_name == "heuristic_vec"
+    assert b.legacy_trace == a.legacy_trace
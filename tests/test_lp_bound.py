@@ -0,0 +1,70 @@
+"""LP 완화 상한 — 정확해 이상·벤치마크 ground_truth와 일치·NumPy 단체법."""
+import dataclasses
+import time
+
+import numpy as np
+
+import src.evaluate as report
+from src.simulation.domain.problem import ProblemInstance, Task
+from src.stages.dispatch.bound import lp_upper_bound
+from src.stages.dispatch.exact import solve_exact
+from src.utils.json_io import load_problem
+from src.utils.simplex import _tableau_max, linprog_max
+from config import BENCHMARKS_DIR
+
+
+def test_tableau_simplex_solves_small_lp():
+    # max 3x + 2y  s.t. x + y ≤ 4, x + 3y ≤ 6, x ≤ 3  → x=3, y=1, 11
+    c = np.array([3.0, 2.0])
+    A = np.array([[1.0, 1.0], [1.0, 3.0], [1.0, 0.0]])
+    b = np.array([4.0, 6.0, 3.0])
+    value, x = _tableau_max(c, A, b)
+    assert abs(value - 11.0) < 1e-9 and np.allclose(x, [3.0, 1.0])
+    assert abs(linprog_max(c, A, b)[0] - 11.0) < 1e-9
+
+
+def test_bound_is_tight_on_benchmarks():
+    for path in sorted(BENCHMARKS_DIR.glob("*.json")):
+        p = load_problem(path)
+        assert lp_upper_bound(p) == p.ground_truth["plan_achievement"], path.name
+
+
+def test_bound_dominates_exact_solution():
+    for seed in range(3):
+        p = ProblemInstance(
+            rule_timekey="T", horizon_hours=3, switch_time_hours=1,
+            tasks=[
+                Task("P1", "OP10", 1, "B1", 100 + 20 * seed, 150),
+                Task("P1", "OP20", 2, "B1", 100, 0),
+                Task("P2", "OP10", 1, "B2", 80, 120 - 10 * seed),
+                Task("P2", "OP20", 2, "B2", 90 + 10 * seed, 30),
+            ],
+            _uph={("M1", 0): 60.0, ("M1", 1): 40.0, ("M1", 2): 50.0, ("M2", 1): 60.0,
+                  ("M2", 2): 40.0, ("M2", 3): 50.0, ("M1", 3): 30.0},
+            eqp_qty={"M1": 2, "M2": 1},
+            init_assign={("M1", 0): 2, ("M2", 1): 1},
+            tool_qty={("B1", "M1"): 2, ("B2", "M1"): 1, ("B1", "M2"): 1, ("B2", "M2"): 1},
+            conv_groups={"G1": ["B1", "B2"]},
+        )
+        exact = solve_exact(p, time_limit=60, workers=1).plan_achievement
+        assert lp_upper_bound(p) >= exact - 1e-9
+
+
+def test_bound_is_fast_on_week_horizon():
+    # 시간 구간 집계 — H=168에서도 NumPy 단체법으로 즉시 (scipy 없이)
+    for name in ("benchmark_03", "benchmark_08", "benchmark_09"):
+        p = load_problem(BENCHMARKS_DIR / f"{name}.json")
+        week = dataclasses.replace(
+            p, horizon_hours=168, tasks=[dataclasses.replace(t, plan_qty=t.plan_qty * 40) for t in p.tasks],
+        )
+        t0 = time.perf_counter()
+        ub = lp_upper_bound(week)
+        assert time.perf_counter() - t0 < 1.0, name
+        assert 0.0 < ub <= 1.0
+
+
+def test_evaluation_reports_upper_bound():
+    p = load_problem(BENCHMARKS_DIR / "benchmark_10.json")
+    res = report.evaluate_benchmark(p, model=None)
+    assert res["upper_bound"] == 1.0
+    assert res["heuristic"] <= res["upper_bound"]
@@ -0,0 +1,73 @@
+"""MCTS 디스패치 정책 — 전이표 공유·예산 0 폴백·root parallelism."""
+import config
+from agents.mcts import MCTSConfig, Search, mcts_plan, merge_tables, state_key
+from agents.registry import get_dispatch
+from src.simulation.kernel.simulator import Simulator
+from src.stages.dispatch.use_case import run_dispatch
+
+
+def test_state_key_ignores_move_order(problems):
+    for p in problems:
+        sim = Simulator(p)
+        s = sim.reset()
+        moves = sim.valid_moves(s)
+        for i, a in enumerate(moves):
+            for b in moves[i + 1:]:
+                ab, ba = s.clone(), s.clone()
+                sim.apply_move(ab, a)
+                sim.apply_move(ba, b)
+                if not (sim.is_valid_move(ab, b) and sim.is_valid_move(ba, a)):
+                    continue
+                sim.apply_move(ab, b)
+                sim.apply_move(ba, a)
+                assert state_key(ab) == state_key(ba)
+                return
+    raise AssertionError("no commuting move pair in benchmarks")
+
+
+def test_mcts_runs_through_run_dispatch(monkeypatch, problems):
+    monkeypatch.setattr(config, "MCTS_ITERATIONS", 30)
+    monkeypatch.setattr(config, "MCTS_BUDGET_MS", 60_000.0)
+    for p in problems:
+        run = run_dispatch(p, policy="mcts")
+        assert run.policy_name == "mcts"
+        replay = Simulator(p)
+        s = replay.reset()
+        for step in run.trace:
+            for mv in step.moves:
+                assert replay.is_valid_move(s, mv)
+                replay.apply_move(s, mv)
+            replay.advance_hour(s)
+        assert s.produced == run.final_state.produced
+    assert get_dispatch("mcts").__name__ == "mcts_actions"
+
+
+def test_zero_budget_falls_back_to_heuristic(monkeypatch, problems):
+    monkeypatch.setattr(config, "MCTS_BUDGET_MS", 0.0)
+    for p in problems:
+        assert run_dispatch(p, policy="mcts").legacy_trace == run_dispatch(p, policy="heuristic").legacy_trace
+
+
+def test_merged_tables_sum_visits(problems):
+    p = problems[0]
+    sim = Simulator(p)
+    s = sim.reset()
+    cfg = MCTSConfig(iterations=20, budget_ms=60_000.0)
+    a = Search(sim, cfg).run(s)
+    b = Search(sim, cfg).run(s)
+    merged = merge_tables([a, b])
+    root = merged[state_key(s)]
+    assert root.visits.sum() == a[state_key(s)].visits.sum() * 2
+
+
+def test_root_parallel_plan_is_valid(problems):
+    p = problems[0]
+    sim = Simulator(p)
+    s = sim.reset()
+    cfg = MCTSConfig(iterations=20, budget_ms=60_000.0, workers=2)
+    plan = mcts_plan(sim, s, cfg)
+    assert plan == mcts_plan(sim, s, cfg)  # 시드 고정이면 재현
+    t = s.clone()
+    for mv in plan:
+        assert sim.is_valid_move(t, mv)
+        sim.apply_move(t, mv)
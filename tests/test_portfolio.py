@@ -0,0 +1,84 @@
+"""포트폴리오 디스패치 — 등록 정책 전부 실행, 최선(동률 시 전환 적은) 계획 채택·기록."""
+from config import BENCHMARKS_DIR
+from agents.registry import list_dispatch
+from src.evaluate import evaluate_benchmark
+from src.stages.allocation.use_case import allocate
+from src.stages.dispatch.portfolio import conversions, run_portfolio
+from src.stages.dispatch.use_case import run_dispatch
+from src.utils.json_io import load_problem
+from src.utils.rows import build_inference_result_document
+
+
+def _fast(monkeypatch):
+    import config
+
+    monkeypatch.setattr(config, "BEAM_BUDGET_MS", 5.0)
+    monkeypatch.setattr(config, "MCTS_BUDGET_MS", 5.0)
+    monkeypatch.setattr(config, "MCTS_ITERATIONS", 20)
+
+
+def test_portfolio_runs_every_policy_and_picks_best(monkeypatch):
+    _fast(monkeypatch)
+    p = load_problem(BENCHMARKS_DIR / "benchmark_04.json")
+    guide = allocate(p)
+    result = run_portfolio(p, guide, workers=1)
+    assert set(result.runs) == set(list_dispatch())
+    best = result.best
+    for name, run in result.runs.items():
+        assert (best.plan_achievement, -conversions(best)) >= (run.plan_achievement, -conversions(run))
+    assert best.policy_name == result.winner
+    h = run_dispatch(p, guide, policy="heuristic", kernel="unit")
+    assert result.runs["heuristic"].plan_achievement == h.plan_achievement
+
+
+def test_portfolio_parallel_matches_serial(monkeypatch):
+    _fast(monkeypatch)
+    p = load_problem(BENCHMARKS_DIR / "benchmark_02.json")
+    names = ["heuristic", "heuristic_vec"]
+    serial = run_portfolio(p, policies=names, workers=1)
+    parallel = run_portfolio(p, policies=names, workers=2)
+    assert serial.winner == parallel.winner
+    assert serial.scores() == parallel.scores()
+
+
+def test_portfolio_evaluation_and_inference_document(monkeypatch):
+    import config
+
+    _fast(monkeypatch)
+    monkeypatch.setattr(config, "PORTFOLIO_POLICIES", ["heuristic", "heuristic_vec"])
+    monkeypatch.setattr(config, "PORTFOLIO_WORKERS", 1)
+    p = load_problem(BENCHMARKS_DIR / "benchmark_01.json")
+    res = evaluate_benchmark(p, portfolio=True)
+    assert res["portfolio_policy"] in ("heuristic", "heuristic_vec")
+    assert res["portfolio"] == max(s["plan_achievement"] for s in res["portfolio_scores"].values())
+    assert res.get("rl") is None
+    doc = build_inference_result_document(p, res, policy="PORTFOLIO")
+    assert doc["policy"] == "PORTFOLIO"
+    assert doc["portfolio"]["winner"] == res["portfolio_policy"]
+    assert doc["plan_achievement"] == res["portfolio"]
+    assert doc["dynamic"]["assign_rows"] == res["portfolio_assign_rows"]
+
+
+def test_portfolio_with_nested_policy_workers_terminates():
+    """BEAM_WORKERS>1이어도 포트폴리오 작업자 안에서 풀이 남아 종료가 멈추지 않는다."""
+    import subprocess
+    import sys
+
+    from config import ROOT
+
+    script = (
+        "import config\n"
+        "config.BEAM_WORKERS = 2; config.MCTS_WORKERS = 2\n"
+        "config.BEAM_BUDGET_MS = 5.0; config.MCTS_BUDGET_MS = 5.0; config.MCTS_ITERATIONS = 20\n"
+        "from config import BENCHMARKS_DIR\n"
+        "from src.utils.json_io import load_problem\n"
+        "from src.stages.dispatch.portfolio import run_portfolio\n"
+        "p = load_problem(BENCHMARKS_DIR / 'benchmark_04.json')\n"
+        "r = run_portfolio(p, policies=['beam', 'mcts', 'heuristic'], workers=2)\n"
+        "print(sorted(r.runs))\n"
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", script], cwd=ROOT, capture_output=True, text=True, timeout=180,
+    )
+    assert out.returncode == 0, out.stderr
+    assert "['beam', 'heuristic', 'mcts']" in out.stdout
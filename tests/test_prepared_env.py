@@ -0,0 +1,77 @@
+from dataclasses import replace
+
+import numpy as np
+
+import config
+from config import BENCHMARKS_DIR
+from envs import prepared
+from envs.dispatch_env import DispatchEnv
+from envs.prepared import clear_prepared_cache, prepare_dispatch
+from src.utils.json_io import load_problem
+
+
+def _load(name="benchmark_02"):
+    return load_problem(BENCHMARKS_DIR / f"{name}.json")
+
+
+def test_content_hash_stable_across_reloads_and_sensitive_to_content():
+    a, b = _load(), _load()
+    assert a is not b and a.content_hash == b.content_hash
+    assert a.content_hash != _load("benchmark_04").content_hash
+    b.tasks[0] = replace(b.tasks[0], plan_qty=b.tasks[0].plan_qty + 1)
+    b.invalidate_index()
+    assert a.content_hash != b.content_hash
+
+
+def test_target_computed_once_per_problem_content(monkeypatch):
+    clear_prepared_cache()
+    monkeypatch.setattr(config, "ALLOC_LAMBDA", 0.3)
+    calls = []
+    orig = prepared.compute_target_allocation
+    monkeypatch.setattr(prepared, "compute_target_allocation", lambda p: calls.append(1) or orig(p))
+    envs = [prepare_dispatch(_load()).make() for _ in range(3)]
+    assert len(calls) == 1
+    assert all(e.target_allocation is envs[0].target_allocation for e in envs)
+    prepare_dispatch(_load()).make(with_target=False)
+    assert len(calls) == 1
+    monkeypatch.setattr(config, "GUIDE_BAND_PCT", 0.5)  # 설정이 바뀌면 새 준비본
+    prepare_dispatch(_load()).make()
+    assert len(calls) == 2
+    monkeypatch.setattr(config, "ALLOC_POLICY", "analytic")  # target을 만드는 배분 정책도 키
+    prepare_dispatch(_load()).make()
+    assert len(calls) == 3
+    monkeypatch.setattr(config, "ALLOC_CEM_SEED", config.ALLOC_CEM_SEED + 1)
+    prepare_dispatch(_load()).make()
+    assert len(calls) == 4
+    clear_prepared_cache()
+
+
+def test_prepared_cache_is_bounded_lru(monkeypatch):
+    clear_prepared_cache()
+    monkeypatch.setattr(config, "PREPARED_CACHE_SIZE", 2)
+    a, b, c = (prepare_dispatch(_load(n)) for n in ("benchmark_02", "benchmark_04", "benchmark_12"))
+    assert len(prepared._PREPARED) == 2
+    assert prepare_dispatch(_load("benchmark_04")) is b and prepare_dispatch(_load("benchmark_12")) is c
+    assert prepare_dispatch(_load("benchmark_02")) is not a  # 가장 오래 안 쓴 준비본부터 밀려남
+    prepare_dispatch(_load("benchmark_12"))
+    prepare_dispatch(_load("benchmark_09"))
+    assert prepare_dispatch(_load("benchmark_12")) is c
+    clear_prepared_cache()
+
+
+def test_spawned_envs_share_statics_but_not_state():
+    clear_prepared_cache()
+    p = _load("benchmark_12")
+    prep = prepare_dispatch(p)
+    e1, e2 = prep.make(with_target=False), prep.make(with_target=False)
+    assert e1.move_list is e2.move_list and e1._action_of is e2._action_of
+    o1, _ = e1.reset(seed=0)
+    o2, _ = e2.reset(seed=0)
+    valid = int(np.flatnonzero(e1.action_masks())[1])
+    e1.step(valid)
+    np.testing.assert_array_equal(e2._obs(), o2)
+    assert e1._buf is not e2._buf and e1._state is not e2._state
+    fresh = DispatchEnv(p, max_tasks=config.MAX_TASKS, max_models=config.MAX_MODELS,
+                        dwell_obs=config.DWELL_OBS)
+    np.testing.assert_array_equal(fresh.reset(seed=0)[0], o2)
+    clear_prepared_cache()
@@ -0,0 +1,82 @@
+import dataclasses
+
+from agents.heuristic import heuristic_actions
+from agents.runner import run_policy
+from src.simulation.domain.problem import Move, ProblemInstance, Task
+from src.simulation.kernel.simulator import Simulator
+from src.utils.json_io import load_problem
+from config import BENCHMARKS_DIR
+
+
+def test_kernel_fast_forward_matches_hourly_advance():
+    for path in sorted(BENCHMARKS_DIR.glob("*.json")):
+        p = load_problem(path)
+        sim = Simulator(p)
+        s = sim.reset()
+        ref = s.clone()
+        wips = []
+        for _ in range(p.horizon_hours):
+            wips.append([ref.wip[ti] for ti in range(len(p.tasks))])
+            sim.advance_hour(ref)
+        P, W = sim.fast_forward(s, p.horizon_hours)
+        assert (s.hour, s.produced, s.wip) == (ref.hour, ref.produced, ref.wip)
+        assert W[:-1].tolist() == wips
+        assert P[-1].tolist() == [ref.produced[ti] for ti in range(len(p.tasks))]
+
+
+def test_run_policy_fast_forward_keeps_hourly_series():
+    for path in sorted(BENCHMARKS_DIR.glob("*.json")):
+        p = dataclasses.replace(load_problem(path), horizon_hours=168)
+        slow = run_policy(Simulator(p), heuristic_actions, fast_forward=False)
+        fast = run_policy(Simulator(p), heuristic_actions, fast_forward=True)
+        assert fast.plan_achievement == slow.plan_achievement
+        assert fast.legacy_hourly_stats == slow.legacy_hourly_stats
+        assert fast.legacy_trace == slow.legacy_trace
+
+
+def test_run_policy_skips_conversion_wait_mid_run():
+    # 1대를 B2로 전환(3시간)하면 전환이 끝날 때까지 유효 이동이 없다 — 그 구간을 정책 호출 없이 건넘
+    p = ProblemInstance(
+        rule_timekey="T", horizon_hours=24, switch_time_hours=3,
+        tasks=[Task("P1", "OP1", 1, "B1", 500, 1000), Task("P2", "OP1", 1, "B2", 500, 1000)],
+        _uph={("M1", 0): 10.0, ("M1", 1): 20.0}, eqp_qty={"M1": 1},
+        init_assign={("M1", 0): 1}, tool_qty={("B1", "M1"): 1, ("B2", "M1"): 1},
+        conv_groups={"G1": ["B1", "B2"]},
+    )
+    calls: dict[str, list[int]] = {"slow": [], "fast": []}
+
+    def policy(key):
+        def fn(sim, s):
+            calls[key].append(s.hour)
+            mv = Move("M1", 0, 1)
+            if s.hour == 2 and sim.is_valid_move(s, mv):
+                sim.apply_move(s, mv)
+                return [mv]
+            return []
+        return fn
+
+    slow = run_policy(Simulator(p), policy("slow"), fast_forward=False)
+    fast = run_policy(Simulator(p), policy("fast"), fast_forward=True)
+    assert fast.legacy_hourly_stats == slow.legacy_hourly_stats
+    assert fast.legacy_trace == slow.legacy_trace
+    assert fast.plan_achievement == slow.plan_achievement
+    assert calls["slow"] == list(range(24))
+    assert 3 not in calls["fast"] and 4 not in calls["fast"] and 5 in calls["fast"]
+    assert [h.util_rate for h in fast.hourly_stats[3:6]] == [0.0, 0.0, 1.0]
+    assert len(fast.hourly_stats) == 24 and fast.hourly_stats[-1].hour == 23
+
+
+def test_fast_forward_is_default_and_computes_each_span_once(monkeypatch):
+    import config
+    from src.contracts.simulation import QuiescentSpan
+
+    assert config.SIM_FAST_FORWARD
+    p = load_problem(BENCHMARKS_DIR / "benchmark_01.json")  # 처음부터 배치 고정 — 구간 하나
+    sim = Simulator(p)
+    calls = []
+    orig = sim.fixed_trajectory
+    monkeypatch.setattr(sim, "fixed_trajectory", lambda s, hours: calls.append(hours) or orig(s, hours))
+    run = run_policy(sim, heuristic_actions)
+    spans = [h for h in run.trace._items if isinstance(h, QuiescentSpan)]
+    assert spans and len(calls) == len(spans)
+    assert run.plan_achievement == run_policy(Simulator(p), heuristic_actions, fast_forward=False).plan_achievement
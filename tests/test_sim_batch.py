@@ -0,0 +1,51 @@
+from src.simulation.kernel.batch import BatchSimulator
+from src.simulation.kernel.simulator import Simulator, active_eqp_count
+from src.utils.json_io import load_problem
+from agents.heuristic import heuristic_actions
+from config import BENCHMARKS_DIR
+
+
+def _nonzero(d: dict) -> dict:
+    return {k: v for k, v in d.items() if v}
+
+
+def test_batch_simulator_matches_per_problem_runs():
+    problems = [load_problem(p) for p in sorted(BENCHMARKS_DIR.glob("*.json"))]
+    sims = [Simulator(p) for p in problems]
+    states = [sim.reset() for sim in sims]
+    bs = BatchSimulator(problems)
+    b = bs.reset()
+    for _ in range(max(p.horizon_hours for p in problems)):
+        plans = [
+            heuristic_actions(sim, s) if not sim.is_done(s) else []
+            for sim, s in zip(sims, states)
+        ]
+        applied = bs.apply_moves(b, plans)
+        assert applied == plans
+        assert bs.active_eqp_count(b).tolist() == [
+            active_eqp_count(p, s) for p, s in zip(problems, states)
+        ]
+        for sim, s in zip(sims, states):
+            if not sim.is_done(s):
+                sim.advance_hour(s)
+        bs.advance_hour(b)
+        for k, s in enumerate(states):
+            v = bs.view(b, k)
+            assert (v.hour, v.produced, v.wip) == (s.hour, s.produced, s.wip)
+            assert _nonzero(v.assign) == _nonzero(s.assign)
+            assert _nonzero(v.switching) == _nonzero(s.switching)
+    assert bs.metrics(b) == [sim.metrics(s) for sim, s in zip(sims, states)]
+
+
+def test_batch_simulator_skips_invalid_moves_and_masks_per_instance():
+    from src.simulation.domain.problem import Move
+
+    problems = [load_problem(BENCHMARKS_DIR / n) for n in ("benchmark_01.json", "benchmark_02.json")]
+    bs = BatchSimulator(problems)
+    b = bs.reset()
+    mask = bs.valid_mask(b)
+    for k, p in enumerate(problems):
+        assert int(mask[k].sum()) == len(Simulator(p).valid_moves(Simulator(p).reset()))
+    applied = bs.apply_moves(b, [[Move("M1", 0, 1)], [Move("M1", 0, 1), Move("M1", 0, 1)]])
+    assert applied == [[], [Move("M1", 0, 1)]]
+    assert b.switching[1, 0, 1] == problems[1].switch_time_hours
@@ -0,0 +1,143 @@
+import pytest
+
+from agents.heuristic import heuristic_actions
+from agents.runner import run_policy
+from src.simulation.domain.problem import Move, ProblemInstance, Task
+from src.simulation.kernel.events import EventSimulator
+from src.simulation.kernel.simulator import Simulator
+from src.utils.json_io import load_problem, problem_to_dict
+from config import BENCHMARKS_DIR
+
+
+def _two_batch_problem(switch_time_min: float | None, wip: int = 1000) -> ProblemInstance:
+    tasks = [
+        Task("P1", "OP1", 1, "B1", 500, wip),
+        Task("P2", "OP1", 1, "B2", 500, wip),
+    ]
+    return ProblemInstance(
+        rule_timekey="T", horizon_hours=3, switch_time_hours=1, tasks=tasks,
+        _uph={("M1", 0): 60.0, ("M1", 1): 60.0}, eqp_qty={"M1": 2},
+        init_assign={("M1", 0): 2}, tool_qty={("B1", "M1"): 5, ("B2", "M1"): 5},
+        conv_groups={"G1": ["B1", "B2"]}, switch_time_min=switch_time_min,
+    )
+
+
+def test_sub_hour_conversion_finishes_mid_hour():
+    sim = EventSimulator(_two_batch_problem(switch_time_min=20))
+    s = sim.reset()
+    sim.apply_move(s, Move("M1", 0, 1))
+    assert s.switching == {("M1", 1): 1}
+    assert Move("M1", 1, 0) not in sim.valid_moves(s)
+    sim.advance_hour(s)
+    assert s.switching == {}
+    assert s.fluid_produced[1] == pytest.approx(40.0)
+    assert s.produced == {0: 60, 1: 40}
+    assert [(round(t, 6), k) for t, k, _ in s.events] == [(round(1 / 3, 6), "conversion_done")]
+    assert Move("M1", 1, 0) in sim.valid_moves(s)
+
+
+def test_switching_counts_unit_hours_like_hour_kernel():
+    p = _two_batch_problem(switch_time_min=60)
+    hour, event = Simulator(p), EventSimulator(p)
+    hs, es = hour.reset(), event.reset()
+    for sim, s in ((hour, hs), (event, es)):
+        sim.apply_move(s, Move("M1", 0, 1))
+        sim.apply_move(s, Move("M1", 0, 1))
+    assert es.switching == hs.switching == {("M1", 1): 2}
+    assert es.converting == {("M1", 1): 2}
+
+    slow = EventSimulator(_two_batch_problem(switch_time_min=90))
+    s = slow.reset()
+    slow.apply_move(s, Move("M1", 0, 1))
+    slow.apply_move(s, Move("M1", 0, 1))
+    assert s.switching == {("M1", 1): 3} and s.converting == {("M1", 1): 2}
+    slow.advance_hour(s)
+    assert s.switching == {("M1", 1): 1} and s.converting == {("M1", 1): 2}
+    assert s.produced[1] == 0
+    slow.advance_hour(s)
+    assert s.switching == {} and s.converting == {}
+    assert s.produced[1] == 60
+
+
+def test_event_kernel_rejects_undo_log_and_fast_forward():
+    sim = EventSimulator(_two_batch_problem(switch_time_min=20))
+    s = sim.reset()
+    for call in (lambda: sim.checkpoint(s), lambda: sim.rollback(s, 0), lambda: sim.release(s),
+                 lambda: sim.fast_forward(s, 1)):
+        with pytest.raises(TypeError):
+            call()
+
+
+def test_wip_exhausted_event_is_timestamped():
+    sim = EventSimulator(_two_batch_problem(switch_time_min=None, wip=90))
+    s = sim.reset()
+    sim.advance_hour(s)
+    sim.advance_hour(s)
+    assert s.produced[0] == 90 and s.wip[0] == 0
+    assert [(round(t, 6), k, ti) for t, k, ti in s.events] == [(0.75, "wip_exhausted", 0)]
+
+
+def test_event_kernel_conserves_wip_and_emits_hourly_buckets():
+    for path in sorted(BENCHMARKS_DIR.glob("*.json")):
+        p = load_problem(path)
+        sim = EventSimulator(p)
+        run = run_policy(sim, heuristic_actions, policy_name="heuristic")
+        assert [h.hour for h in run.hourly_stats] == list(range(p.horizon_hours))
+        s = sim.reset()
+        while not sim.is_done(s):
+            heuristic_actions(sim, s)
+            sim.advance_hour(s)
+        heads = {ti for ti in range(len(p.tasks)) if p.index.prev_task[ti] is None}
+        for head in heads:
+            chain, ti = [], head
+            while ti is not None:
+                chain.append(ti)
+                ti = p.index.next_task[ti]
+            init = sum(p.tasks[ti].init_wip for ti in chain)
+            left = sum(s.fluid_wip[ti] for ti in chain) + s.fluid_produced[chain[-1]]
+            assert left == pytest.approx(init)
+
+
+def test_switch_time_min_round_trips_json():
+    p = _two_batch_problem(switch_time_min=25)
+    assert problem_to_dict(p)["switch_time_min"] == 25
+    assert "switch_time_min" not in problem_to_dict(_two_batch_problem(None))
+
+
+def test_event_kernel_times_conversions_per_unit_unlike_hour_kernel():
+    # 시간 커널: 칸의 전환 잔여를 기존 장비까지 함께 갚음 / 이벤트 커널: 새로 온 호기만 멈춤
+    p = ProblemInstance(
+        rule_timekey="T", horizon_hours=3, switch_time_hours=2,
+        tasks=[Task("P1", "OP1", 1, "B1", 500, 1000), Task("P2", "OP1", 1, "B2", 500, 1000)],
+        _uph={("M1", 0): 60.0, ("M1", 1): 60.0}, eqp_qty={"M1": 2},
+        init_assign={("M1", 0): 1, ("M1", 1): 1}, tool_qty={("B1", "M1"): 5, ("B2", "M1"): 5},
+        conv_groups={"G1": ["B1", "B2"]},
+    )
+    hourly = {}
+    for kernel in (Simulator, EventSimulator):
+        sim = kernel(p)
+        s = sim.reset()
+        sim.apply_move(s, Move("M1", 0, 1))
+        out = []
+        while not sim.is_done(s):
+            before = s.produced[1]
+            sim.advance_hour(s)
+            out.append(s.produced[1] - before)
+        hourly[kernel] = out
+    assert hourly[Simulator] == [0, 120, 120]
+    assert hourly[EventSimulator] == [60, 60, 120]  # 장비-시간 총량은 같다
+
+
+def test_event_log_is_capped():
+    p = _two_batch_problem(switch_time_min=20, wip=90)
+    sim = EventSimulator(p, max_events=1)
+    s = sim.reset()
+    sim.apply_move(s, Move("M1", 0, 1))
+    for _ in range(3):
+        sim.advance_hour(s)
+    assert [k for _t, k, _ti in s.events] == ["wip_exhausted"]  # 최근 1개만
+    off = EventSimulator(p, max_events=0)
+    s = off.reset()
+    off.apply_move(s, Move("M1", 0, 1))
+    off.advance_hour(s)
+    assert not s.events and s.clone().events.maxlen == 0
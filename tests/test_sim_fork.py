@@ -0,0 +1,119 @@
+"""what-if fork — 자식 세션이 부모 스냅샷 접두를 공유하고 분기별 KPI를 비교."""
+import pytest
+from fastapi.testclient import TestClient
+
+from config import BENCHMARKS_DIR
+from src.api import sim_router
+from src.api.main import app
+from src.simulation.domain.state import SnapshotHistory
+from src.simulation.kernel.simulator import Simulator
+import config
+from src.stages.dispatch import whatif
+from src.stages.dispatch.whatif import Branch, run_branch, run_branches
+from src.utils.json_io import load_problem
+
+
+@pytest.fixture
+def client():
+    yield TestClient(app)
+    sim_router._sessions.clear()
+
+
+def test_snapshot_history_fork_shares_prefix():
+    p = load_problem(BENCHMARKS_DIR / "benchmark_01.json")
+    sim = Simulator(p)
+    s = sim.reset()
+    parent = SnapshotHistory([s.clone()])
+    for _ in range(3):
+        sim.advance_hour(s)
+        parent.append(s.clone())
+    child = parent.fork(2)
+    grandchild = child.fork()
+    child.append(s.clone())
+    parent.append(s.clone())
+    assert len(parent) == 5 and len(child) == 3 and len(grandchild) == 2
+    assert child[0] is parent[0] and child[1] is parent[1] and child[2] is not parent[2]
+    assert grandchild[-1] is parent[1]
+    assert child.owned() == 1 and grandchild.owned() == 0
+    assert [x.hour for x in child] == [0, 1, 3]
+    with pytest.raises(IndexError):
+        child[3]
+
+
+def test_run_branches_parallel_matches_serial():
+    p = load_problem(BENCHMARKS_DIR / "benchmark_04.json")
+    s = Simulator(p).reset()
+    branches = [Branch("heuristic"), Branch(None), Branch("heuristic_vec")]
+    serial = [run_branch(p, s, b) for b in branches]
+    parallel = run_branches(p, s, branches, workers=2)
+    for a, b in zip(serial, parallel):
+        assert a.metrics == b.metrics and a.conversions == b.conversions
+        assert len(b.snapshots) == p.horizon_hours
+    assert s.hour == 0
+
+
+def test_run_branches_builds_each_policy_once_and_caps_workers(monkeypatch):
+    p = load_problem(BENCHMARKS_DIR / "benchmark_04.json")
+    s = Simulator(p).reset()
+    built = []
+    orig = whatif.policy_fn_for
+    monkeypatch.setattr(whatif, "policy_fn_for", lambda name, problem: built.append(name) or orig(name, problem))
+    branches = [Branch("heuristic"), Branch("heuristic", label="again"), Branch(None)]
+    run_branches(p, s, branches, workers=1)
+    assert sorted(built, key=str) == [None, "heuristic"]
+
+    sizes = []
+    monkeypatch.setattr(whatif, "parallel_map", lambda fn, items, workers, **kw: sizes.append(workers) or [])
+    monkeypatch.setattr(config, "SIM_WORKERS", 3)
+    run_branches(p, s, branches[:2])
+    run_branches(p, s, branches[:2], workers=64)
+    run_branches(p, s, branches * 2, workers=64)
+    assert sizes == [2, 2, 3]
+
+
+def test_fork_endpoint_creates_children(client):
+    r = client.post("/api/sim/start", json={"dataset": "benchmark_04", "mode": "manual"})
+    sid = r.json()["session_id"]
+    client.post(f"/api/sim/{sid}/advance")
+    move = r.json()["valid_moves"][0]
+    r = client.post(f"/api/sim/{sid}/fork", json={
+        "branches": [
+            {"policy": "heuristic"},
+            {"moves": [move], "label": "manual-1"},
+            {},
+        ],
+        "workers": 1,
+    })
+    assert r.status_code == 200, r.text
+    body = r.json()
+    assert body["fork_hour"] == 1
+    children = body["children"]
+    assert [c["label"] for c in children] == ["heuristic", "manual-1", "manual"]
+    assert children[1]["conversions"] == 1 and children[2]["conversions"] == 0
+    best = max(children, key=lambda c: (c["plan_achievement"], -c["conversions"]))
+    assert body["best"] == best["session_id"]
+
+    parent_hist = sim_router._sessions[sid]["snapshots"]
+    horizon = sim_router._sessions[sid]["problem"].horizon_hours
+    for c in children:
+        child = sim_router._sessions[c["session_id"]]
+        assert child["snapshots"][1] is parent_hist[1]
+        assert child["snapshots"].owned() == horizon - 1
+        view = client.get(f"/api/sim/{c['session_id']}").json()
+        assert view["is_done"] and view["parent_id"] == sid and view["fork_hour"] == 1
+        assert view["gantt"]
+    assert client.get(f"/api/sim/{sid}").json()["hour"] == 1
+
+
+def test_fork_from_earlier_hour_and_errors(client):
+    sid = client.post("/api/sim/start", json={"dataset": "benchmark_04"}).json()["session_id"]
+    for _ in range(2):
+        client.post(f"/api/sim/{sid}/advance")
+    r = client.post(f"/api/sim/{sid}/fork", json={"hour": 0, "branches": [{"policy": "heuristic"}], "workers": 1})
+    assert r.status_code == 200
+    assert r.json()["fork_hour"] == 0
+    assert client.post(f"/api/sim/{sid}/fork", json={"hour": 5, "branches": [{}]}).status_code == 400
+    assert client.post(f"/api/sim/{sid}/fork", json={"branches": [{"policy": "nope"}]}).status_code == 400
+    bad = {"model": "NOPE", "from_index": 0, "to_index": 1}
+    assert client.post(f"/api/sim/{sid}/fork", json={"branches": [{"moves": [bad]}]}).status_code == 400
+    assert client.post("/api/sim/missing/fork", json={"branches": [{}]}).status_code == 404
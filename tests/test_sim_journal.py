@@ -0,0 +1,62 @@
+import random
+
+from src.simulation.kernel.simulator import Simulator
+from src.utils.json_io import load_problem
+from config import BENCHMARKS_DIR
+
+
+def _snapshot(s):
+    return (s.hour, dict(s.produced), dict(s.wip), dict(s.assign),
+            dict(s.switching), dict(s.tool_used))
+
+
+def _problem():
+    for path in sorted(BENCHMARKS_DIR.glob("*.json")):
+        p = load_problem(path)
+        sim = Simulator(p)
+        if sim.valid_moves(sim.reset()):
+            return p
+    raise AssertionError("유효 이동이 있는 벤치마크가 없습니다.")
+
+
+def test_clone_is_independent_and_keeps_move_cache():
+    p = _problem()
+    sim = Simulator(p)
+    s = sim.reset()
+    sim.valid_moves(s)
+    c = s.clone()
+    assert _snapshot(c) == _snapshot(s)
+    assert c._moves is not s._moves
+    mv = sim.valid_moves(c)[0]
+    sim.apply_move(c, mv)
+    sim.advance_hour(c)
+    assert _snapshot(s) != _snapshot(c)
+    assert sim.valid_moves(s) == Simulator(p).valid_moves(sim.reset())
+
+
+def test_rollback_restores_state_and_valid_moves():
+    p = _problem()
+    sim = Simulator(p)
+    s = sim.reset()
+    rng = random.Random(0)
+    before = _snapshot(s)
+    moves_before = sim.valid_moves(s)
+    mark = sim.checkpoint(s)
+    for _ in range(3):
+        for _ in range(2):
+            moves = sim.valid_moves(s)
+            if moves:
+                sim.apply_move(s, rng.choice(moves))
+        inner = sim.checkpoint(s)
+        sim.advance_hour(s)
+    after_inner = _snapshot(s)
+    sim.rollback(s, inner)
+    sim.advance_hour(s)
+    assert _snapshot(s) == after_inner
+
+    sim.rollback(s, mark)
+    assert _snapshot(s) == before
+    assert sim.valid_moves(s) == moves_before
+    sim.release(s)
+    sim.advance_hour(s)
+    assert s._journal is None
@@ -1,3 +1,6 @@
+import numpy as np
+import pytest
+
 from src.utils.json_io import load_problem
 from src.simulation.kernel.simulator import Simulator
 from src.simulation.domain.problem import Move
@@ -31,6 +34,7 @@ def test_valid_moves_masks_tool_shortage_and_out_of_group():
     assert Move("M1", 0, 1) in moves
     # to-batch tool을 모두 소진시키면 더 이상 전환 불가
     s.tool_used[("B2", "M1")] = 1
+    s._moves = None  # 커널 밖 직접 수정 → 유효 이동 집합 재구축
     moves2 = sim.valid_moves(s)
     assert Move("M1", 0, 1) not in moves2
 
@@ -46,3 +50,72 @@ def test_same_batch_move_is_free_no_switching():
     sim.apply_move(s, Move("M1", 0, 1))
     assert ("M1", 1) not in s.switching      # 전환중 없음
     assert s.tool_used.get(("B1", "M1")) == 1  # 같은 batch → tool 수 불변
+
+
+def _scan_valid_moves(p, s):
+    """기존 전수 스캔 구현 (참조용)."""
+    out = []
+    n = len(p.tasks)
+    for model in p.models():
+        for fi in range(n):
+            if s.assign.get((model, fi), 0) - s.switching.get((model, fi), 0) <= 0:
+                continue
+            for ti in range(n):
+                if ti == fi or p.uph_of(model, ti) is None:
+                    continue
+                fb, tb = p.batch_of(fi), p.batch_of(ti)
+                if fb != tb:
+                    if not p.can_convert(fb, tb):
+                        continue
+                    if s.tool_used.get((tb, model), 0) >= p.tool_cap(tb, model):
+                        continue
+                out.append(Move(model, fi, ti))
+    return out
+
+
+def test_incremental_move_set_tracks_moves_and_hours():
+    import random
+
+    for name in ("benchmark_04.json", "benchmark_09.json", "benchmark_12.json"):
+        p = load_problem(BENCHMARKS_DIR / name)
+        sim = Simulator(p)
+        s = sim.reset()
+        rng = random.Random(1)
+        while not sim.is_done(s):
+            for _ in range(3):
+                moves = sim.valid_moves(s)
+                assert moves == _scan_valid_moves(p, s)
+                if not moves:
+                    break
+                sim.apply_move(s, rng.choice(moves))
+            sim.advance_hour(s)
+            assert sim.valid_moves(s) == _scan_valid_moves(p, s)
+            mask = sim.valid_move_mask(s)
+            assert int(mask.sum()) == len(sim.valid_moves(s))
+
+
+def test_move_set_shares_static_tensors_and_tracks_tool_headroom(monkeypatch):
+    import random
+
+    from src.simulation.kernel.moves import MoveSet
+
+    monkeypatch.setattr(MoveSet, "mask", lambda self, s: pytest.fail("mask built"))
+    for name in ("benchmark_04.json", "benchmark_09.json"):
+        p = load_problem(BENCHMARKS_DIR / name)
+        sim = Simulator(p)
+        s = sim.reset()
+        ms = sim.move_set(s)
+        assert ms.feasible is p.index.feasible and sim.move_set(sim.reset()).cross is p.index.cross
+        rng = random.Random(0)
+        n = p.index.n_tasks
+        mark = sim.checkpoint(s)
+        for _ in range(30):
+            cands = [Move(m, f, t) for m in p.index.models for f in range(n) for t in range(n)]
+            valid = [mv for mv in cands if sim.is_valid_move(s, mv)]
+            assert valid == _scan_valid_moves(p, s)  # 단일 칸 판정 = 전수 스캔
+            if not valid:
+                break
+            sim.apply_move(s, rng.choice(valid))
+            np.testing.assert_array_equal(sim.move_set(s).headroom, MoveSet.build(p.index, s).headroom)
+        sim.rollback(s, mark)
+        np.testing.assert_array_equal(sim.move_set(s).headroom, MoveSet.build(p.index, s).headroom)
@@ -0,0 +1,72 @@
+import random
+
+from src.simulation.domain.problem import Move, ProblemInstance, Task
+from src.simulation.kernel.simulator import Simulator, active_eqp_count
+from src.simulation.kernel.vector import VectorSimulator
+from src.utils.json_io import load_problem
+from agents.heuristic import heuristic_actions
+from config import BENCHMARKS_DIR
+
+
+def _nonzero(d: dict) -> dict:
+    return {k: v for k, v in d.items() if v}
+
+
+def _assert_same(sim: Simulator, s, vs: VectorSimulator, a):
+    v = vs.view(a)
+    assert v.hour == s.hour
+    assert v.produced == s.produced
+    assert v.wip == s.wip
+    assert _nonzero(v.assign) == _nonzero(s.assign)
+    assert _nonzero(v.switching) == _nonzero(s.switching)
+    assert _nonzero(v.tool_used) == _nonzero(s.tool_used)
+    assert vs.active_eqp_count(a) == active_eqp_count(sim.p, s)
+
+
+def test_vector_kernel_replays_heuristic_runs_on_benchmarks():
+    for path in sorted(BENCHMARKS_DIR.glob("*.json")):
+        p = load_problem(path)
+        sim, vs = Simulator(p), VectorSimulator(p)
+        s, a = sim.reset(), vs.reset()
+        _assert_same(sim, s, vs, a)
+        while not sim.is_done(s):
+            for mv in heuristic_actions(sim, s):
+                vs.apply_move(a, mv)
+            sim.advance_hour(s)
+            vs.advance_hour(a)
+            _assert_same(sim, s, vs, a)
+        assert vs.metrics(a) == sim.metrics(s)
+
+
+def _chain_problem(n_products: int, n_opers: int) -> ProblemInstance:
+    tasks, uph, init_assign = [], {}, {}
+    for k in range(n_products):
+        for o in range(n_opers):
+            ti = len(tasks)
+            batch = f"B{1 + k % 3}"
+            tasks.append(Task(f"P{k}", f"OP{o}", o + 1, batch, 400, 300 if o == 0 else 0))
+            uph[("M1", ti)] = 40.0 + (ti % 5) * 7.5
+            uph[("M2", ti)] = 55.0
+            init_assign[("M1" if ti % 2 else "M2", ti)] = 1
+    return ProblemInstance(
+        rule_timekey="T", horizon_hours=6, switch_time_hours=1, tasks=tasks,
+        _uph=uph, eqp_qty={"M1": len(tasks), "M2": len(tasks)}, init_assign=init_assign,
+        tool_qty={(f"B{i}", m): 50 for i in (1, 2, 3) for m in ("M1", "M2")},
+        conv_groups={"G1": ["B1", "B2", "B3"]},
+    )
+
+
+def test_vector_kernel_matches_dict_kernel_on_large_chains():
+    p = _chain_problem(n_products=30, n_opers=4)
+    sim, vs = Simulator(p), VectorSimulator(p)
+    s, a = sim.reset(), vs.reset()
+    rng = random.Random(0)
+    while not sim.is_done(s):
+        for _ in range(10):
+            moves = sim.valid_moves(s)
+            mv = rng.choice(moves)
+            sim.apply_move(s, mv)
+            vs.apply_move(a, Move(*mv))
+        sim.advance_hour(s)
+        vs.advance_hour(a)
+        _assert_same(sim, s, vs, a)
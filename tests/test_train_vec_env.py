@@ -0,0 +1,80 @@
+from functools import partial
+
+import numpy as np
+
+from envs.allocation_env import AllocationEnv
+from envs.dispatch_env import DispatchEnv
+from envs.sampling import ProblemSamplingEnv, shard_problems
+from src.training.vec_env import make_vec_env
+
+
+_make_dispatch = partial(DispatchEnv, max_tasks=8, max_models=5)
+
+
+def test_shards_partition_problems(train_problems):
+    ps = train_problems
+    shards = [shard_problems(ps, 3, r) for r in range(3)]
+    assert sorted(id(p) for s in shards for p in s) == sorted(id(p) for p in ps)
+    assert shard_problems(ps[:2], 4, 3) == [ps[1]]
+
+
+def test_sampling_env_resamples_deterministically(train_problems):
+    ps = train_problems
+
+    def picks(seed):
+        env = ProblemSamplingEnv(ps, _make_dispatch, seed=seed)
+        out = []
+        for _ in range(20):
+            _obs, info = env.reset()
+            out.append(info["problem_index"])
+            assert env.env.p is ps[info["problem_index"]]
+        return out
+
+    assert picks(3) == picks(3)
+    assert len(set(picks(3))) > 1
+
+
+def test_sampling_env_reuses_env_per_problem_and_forwards_masks(train_problems):
+    ps = train_problems
+    env = ProblemSamplingEnv(ps, _make_dispatch, seed=0)
+    seen = {}
+    for _ in range(10):
+        env.reset()
+        assert seen.setdefault(env.problem_index, env.env) is env.env
+        np.testing.assert_array_equal(env.action_masks(), env.env.action_masks())
+
+
+def test_subproc_vec_env_workers_sample_their_shards(train_problems):
+    ps = train_problems
+    vec = make_vec_env(ps, _make_dispatch, n_envs=2, seed=0)
+    try:
+        assert vec.num_envs == 2
+        obs = vec.reset()
+        assert obs.shape == (2, *vec.observation_space.shape)
+        masks = np.stack(vec.env_method("action_masks"))
+        assert masks.shape == (2, vec.action_space.n) and masks[:, 0].all()
+        shards = vec.get_attr("problems")
+        assert [len(s) for s in shards] == [3, 2]
+    finally:
+        vec.close()
+
+
+def test_alloc_vec_env_single_worker_is_dummy(train_problems):
+    from stable_baselines3.common.vec_env import DummyVecEnv
+
+    make = partial(AllocationEnv, max_tasks=8, max_models=5)
+    vec = make_vec_env(train_problems, make, n_envs=1, seed=0)
+    assert isinstance(vec, DummyVecEnv)
+    obs = vec.reset()
+    _obs, _r, done, _info = vec.step(np.zeros((1, *vec.action_space.shape), dtype=np.float32))
+    assert done[0]
+    vec.close()
+
+
+def test_train_model_with_two_envs(tmp_path, train_problems):
+    from src.training.dispatch import train_model
+
+    ps = train_problems[:2]
+    out = tmp_path / "m.zip"
+    model = train_model(ps, ppo_steps=200, bc_epochs=2, save_path=out, n_envs=2)
+    assert out.exists() and model.n_envs == 2